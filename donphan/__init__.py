@@ -4,9 +4,21 @@ __license__ = 'MIT'
 __copyright__ = 'Copyright 2020 Bijij'
 __version__ = '2.4.2'
 
+from .cache import QueryCache, ResultCache
+from .abc import ValidationMode
 from .column import Column
-from .connection import create_pool, MaybeAcquire
+from .connection import BoundConnection, create_pool, Connection, get_pool, MaybeAcquire, pool_stats, PoolMetrics, prepared_statement_stats, replica_pools
 from .enum import Enum
+from .index import Index
+from .instrumentation import (
+    add_query_hook, LatencyHistogram, query_stats, QueryEvent, remove_query_hook, reset_query_stats, set_slow_query_threshold, set_tracer
+)
+from .loader import Loader
+from .migrations import migrate, MigrationPlan, MigrationStep, plan_migration
+from .mirror import load_mirrors, Mirror
+from .notify import InvalidationBus, listen_for_invalidations
+from .sharding import HashSharding, RangeSharding, Sharding
+from .singleflight import SingleFlight
 from .table import create_tables, Table
 from .sqltype import SQLType
 from .view import create_views, View
@@ -1,14 +1,48 @@
-from .connection import Connection, MaybeAcquire, Record
+from .cache import QueryCache, ResultCache
+from .connection import (
+    _after_transaction, _bound_connection, _decode_json, _execute, _in_transaction, _iterate, _replica_failed, _replica_pool,
+    _REPLICA_ERRORS, _transaction_ended, _wrote, Connection, MaybeAcquire, Record
+)
 from .column import Column
+from .index import _column_indexes, Index
+from .instrumentation import _count_rows, _Instrument
+from .loader import Loader
+from .mirror import Mirror
+from .notify import _disconnected, _publish
+from .pagination import _decode_token, _encode_token
+from .sharding import Sharding
+from .singleflight import SingleFlight
 from .sqltype import SQLType
 
 import abc
+import asyncio
+import enum
+import functools
 import inspect
+import operator
 
-from typing import Any, Iterable, List, Optional, Tuple, Union
+import asyncpg
+
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple, Union
 
 
 _DEFAULT_SCHEMA = 'public'
+_DEFAULT_QUERY_CACHE_SIZE = 128
+_DEFAULT_COPY_CHUNK_SIZE = 10000
+_DEFAULT_PREFETCH = 1000
+_DEFAULT_RESULT_CACHE_SIZE = 1024
+_MISSING = object()
+
+# The keywords accepted in the class definitions of tables and views
+_CLASS_KEYWORDS = frozenset((
+    'schema', 'query_cache_size', 'validation', 'coalesce', 'single_flight',
+    'result_cache_size', 'result_cache_ttl', 'mirrored', 'pool', 'sharding'
+))
+_READ_METHODS = ('fetch', 'fetchrow')
+_JSON_TYPES = (SQLType.JSON(), SQLType.JSONB())
+_CAST_TYPES = {
+    'SERIAL': 'INTEGER'
+}
 _DEFAULT_OPERATORS = {
     'eq': '=',
     'ne': '!=',
@@ -19,8 +53,165 @@ _DEFAULT_OPERATORS = {
 }
 
 
+class ValidationMode(enum.Enum):
+    """Specifies how thoroughly values are validated against their columns.
+
+    Attributes:
+        full: Checks nullability, the type of every value and the elements of arrays.
+        top_level: Checks nullability and types but not the elements of arrays.
+        off: Performs no validation, for use with trusted values.
+    """
+    full = 'full'
+    top_level = 'top_level'
+    off = 'off'
+
+
+def _build_validator(column: Column, mode: ValidationMode) -> Callable[[Any], None]:
+    """Builds a function which validates a value against a column."""
+    name = column.name
+    python = column.type.python
+    expected = column.type.__name__
+    nullable = column.nullable
+    depth = column.is_array
+
+    def check_null(value):
+        if not nullable:
+            raise TypeError(f'Cannot pass None into non-nullable column {name}')
+
+    if not depth:
+
+        def validate_scalar(value):
+            if value is None:
+                check_null(value)
+            elif not isinstance(value, python):
+                raise TypeError(f'Column {name}; expected {expected}, received {type(value).__name__}')
+
+        return validate_scalar
+
+    def check_sequence(value):
+        if not isinstance(value, (list, tuple)):
+            raise TypeError(f'Column {name}; expected {expected}[], received {type(value).__name__}')
+
+    if mode is ValidationMode.top_level:
+
+        def validate_top_level(value):
+            if value is None:
+                check_null(value)
+            else:
+                check_sequence(value)
+
+        return validate_top_level
+
+    def check_elements(elements, level):
+        for element in elements:
+            if isinstance(element, (list, tuple)):
+
+                # Check array depth is expected.
+                if level == depth:
+                    raise TypeError(f'Column {name}; expected {expected}{"[]" * depth}, received an array nested deeper than {depth}')
+                check_elements(element, level + 1)
+
+            elif element is not None and not isinstance(element, python):
+                raise TypeError(f'Column {name}; expected {expected}[], received {type(element).__name__}[]')
+
+    def validate_array(value):
+        if value is None:
+            check_null(value)
+        else:
+            check_sequence(value)
+            check_elements(value, 1)
+
+    return validate_array
+
+
+def _cast_type(column: Column) -> str:
+    """Returns the SQL type to cast a column's values to, as pseudo-types such as SERIAL cannot be cast to."""
+    return _CAST_TYPES.get(column.type.sql, column.type.sql)
+
+
+async def _chunked(iterable: Union[Iterable[Any], AsyncIterable[Any]], size: int) -> AsyncIterator[List[Any]]:
+    """Splits an iterable or async iterable into lists of at most the specified size."""
+    chunk = []
+
+    if isinstance(iterable, AsyncIterable):
+        async for item in iterable:
+            chunk.append(item)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    else:
+        for item in iterable:
+            chunk.append(item)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+
+    if chunk:
+        yield chunk
+
+
+def _parse_order(order_by: str) -> List[Tuple[str, bool]]:
+    """Parses a simple ORDER BY clause into column names and whether each is descending."""
+    terms = []
+    for term in order_by.split(','):
+        parts = term.split()
+        name = parts[0].rpartition('.')[2] if parts else ''
+        if not name.isidentifier() or len(parts) > 2 or (len(parts) == 2 and parts[1].upper() not in ('ASC', 'DESC')):
+            raise TypeError(f'Cannot order records gathered from several shards by {order_by}')
+        terms.append((name, len(parts) == 2 and parts[1].upper() == 'DESC'))
+    return terms
+
+
+def _sort_records(records: List[Record], terms: List[Tuple[str, bool]]):
+    """Sorts records gathered from several shards in place, as Postgres would."""
+    try:
+        for name, descending in reversed(terms):
+
+            # NULLs sort after other values in ascending order
+            records.sort(key=lambda record, name=name: (record[name] is None, record[name]), reverse=descending)
+    except KeyError as e:
+        raise TypeError(f'Cannot order records gathered from several shards by unselected column {e}') from None
+
+
+def _column_property(column: Column) -> property:
+    """Builds a property which retrieves a column's value from a record."""
+    name = column.name
+    getter = operator.itemgetter(name)
+    lazy = column.decode == 'lazy'
+    table = column.table
+
+    def get(record):
+        try:
+            value = getter(record)
+        except KeyError:
+            raise AttributeError(f'Column {name} was not selected') from None
+
+        # Lazily decoded columns are fetched encoded, and decoded as the pool holding the table decodes JSON
+        if lazy and value is not None:
+            return _decode_json(value, table._pool_names()[0])
+        return value
+
+    return property(get, doc=f'The value of column {name}.')
+
+
+def _build_record_class(name: str, module: str, columns: Iterable[Column]) -> type:
+    """Builds a record class which exposes the values of columns as attributes."""
+    attrs = {'__slots__': (), '__module__': module}
+    for column in columns:
+
+        # Don't shadow the methods of records
+        if not hasattr(Record, column.name):
+            attrs[column.name] = _column_property(column)
+
+    return type(f'{name}Record', (Record,), attrs)
+
+
 class Creatable(metaclass=abc.ABCMeta):
 
+    # Set by ObjectMeta, other objects such as enums are created in the default pool
+    _pool_name: Optional[str] = None
+    _sharding: Optional[Sharding] = None
+
     @classmethod
     def _query_create_schema(cls, if_not_exists: bool = True) -> str:
         """Generates a CREATE SCHEMA stub."""
@@ -61,16 +252,45 @@ class Creatable(metaclass=abc.ABCMeta):
         """Generates a DROP stub."""
         raise NotImplementedError
 
+    @classmethod
+    def _dependencies(cls, objects: Iterable['Creatable']) -> Iterable['Creatable']:
+        """Finds which of the supplied objects must be created before this object."""
+        return ()
+
+    @classmethod
+    def _pool_names(cls) -> Tuple[Optional[str], ...]:
+        """The names of the pools holding the object, ``None`` being the default pool."""
+        if cls._sharding is not None:
+            return cls._sharding.pools
+        return (cls._pool_name,)
+
+    @classmethod
+    async def _each_shard(cls, site: str) -> AsyncIterator[Connection]:
+        """Acquires a connection to each of the pools the object is sharded across in turn."""
+        for name in cls._sharding.pools:
+            async with MaybeAcquire(pool=name, site=site) as connection:
+                yield connection
+
     @classmethod
     async def create(cls, *, connection=None, drop_if_exists=True, if_not_exists=True):
         """Creates this object in the database.
 
+        Sharded objects are created in every pool they are split across.
+
         Args:
             connection (Connection, optional): A database connection to use.
                 If none is supplied a connection will be acquired from the pool.
-            if_not_exists (bool, optional): TODO
+            drop_if_exists (bool, optional): Replaces the object if it already exists, where supported.
+            if_not_exists (bool, optional): Skips the object if it already exists, rather than
+                raising an error, and creates its schema if it is missing.
         """
-        async with MaybeAcquire(connection) as connection:
+        site = f'{getattr(cls, "_name", cls.__name__)}.create'
+        if connection is None and cls._sharding is not None:
+            async for connection in cls._each_shard(site):
+                await cls.create(connection=connection, drop_if_exists=drop_if_exists, if_not_exists=if_not_exists)
+            return
+
+        async with MaybeAcquire(connection, pool=cls._pool_name, site=site) as connection:
 
             if if_not_exists:
                 await connection.execute(cls._query_create_schema())
@@ -87,7 +307,13 @@ class Creatable(metaclass=abc.ABCMeta):
             if_exists (bool, optional): TODO
             cascade (bool, optional): TODO
         """
-        async with MaybeAcquire(connection) as connection:
+        site = f'{getattr(cls, "_name", cls.__name__)}.drop'
+        if connection is None and cls._sharding is not None:
+            async for connection in cls._each_shard(site):
+                await cls.drop(connection=connection, if_exists=if_exists, cascade=cascade)
+            return
+
+        async with MaybeAcquire(connection, pool=cls._pool_name, site=site) as connection:
             await connection.execute(cls._query_drop(if_exists, cascade))
 
 
@@ -95,19 +321,38 @@ class ObjectMeta(abc.ABCMeta):
 
     def __new__(cls, name, bases, attrs, **kwargs):
 
+        # Misspelt keywords would otherwise be silently ignored
+        unknown = kwargs.keys() - _CLASS_KEYWORDS
+        if unknown:
+            raise TypeError(f'{name} got unexpected class keywords: {", ".join(sorted(unknown))}')
+
         attrs.update({
             'schema': kwargs.get('schema', _DEFAULT_SCHEMA),
-            '_columns': {}
+            '_columns': {},
+            '_query_cache': QueryCache(kwargs.get('query_cache_size', _DEFAULT_QUERY_CACHE_SIZE)),
+            '_validation_mode': ValidationMode(kwargs.get('validation', ValidationMode.full)),
+            '_validators': {ValidationMode.full: {}, ValidationMode.top_level: {}},
+            '_loader': None,
+            '_single_flight': SingleFlight() if kwargs.get('single_flight', False) else None,
+            '_result_cache': None,
+            '_mirror': None,
+            '_indexes': [],
+            '_record_class': Record,
+            '_primary_key_names': (),
+            '_primary_keys': (),
+            '_uncommitted': 0,
+            '_pool_name': kwargs.get('pool'),
+            '_sharding': None
         })
 
         obj = super().__new__(cls, name, bases, attrs)
 
         for _name, _type in attrs.get('__annotations__', {}).items():
 
-            # If the input type is an array
-            is_array = False
+            # If the input type is an array determine its depth
+            is_array = 0
             while isinstance(_type, list):
-                is_array = True
+                is_array += 1
                 _type = _type[0]
 
             if inspect.ismethod(_type) and _type.__self__ is SQLType:
@@ -119,6 +364,44 @@ class ObjectMeta(abc.ABCMeta):
 
             obj._columns[_name] = column
 
+            # Prebuild the column's validators
+            for mode, validators in obj._validators.items():
+                validators[_name] = _build_validator(column, mode)
+
+        # Return records with the object's columns as attributes
+        obj._record_class = _build_record_class(name, obj.__module__, obj._columns.values())
+        obj._primary_keys = tuple(column for column in obj._columns.values() if column.primary_key)
+        obj._primary_key_names = tuple(column.name for column in obj._primary_keys)
+
+        # Collect the indexes declared on columns and as attributes
+        obj._indexes = _column_indexes(obj, obj._columns.values())
+        for _name, value in attrs.items():
+            if isinstance(value, Index):
+                obj._indexes.append(value._update(obj, _name))
+
+        # Cache query results when requested
+        if 'result_cache_size' in kwargs or 'result_cache_ttl' in kwargs:
+            obj._result_cache = ResultCache(kwargs.get('result_cache_size', _DEFAULT_RESULT_CACHE_SIZE), kwargs.get('result_cache_ttl'))
+
+        # Coalesce primary key lookups when requested
+        coalesce = kwargs.get('coalesce', False)
+        if coalesce is not False:
+            obj._get_primary_keys()
+            obj._loader = Loader(obj, 0 if coalesce is True else coalesce)
+
+        # Serve equality lookups from memory when requested
+        if kwargs.get('mirrored', False):
+            obj._mirror = Mirror(obj)
+
+        # Split records across pools by a shard key when requested
+        sharding = kwargs.get('sharding')
+        if sharding is not None:
+            if not isinstance(sharding, Sharding):
+                raise TypeError(f'Expected a Sharding for the sharding of {obj._name}, received {type(sharding).__name__}')
+            if obj._pool_name is not None:
+                raise TypeError(f'{obj._name} cannot be both bound to a pool and sharded')
+            obj._sharding = sharding._update(obj)
+
         return obj
 
     def __getattr__(cls, key):
@@ -137,97 +420,134 @@ class ObjectMeta(abc.ABCMeta):
 class Fetchable(Creatable, metaclass=ObjectMeta):
 
     @classmethod
-    def _validate_kwargs(cls, primary_keys_only=False, **kwargs) -> List[Tuple[str, Any]]:
-        """Validates passed kwargs against table"""
-        verified = list()
-        for kwarg, value in kwargs.items():
+    def _get_column(cls, name: str) -> Column:
+        """Retrieves a column from the object by name."""
+        try:
+            return cls._columns[name]
+        except KeyError:
+            raise AttributeError(
+                f'Could not find column with name {name} in table {cls._name}') from None
 
-            # Strip Extra operators
-            if kwarg.startswith('or_'):
-                kwarg = kwarg[3:]
-            if kwarg[-4:-2] == '__':
-                kwarg = kwarg[:-4]
+    @classmethod
+    def _parse_kwarg(cls, kwarg: str) -> Tuple[Column, str, str]:
+        """Resolves a kwarg to its column, boolean operator and comparison operator."""
+        statement = 'AND'
+        operator = '='
+
+        # Strip Extra operators
+        if kwarg.startswith('or_'):
+            statement = 'OR'
+            kwarg = kwarg[3:]
+        if kwarg[-4:-2] == '__':
+            try:
+                operator = _DEFAULT_OPERATORS[kwarg[-2:]]
+            except KeyError:
+                raise AttributeError(f'Unknown operator type {kwarg[-2:]}')
+            kwarg = kwarg[:-4]
+
+        return cls._get_column(kwarg), statement, operator
 
-            # Check column is in Object
-            if kwarg not in cls._columns:
-                raise AttributeError(
-                    f'Could not find column with name {kwarg} in table {cls._name}')
-            column = cls._columns[kwarg]
+    @classmethod
+    def _validate_value(cls, column: Column, value: Any, mode: Optional[ValidationMode] = None):
+        """Validates a value against a column."""
+        mode = mode or cls._validation_mode
+        if mode is not ValidationMode.off:
+            cls._validators[mode][column.name](value)
 
-            # Skip non primary when relevant
-            if primary_keys_only and not column.primary_key:
-                continue
+    @classmethod
+    def _validate_values(cls, columns: Iterable[Column], values: Iterable[Any], mode: Optional[ValidationMode] = None) -> List[Any]:
+        """Validates a sequence of values against their respective columns.
 
-            # Check passing null into a non nullable column
-            if not column.nullable and value is None:
-                raise TypeError(
-                    f'Cannot pass None into non-nullable column {column.name}')
+        Args:
+            columns (list(Column)): The columns to validate against.
+            values (list(any)): The values to validate, in the same order as the columns.
+            mode (ValidationMode, optional): How thoroughly to validate the values.
+                If none is supplied the object's validation mode is used.
+        """
+        verified = list(values)
+        mode = mode or cls._validation_mode
+        if mode is ValidationMode.off:
+            return verified
 
-            def check_type(element):
-                return isinstance(element, (column.type.python, type(None)))
+        validators = cls._validators[mode]
+        for column, value in zip(columns, verified):
+            validators[column.name](value)
 
-            # If column is an array
-            if column.is_array:
+        return verified
 
-                def check_array(element):
+    @classmethod
+    def _compile(cls, key: Hashable, compiler: Callable[..., Any], *args: Any) -> Any:
+        """Retrieves a compiled statement from the query cache, compiling it on a miss.
 
-                    # If not at the deepest level check elements in array
-                    if isinstance(element, (List, Tuple)):
-                        for item in element:
-                            check_array(item)
+        Args:
+            key (hashable): The shape of the query, the statement must only depend on this.
+            compiler (callable): Compiles the statement when it is not cached.
+            *args (any): Arguments to pass to the compiler.
+        """
+        compiled = cls._query_cache.get(key)
+        if compiled is None:
+            compiled = compiler(*args)
+            cls._query_cache.set(key, compiled)
+        return compiled
 
-                    # Otherwise check the type of the element
-                    else:
-                        if not check_type(element):
-                            raise TypeError(
-                                f'Column {column.name}; expected {column.type.__name__ }[], received {type(element).__name__}[]')
+    @classmethod
+    def _compile_where(cls, kwargs: Iterable[str], start: int = 1) -> Tuple[str, List[Column]]:
+        """Compiles the conditions of a WHERE clause from kwarg names."""
+        checks = []
+        columns = []
+        for i, kwarg in enumerate(kwargs, start):
+            column, statement, operator = cls._parse_kwarg(kwarg)
 
-                # Check array depth is expected.
-                check_array(value)
+            # First statement has no boolean operator
+            if i == start:
+                checks.append(f'{column.name} {operator} ${i}')
+            else:
+                checks.append(f'{statement} {column.name} {operator} ${i}')
+            columns.append(column)
 
-            # Otherwise check type of element
-            elif not check_type(value):
-                raise TypeError(
-                    f'Column {column.name}; expected {column.type.__name__}, received {type(value).__name__}')
+        return ' '.join(checks), columns
 
-            verified.append((column.name, value))
+    @classmethod
+    def _projection(cls, columns: Optional[Iterable[Column]]) -> Optional[Tuple[Column, ...]]:
+        """Resolves the columns to select, or ``None`` to select every column."""
+        if columns is None:
+            return None
 
-        return verified
+        # Convert to tuple if object is not iter
+        if not isinstance(columns, Iterable):
+            columns = (columns,)
 
-    @classmethod
-    def _query_fetch(cls, order_by: Optional[str], limit: Optional[int], **kwargs) -> Tuple[str, Iterable]:
-        """Generates a SELECT FROM stub"""
-        verified = cls._validate_kwargs(**kwargs)
+        columns = tuple(columns)
+        if not columns:
+            raise TypeError(f'Expected at least one column of {cls._name} to select')
 
-        # AND / OR statement check
-        statements = ['AND ' for _ in verified]
-        # =, <, >, != check
-        operators = ['=' for _ in verified]
+        for column in columns:
+            if not isinstance(column, Column) or cls._columns.get(column.name) is not column:
+                raise TypeError(f'Expected a column of {cls._name} to select, received {column!r}')
 
-        # Determine operators
-        for i, (_key, (key, _)) in enumerate(zip(kwargs, verified)):
+        return columns
 
-            # First statement has no boolean operator
-            if i == 0:
-                statements[i] = ''
-            elif _key[:3] == 'or_':
-                statements[i] = 'OR '
+    @classmethod
+    def _compile_select(cls, projection: Optional[Tuple[Column, ...]]) -> str:
+        """Compiles the start of a SELECT FROM stub, selecting only the projected columns."""
+        if projection is None:
+            if all(column.decode == 'eager' for column in cls._columns.values()):
+                return f'SELECT * FROM {cls._name}'
+            projection = tuple(cls._columns.values())
 
-            if _key[-4:-2] == '__':
-                try:
-                    operators[i] = _DEFAULT_OPERATORS[_key[-2:]]
-                except KeyError:
-                    raise AttributeError(f'Unknown operator type {_key[-2:]}')
+        return f'SELECT {", ".join(column._select_sql() for column in projection)} FROM {cls._name}'
 
-        builder = [f'SELECT * FROM {cls._name}']
+    @classmethod
+    def _compile_fetch(cls, kwargs: Iterable[str], order_by: Optional[str], limit: Optional[int],
+                       projection: Optional[Tuple[Column, ...]] = None) -> Tuple[str, List[Column]]:
+        """Compiles a SELECT FROM stub"""
+        builder = [cls._compile_select(projection)]
 
         # Set the WHERE clause
-        if verified:
+        checks, columns = cls._compile_where(kwargs)
+        if columns:
             builder.append('WHERE')
-            checks = []
-            for i, (key, _) in enumerate(verified):
-                checks.append(f'{statements[i]}{key} {operators[i]} ${i+1}')
-            builder.append(' '.join(checks))
+            builder.append(checks)
 
         if order_by is not None:
             builder.append(f'ORDER BY {order_by}')
@@ -235,13 +555,416 @@ class Fetchable(Creatable, metaclass=ObjectMeta):
         if limit is not None:
             builder.append(f'LIMIT {limit}')
 
-        return (" ".join(builder), (value for (_, value) in verified))
+        return " ".join(builder), columns
 
     @classmethod
-    def _query_fetch_where(cls, query: str, order_by: Optional[str], limit: Optional[int]) -> str:
+    def _query_fetch(cls, order_by: Optional[str], limit: Optional[int], projection: Optional[Tuple[Column, ...]] = None,
+                     **kwargs) -> Tuple[str, Iterable]:
         """Generates a SELECT FROM stub"""
+        query, columns = cls._compile(('fetch', tuple(kwargs), order_by, limit, projection),
+                                      cls._compile_fetch, kwargs, order_by, limit, projection)
+        return query, cls._validate_values(columns, kwargs.values())
 
-        builder = [f'SELECT * FROM {cls._name} WHERE']
+    @classmethod
+    def _get_primary_keys(cls) -> Tuple[Column, ...]:
+        """Retrieves the primary key columns of the object."""
+        if not cls._primary_keys:
+            raise TypeError(f'{cls._name} has no primary key')
+        return cls._primary_keys
+
+    @classmethod
+    def _primary_key_of(cls, mapping: Any) -> Optional[Tuple[Any, ...]]:
+        """Extracts the primary key values from a record or kwargs, if it contains every primary key column."""
+        names = cls._primary_key_names
+        if not names or not all(name in mapping.keys() for name in names):
+            return None
+        return tuple(mapping[name] for name in names)
+
+    @classmethod
+    def _compile_primary_keys_match(cls, primary_keys: Tuple[Column, ...]) -> str:
+        """Compiles a condition matching any of the primary keys passed as one array per column."""
+        if len(primary_keys) == 1:
+            column, = primary_keys
+            return f'{column.name} = ANY($1::{_cast_type(column)}[])'
+
+        arrays = ', '.join(f'${i}::{_cast_type(column)}[]' for i, column in enumerate(primary_keys, 1))
+        return f'({", ".join(column.name for column in primary_keys)}) IN (SELECT * FROM unnest({arrays}))'
+
+    @classmethod
+    def _compile_fetch_primary_keys(cls, primary_keys: Tuple[Column, ...]) -> str:
+        """Compiles a SELECT FROM stub, passing each primary key column's values as an array."""
+        return f'{cls._compile_select(None)} WHERE {cls._compile_primary_keys_match(primary_keys)}'
+
+    @classmethod
+    def _query_primary_keys(cls, primary_keys: Tuple[Column, ...]) -> str:
+        """Generates a SELECT FROM stub, passing each primary key column's values as an array."""
+        return cls._compile(('fetch_primary_keys', primary_keys), cls._compile_fetch_primary_keys, primary_keys)
+
+    @classmethod
+    def _sort_key(cls, key: Optional[Union[Column, Iterable[Column]]]) -> Tuple[Column, ...]:
+        """Resolves the columns to sort by when paginating, defaulting to the primary keys."""
+        if key is None:
+            key = cls._primary_keys
+            if not key:
+                raise TypeError(f'{cls._name} has no primary key, a sort key must be supplied')
+            return key
+
+        # Convert to tuple if object is not iter
+        if not isinstance(key, Iterable):
+            key = (key,)
+
+        key = tuple(key)
+        for column in key:
+            if not isinstance(column, Column) or cls._columns.get(column.name) is not column:
+                raise TypeError(f'Expected a column of {cls._name} for the sort key, received {column!r}')
+
+        return key
+
+    @classmethod
+    def _compile_page(cls, kwargs: Iterable[str], key: Tuple[Column, ...], descending: bool, limit: int,
+                      paginated: bool, projection: Optional[Tuple[Column, ...]] = None) -> Tuple[str, List[Column]]:
+        """Compiles a keyset paginated SELECT FROM stub"""
+        builder = [cls._compile_select(projection)]
+
+        # Set the WHERE clause
+        checks, columns = cls._compile_where(kwargs)
+        conditions = []
+        if columns:
+            conditions.append(f'({checks})')
+
+        # Seek past the previous page using a row comparison
+        if paginated:
+            start = len(columns) + 1
+            names = ', '.join(column.name for column in key)
+            placeholders = ', '.join(f'${i}' for i in range(start, start + len(key)))
+            conditions.append(f'({names}) {"<" if descending else ">"} ({placeholders})')
+
+        if conditions:
+            builder.append('WHERE')
+            builder.append(' AND '.join(conditions))
+
+        direction = ' DESC' if descending else ''
+        builder.append(f'ORDER BY {", ".join(column.name + direction for column in key)}')
+
+        # Fetch an extra record to determine whether there is another page
+        builder.append(f'LIMIT {limit + 1}')
+
+        return " ".join(builder), columns
+
+    @classmethod
+    def _explicit_connection(cls, connection: Optional[Connection]) -> Optional[Connection]:
+        """Returns the supplied connection, or the connection bound to the current task if it is within a transaction.
+
+        Reads on a bound connection outside of a transaction may still be served from the object's caches.
+        """
+        if connection is None and cls._sharding is None:
+            bound = _bound_connection(cls._pool_name)
+            if bound is not None and bound.is_in_transaction():
+                return bound
+        return connection
+
+    @classmethod
+    async def _run_query(cls, method: str, query: str, values: Iterable[Any], *, connection: Optional[Connection] = None,
+                         tag: Optional[Tuple[Any, ...]] = None, shard: Optional[str] = None,
+                         order_by: Optional[str] = None, limit: Optional[int] = None) -> Any:
+        """Runs a generated query.
+
+        Args:
+            method (str): The name of the connection method to run the query with.
+            query (str): The query to run.
+            values (list(any)): The values to pass with the query.
+            connection (Connection, optional): A database connection to use.
+                If none is supplied a connection will be acquired from the pool.
+            tag (tuple, optional): The primary key the query looks up, if it depends
+                only on the record with that primary key.
+            shard (str, optional): The pool holding the records the query reads, if known.
+            order_by (str, optional): The order of the query's records, used to merge records gathered from several shards.
+            limit (int, optional): The query's limit, applied to records gathered from several shards.
+        """
+
+        # Reads on an explicit connection may be within a transaction, so are never shared
+        connection = cls._explicit_connection(connection)
+        if connection is None and method in _READ_METHODS and (cls._result_cache is not None or cls._single_flight is not None) and cls._caches_current():
+            values = tuple(values)
+            key = (method, query, values)
+            try:
+                hash(key)
+            except TypeError:
+                pass
+            else:
+                return await cls._run_shared_query(key, method, query, values, tag, shard, order_by, limit)
+
+        return await cls._execute_query(method, query, values, connection, shard=shard, order_by=order_by, limit=limit)
+
+    @classmethod
+    async def _run_shared_query(cls, key: Hashable, method: str, query: str, values: Tuple[Any, ...],
+                                tag: Optional[Tuple[Any, ...]] = None, shard: Optional[str] = None,
+                                order_by: Optional[str] = None, limit: Optional[int] = None) -> Any:
+        """Runs a read through the object's result cache and single-flight when enabled."""
+        cache = cls._result_cache
+        if cache is not None:
+            result = cache.get(key, _MISSING)
+            if result is not _MISSING:
+                return list(result) if isinstance(result, list) else result
+            generation = cache.generation
+
+        execute = functools.partial(cls._execute_query, shard=shard, order_by=order_by, limit=limit)
+        if cls._single_flight is not None:
+            result = await cls._single_flight.run(key, execute, method, query, values)
+        else:
+            result = await execute(method, query, values)
+
+        # Don't share mutable lists of records between callers
+        if cache is not None:
+            cache.set(key, list(result) if isinstance(result, list) else result, generation, tag)
+
+        return result
+
+    @classmethod
+    def _caches_current(cls) -> bool:
+        """Whether reads may be served from the object's caches.
+
+        They are bypassed while a transaction which modified the object's data is open
+        and while the invalidation bus is disconnected.
+        """
+        if cls._uncommitted:
+            _transaction_ended()
+        return not cls._uncommitted and not _disconnected()
+
+    @classmethod
+    def _invalidate(cls, keys: Optional[Iterable[Tuple[Any, ...]]] = None, *, publish: bool = True,
+                    connection: Optional[Connection] = None):
+        """Invalidates cached query results after the object's data is modified.
+
+        Modifications made within a transaction are only visible to other connections once it is committed,
+        so the object's caches are bypassed until it ends and only then invalidated and published.
+
+        Args:
+            keys (list(tuple), optional): The primary keys of the modified records.
+                If none are supplied every cached result is invalidated.
+            publish (bool, optional): Whether to publish the invalidation to other processes.
+                Invalidations received from other processes are not published, nor do they
+                move reads to the primary for the read-your-writes window.
+            connection (Connection, optional): The connection the data was modified on.
+                If none is supplied the connection bound to the current task is checked.
+        """
+        if publish:
+            cls._record_write()
+
+        # Transactions managed by the caller may have ended since the last write
+        _transaction_ended()
+
+        if connection is None and cls._sharding is None:
+            connection = _bound_connection(cls._pool_name)
+        if connection is not None and _in_transaction(connection):
+            cls._uncommitted += 1
+            _after_transaction(connection, functools.partial(cls._committed, keys, publish))
+            return
+
+        cls._discard(keys, publish)
+
+    @classmethod
+    def _record_write(cls):
+        """Records that the object's pools were written to, so reads use the primary for the read-your-writes window."""
+        _wrote(*(cls._sharding.pools if cls._sharding is not None else (cls._pool_name,)))
+
+    @classmethod
+    def _committed(cls, keys: Optional[Iterable[Tuple[Any, ...]]], publish: bool):
+        """Invalidates cached query results once the transaction which modified the object's data has ended."""
+        cls._uncommitted -= 1
+        if publish:
+            cls._record_write()
+        cls._discard(keys, publish)
+
+    @classmethod
+    def _discard(cls, keys: Optional[Iterable[Tuple[Any, ...]]], publish: bool):
+        """Invalidates the object's result cache and single-flight, refreshes its mirror and publishes the invalidation."""
+        if cls._single_flight is not None:
+            cls._single_flight.invalidate()
+        if cls._result_cache is not None:
+            cls._result_cache.invalidate(keys)
+        if cls._mirror is not None:
+            cls._mirror.refresh(keys)
+
+        if publish and (cls._result_cache is not None or cls._mirror is not None):
+            _publish(cls, keys)
+
+    @classmethod
+    async def _execute_query(cls, method: str, query: str, values: Iterable[Any], connection: Optional[Connection] = None,
+                             *, primary: bool = False, shard: Optional[str] = None, order_by: Optional[str] = None,
+                             limit: Optional[int] = None) -> Any:
+        """Executes a generated query, acquiring a connection if none is supplied.
+
+        Reads are made on a read replica when one is available, unless ``primary`` is set.
+        Queries of sharded objects are made on every shard unless ``shard`` is supplied.
+        """
+        if connection is None and shard is None and cls._sharding is not None:
+            return await cls._scatter(method, query, values, primary, order_by, limit)
+
+        name = shard if shard is not None else cls._pool_name
+        if connection is None:
+            connection = _bound_connection(name)
+
+        if connection is None and not primary and method in _READ_METHODS:
+            replica = _replica_pool(name)
+            if replica is not None:
+                try:
+                    return await cls._run_on(method, query, values, MaybeAcquire(pool=replica, site=f'{cls._name}.{method}'))
+                except _REPLICA_ERRORS as e:
+                    _replica_failed(replica, e)
+
+        return await cls._run_on(method, query, values, MaybeAcquire(connection, pool=name, site=f'{cls._name}.{method}'))
+
+    @classmethod
+    async def _scatter(cls, method: str, query: str, values: Iterable[Any], primary: bool = False,
+                       order_by: Optional[str] = None, limit: Optional[int] = None) -> Any:
+        """Executes a generated query on every shard concurrently, combining the results."""
+        terms = _parse_order(order_by) if order_by is not None and method in _READ_METHODS else None
+        values = list(values)
+
+        results = await asyncio.gather(*(
+            cls._execute_query(method, query, values, primary=primary, shard=name) for name in cls._sharding.pools
+        ))
+
+        if method in _READ_METHODS:
+            records = [record for result in results for record in (result if method == 'fetch' else (result,)) if record is not None]
+            if terms is not None:
+                _sort_records(records, terms)
+            if method == 'fetchrow':
+                return records[0] if records else None
+            return records if limit is None else records[:limit]
+
+        if method == 'execute':
+            command = results[0].rpartition(' ')[0]
+            return f'{command} {sum(int(status.rpartition(" ")[2]) for status in results)}'
+
+        return None
+
+    @classmethod
+    def _shard_of(cls, kwargs: Dict[str, Any]) -> Optional[str]:
+        """Determines which pool holds the records matching column filters, or ``None`` if any pool may."""
+        sharding = cls._sharding
+        if sharding is None:
+            return None
+
+        shard = None
+        for kwarg, value in kwargs.items():
+            column, statement, operator = cls._parse_kwarg(kwarg)
+            if statement == 'OR':
+                return None
+            if column is sharding.column and operator == '=' and value is not None:
+                shard = sharding.pool_for(value)
+
+        return shard
+
+    @classmethod
+    async def _run_on(cls, method: str, query: str, values: Iterable[Any], acquire: MaybeAcquire) -> Any:
+        """Executes a generated query on the connection acquired by ``acquire``."""
+        async with acquire as connection:
+            with _Instrument(cls._name, method, query) as instrument:
+                result = await _execute(connection, method, query, values, cls._record_class if method in _READ_METHODS else None)
+                instrument.rows = _count_rows(method, result)
+            return result
+
+    @classmethod
+    async def _iterate_query(cls, query: str, values: Iterable[Any], *, connection: Optional[Connection] = None,
+                             prefetch: int = _DEFAULT_PREFETCH, shard: Optional[str] = None,
+                             order_by: Optional[str] = None, limit: Optional[int] = None) -> AsyncIterator[Record]:
+        """Iterates over the results of a generated query using a server-side cursor.
+
+        Queries are made on a read replica when one is available, falling back to the
+        primary if the replica fails before returning any records. Shards are iterated
+        over one after another unless ``shard`` is supplied.
+
+        Args:
+            query (str): The query to run.
+            values (list(any)): The values to pass with the query.
+            connection (Connection, optional): A database connection to use.
+                If none is supplied a connection will be acquired from the pool.
+            prefetch (int, optional): The number of records to fetch per round trip.
+            shard (str, optional): The pool holding the records the query reads, if known.
+            order_by (str, optional): The order of the query's records, which cannot be kept across shards.
+            limit (int, optional): The query's limit, applied to records gathered from several shards.
+        """
+        if connection is None and shard is None and cls._sharding is not None:
+            if order_by is not None:
+                raise TypeError(f'Cannot iterate over {cls._name} in order across shards, fetch the records instead')
+
+            remaining = limit
+            for name in cls._sharding.pools:
+                records = cls._iterate_query(query, values, prefetch=prefetch, shard=name)
+                try:
+                    async for record in records:
+                        yield record
+                        if remaining is not None:
+                            remaining -= 1
+                            if not remaining:
+                                return
+                finally:
+                    await records.aclose()
+            return
+
+        name = shard if shard is not None else cls._pool_name
+        if connection is None:
+            connection = _bound_connection(name)
+
+        replica = _replica_pool(name) if connection is None else None
+        if replica is not None:
+            records = cls._iterate_on(query, values, prefetch, MaybeAcquire(pool=replica, site=f'{cls._name}.iterate'))
+            try:
+                first = await records.__anext__()
+            except StopAsyncIteration:
+                return
+            except _REPLICA_ERRORS as e:
+                _replica_failed(replica, e)
+            else:
+                try:
+                    yield first
+                    async for record in records:
+                        yield record
+                finally:
+                    await records.aclose()
+                return
+
+        records = cls._iterate_on(query, values, prefetch, MaybeAcquire(connection, pool=name, site=f'{cls._name}.iterate'))
+        try:
+            async for record in records:
+                yield record
+        finally:
+            await records.aclose()
+
+    @classmethod
+    async def _iterate_on(cls, query: str, values: Iterable[Any], prefetch: int, acquire: MaybeAcquire) -> AsyncIterator[Record]:
+        """Iterates over the results of a generated query on the connection acquired by ``acquire``.
+
+        Cursors can only be used within a transaction. One is opened on connections acquired from
+        the pool, but a connection owned by the caller must already be in one, as a transaction
+        opened here would be left open on it until the iterator is closed.
+        """
+        async with acquire as connection:
+            if not connection.is_in_transaction() and not acquire._cleanup:
+                raise TypeError(f'Cannot iterate over {cls._name} outside of a transaction, '
+                                'start one on the connection first')
+
+            with _Instrument(cls._name, 'iterate', query, detached=True) as instrument:
+                instrument.rows = 0
+
+                if connection.is_in_transaction():
+                    async for record in _iterate(connection, query, values, prefetch, cls._record_class):
+                        instrument.rows += 1
+                        yield record
+                else:
+                    async with connection.transaction():
+                        async for record in _iterate(connection, query, values, prefetch, cls._record_class):
+                            instrument.rows += 1
+                            yield record
+
+    @classmethod
+    def _query_fetch_where(cls, query: str, order_by: Optional[str], limit: Optional[int],
+                           projection: Optional[Tuple[Column, ...]] = None) -> str:
+        """Generates a SELECT FROM stub"""
+
+        builder = [cls._compile_select(projection), 'WHERE']
         builder.append(query)
 
         if order_by is not None:
@@ -253,7 +976,8 @@ class Fetchable(Creatable, metaclass=ObjectMeta):
         return " ".join(builder)
 
     @classmethod
-    async def fetch(cls, *, connection: Optional[Connection] = None, order_by: Optional[str] = None, limit: Optional[int] = None, **kwargs) -> List[Record]:
+    async def fetch(cls, *, connection: Optional[Connection] = None, order_by: Optional[str] = None, limit: Optional[int] = None,
+                    columns: Optional[Iterable[Column]] = None, **kwargs) -> List[Record]:
         """Fetches a list of records from the database.
 
         Args:
@@ -261,16 +985,25 @@ class Fetchable(Creatable, metaclass=ObjectMeta):
                 If none is supplied a connection will be acquired from the pool.
             order_by (str, optional): Sets the `ORDER BY` constraint.
             limit (int, optional): Sets the maximum number of records to fetch.
+            columns (list(Column), optional): The columns to select.
+                If none are supplied every column is selected.
             **kwargs (any): Database :class:`Column` values to search for
         Returns:
             list(Record): A list of database records.
         """
-        query, values = cls._query_fetch(order_by, limit, **kwargs)
-        async with MaybeAcquire(connection) as connection:
-            return await connection.fetch(query, *values)
+        connection = cls._explicit_connection(connection)
+        projection = cls._projection(columns)
+        if cls._mirror is not None and connection is None and order_by is None and projection is None and cls._caches_current():
+            records = cls._mirror.lookup(kwargs, limit)
+            if records is not None:
+                return records
+
+        query, values = cls._query_fetch(order_by, limit, projection, **kwargs)
+        return await cls._run_query('fetch', query, values, connection=connection, shard=cls._shard_of(kwargs), order_by=order_by, limit=limit)
 
     @classmethod
-    async def fetchall(cls, *, connection: Optional[Connection] = None, order_by: Optional[str] = None, limit: Optional[int] = None) -> List[Record]:
+    async def fetchall(cls, *, connection: Optional[Connection] = None, order_by: Optional[str] = None, limit: Optional[int] = None,
+                       columns: Optional[Iterable[Column]] = None) -> List[Record]:
         """Fetches a list of all records from the database.
 
         Args:
@@ -278,32 +1011,71 @@ class Fetchable(Creatable, metaclass=ObjectMeta):
                 If none is supplied a connection will be acquired from the pool
             order_by (str, optional): Sets the `ORDER BY` constraint
             limit (int, optional): Sets the maximum number of records to fetch
+            columns (list(Column), optional): The columns to select.
+                If none are supplied every column is selected.
         Returns:
             list(Record): A list of database records.
         """
-        query, values = cls._query_fetch(order_by, limit)
-        async with MaybeAcquire(connection) as connection:
-            return await connection.fetch(query, *values)
+        connection = cls._explicit_connection(connection)
+        projection = cls._projection(columns)
+        if cls._mirror is not None and connection is None and order_by is None and projection is None and cls._caches_current():
+            records = cls._mirror.lookup({}, limit)
+            if records is not None:
+                return records
+
+        query, values = cls._query_fetch(order_by, limit, projection)
+        return await cls._run_query('fetch', query, values, connection=connection, order_by=order_by, limit=limit)
 
     @classmethod
-    async def fetchrow(cls, *, connection: Optional[Connection] = None, order_by: Optional[str] = None, **kwargs) -> Optional[Record]:
+    async def fetchrow(cls, *, connection: Optional[Connection] = None, order_by: Optional[str] = None,
+                       columns: Optional[Iterable[Column]] = None, **kwargs) -> Optional[Record]:
         """Fetches a record from the database.
 
         Args:
             connection (Connection, optional): A database connection to use.
                 If none is supplied a connection will be acquired from the pool.
             order_by (str, optional): Sets the `ORDER BY` constraint.
+            columns (list(Column), optional): The columns to select.
+                If none are supplied every column is selected.
             **kwargs (any): Database :class:`Column` values to search for
         Returns:
             Record: A record from the database.
         """
-        query, values = cls._query_fetch(order_by, 1, **kwargs)
-        async with MaybeAcquire(connection) as connection:
-            return await connection.fetchrow(query, *values)
+        connection = cls._explicit_connection(connection)
+        projection = cls._projection(columns)
+        if cls._mirror is not None and connection is None and order_by is None and projection is None and cls._caches_current():
+            records = cls._mirror.lookup(kwargs, 1)
+            if records is not None:
+                return records[0] if records else None
+
+        # Plain lookups by every primary key can be coalesced and cached by key
+        key = cls._primary_key_of(kwargs) if len(kwargs) == len(cls._primary_key_names) else None
+
+        if key is not None and cls._loader is not None and connection is None and order_by is None and projection is None:
+            cls._validate_values(cls._primary_keys, key)
+            cache = cls._result_cache
+            if cache is None or not cls._caches_current():
+                return await cls._loader.load(key)
+
+            # Cached under the key of the lookup made without coalescing, so either is served from the same result
+            query, values = cls._query_fetch(None, 1, None, **kwargs)
+            cache_key = ('fetchrow', query, tuple(values))
+            record = cache.get(cache_key, _MISSING)
+            if record is not _MISSING:
+                return record
+
+            generation = cache.generation
+            record = await cls._loader.load(key)
+            cache.set(cache_key, record, generation, key)
+            return record
+
+        query, values = cls._query_fetch(order_by, 1, projection, **kwargs)
+        return await cls._run_query('fetchrow', query, values, connection=connection, tag=key, shard=cls._shard_of(kwargs), order_by=order_by)
 
     @classmethod
     async def fetch_where(cls, where: str, *values, connection: Optional[Connection] = None,
-                          order_by: Optional[str] = None, limit: Optional[int] = None) -> List[Record]:
+                          order_by: Optional[str] = None, limit: Optional[int] = None,
+                          columns: Optional[Iterable[Column]] = None) -> List[Record]:
         """Fetches a list of records from the database.
 
         Args:
@@ -313,15 +1085,130 @@ class Fetchable(Creatable, metaclass=ObjectMeta):
                 If none is supplied a connection will be acquired from the pool.
             order_by (str, optional): Sets the `ORDER BY` constraint.
             limit (int, optional): Sets the maximum number of records to fetch.
+            columns (list(Column), optional): The columns to select.
+                If none are supplied every column is selected.
         Returns:
             list(Record): A list of database records.
         """
-        query = cls._query_fetch_where(where, order_by, limit)
-        async with MaybeAcquire(connection) as connection:
-            return await connection.fetch(query, *values)
+        query = cls._query_fetch_where(where, order_by, limit, cls._projection(columns))
+        return await cls._run_query('fetch', query, values, connection=connection, order_by=order_by, limit=limit)
+
+    @classmethod
+    async def fetch_page(cls, *, connection: Optional[Connection] = None, limit: int, after: Optional[str] = None,
+                         key: Optional[Union[Column, Iterable[Column]]] = None, descending: bool = False,
+                         columns: Optional[Iterable[Column]] = None, **kwargs) -> Tuple[List[Record], Optional[str]]:
+        """Fetches a page of records from the database using keyset pagination.
+
+        Unlike paginating with `OFFSET` each page is fetched in constant time
+        regardless of its depth. The sort key columns should be unique and non-nullable.
+
+        Args:
+            connection (Connection, optional): A database connection to use.
+                If none is supplied a connection will be acquired from the pool.
+            limit (int): Sets the maximum number of records per page.
+            after (str, optional): The continuation token of the previous page.
+                If none is supplied the first page is fetched.
+            key (list(Column), optional): The columns to sort by.
+                If none are supplied the primary key columns are used.
+            descending (bool, optional): Whether to sort in descending order.
+            columns (list(Column), optional): The columns to select, the sort key columns are always selected.
+                If none are supplied every column is selected.
+            **kwargs (any): Database :class:`Column` values to search for
+        Returns:
+            tuple(list(Record), str): A list of database records and the continuation
+                token of the next page, or ``None`` if this is the last page.
+        """
+        key = cls._sort_key(key)
+        projection = cls._projection(columns)
+
+        # The continuation token is created from the sort key of the last record
+        if projection is not None:
+            projection += tuple(column for column in key if column not in projection)
+
+        query, columns = cls._compile(('fetch_page', tuple(kwargs), key, descending, limit, after is not None, projection),
+                                      cls._compile_page, kwargs, key, descending, limit, after is not None, projection)
+
+        values = cls._validate_values(columns, kwargs.values())
+        if after is not None:
+
+            # Tokens are supplied by clients, so are validated even if the table's validation is off
+            token_values = _decode_token(after, key, descending)
+            try:
+                values.extend(cls._validate_values(key, token_values, ValidationMode.full))
+            except TypeError as e:
+                raise ValueError(f'Invalid continuation token: {e}') from None
+
+        order_by = ', '.join(column.name + (' DESC' if descending else '') for column in key)
+        records = await cls._run_query('fetch', query, values, connection=connection, shard=cls._shard_of(kwargs), order_by=order_by, limit=limit + 1)
+
+        if len(records) <= limit:
+            return records, None
+
+        records = records[:limit]
+        return records, _encode_token(records[-1], key, descending)
 
     @classmethod
-    async def fetchrow_where(cls, where: str, *values, connection: Optional[Connection] = None, order_by: Optional[str] = None) -> List[Record]:
+    async def iterate(cls, *, connection: Optional[Connection] = None, order_by: Optional[str] = None, limit: Optional[int] = None,
+                      prefetch: int = _DEFAULT_PREFETCH, columns: Optional[Iterable[Column]] = None, **kwargs) -> AsyncIterator[Record]:
+        """Iterates over records from the database using a server-side cursor.
+
+        Unlike :meth:`fetch` records are fetched in batches as they are consumed,
+        so memory use stays flat regardless of the number of records.
+        The connection is held until iteration finishes.
+
+        A connection that is supplied or bound with :class:`BoundConnection` must be in a transaction.
+
+        Args:
+            connection (Connection, optional): A database connection to use, which must be in a transaction.
+                If none is supplied a connection will be acquired from the pool.
+            order_by (str, optional): Sets the `ORDER BY` constraint.
+            limit (int, optional): Sets the maximum number of records to fetch.
+            prefetch (int, optional): The number of records to fetch per round trip.
+            columns (list(Column), optional): The columns to select.
+                If none are supplied every column is selected.
+            **kwargs (any): Database :class:`Column` values to search for
+        Yields:
+            Record: A record from the database.
+        """
+        query, values = cls._query_fetch(order_by, limit, cls._projection(columns), **kwargs)
+        records = cls._iterate_query(query, values, connection=connection, prefetch=prefetch, shard=cls._shard_of(kwargs),
+                                     order_by=order_by, limit=limit)
+        try:
+            async for record in records:
+                yield record
+        finally:
+            await records.aclose()
+
+    @classmethod
+    async def iterate_where(cls, where: str, *values, connection: Optional[Connection] = None, order_by: Optional[str] = None,
+                            limit: Optional[int] = None, prefetch: int = _DEFAULT_PREFETCH,
+                            columns: Optional[Iterable[Column]] = None) -> AsyncIterator[Record]:
+        """Iterates over records from the database using a server-side cursor.
+
+        Args:
+            where (str): An SQL Query to pass
+            values (tuple, optional): A tuple containing accompanying values.
+            connection (Connection, optional): A database connection to use, which must be in a transaction.
+                If none is supplied a connection will be acquired from the pool.
+            order_by (str, optional): Sets the `ORDER BY` constraint.
+            limit (int, optional): Sets the maximum number of records to fetch.
+            prefetch (int, optional): The number of records to fetch per round trip.
+            columns (list(Column), optional): The columns to select.
+                If none are supplied every column is selected.
+        Yields:
+            Record: A record from the database.
+        """
+        query = cls._query_fetch_where(where, order_by, limit, cls._projection(columns))
+        records = cls._iterate_query(query, values, connection=connection, prefetch=prefetch, order_by=order_by, limit=limit)
+        try:
+            async for record in records:
+                yield record
+        finally:
+            await records.aclose()
+
+    @classmethod
+    async def fetchrow_where(cls, where: str, *values, connection: Optional[Connection] = None, order_by: Optional[str] = None,
+                             columns: Optional[Iterable[Column]] = None) -> List[Record]:
         """Fetches a record from the database.
 
         Args:
@@ -330,36 +1217,34 @@ class Fetchable(Creatable, metaclass=ObjectMeta):
             connection (Connection, optional): A database connection to use.
                 If none is supplied a connection will be acquired from the pool.
             order_by (str, optional): Sets the `ORDER BY` constraint.
+            columns (list(Column), optional): The columns to select.
+                If none are supplied every column is selected.
         Returns:
             Record: A record from the database.
         """
-        query = cls._query_fetch_where(where, order_by, 1)
-        async with MaybeAcquire(connection) as connection:
-            return await connection.fetchrow(query, *values)
+        query = cls._query_fetch_where(where, order_by, 1, cls._projection(columns))
+        return await cls._run_query('fetchrow', query, values, connection=connection, order_by=order_by)
 
 
 class Insertable(Fetchable, metaclass=ObjectMeta):
 
     @classmethod
-    def _query_insert(cls, returning: Optional[Union[str, Iterable[Column]]], **kwargs) -> Tuple[str, Iterable]:
-        """Generates the INSERT INTO stub."""
-        verified = cls._validate_kwargs(**kwargs)
-
-        builder = [f'INSERT INTO {cls._name}']
-        builder.append(f'({", ".join(key for (key, _) in verified)})')
-        builder.append('VALUES')
+    def _compile_returning(cls, returning: Optional[Union[str, Iterable[Column]]]) -> List[str]:
+        """Compiles the RETURNING clause.
 
-        values = []
-        for i, _ in enumerate(verified, 1):
-            values.append(f'${i}')
-        builder.append(f'({", ".join(values)})')
+        Lazily decoded columns are returned encoded, as they are when selected.
+        """
+        builder = []
 
         if returning:
             builder.append('RETURNING')
 
-            if returning == '*':
+            if returning == '*' and all(column.decode == 'eager' for column in cls._columns.values()):
                 builder.append('*')
 
+            elif returning == '*':
+                builder.append(', '.join(column._select_sql() for column in cls._columns.values()))
+
             else:
 
                 # Convert to tuple if object is not iter
@@ -372,119 +1257,255 @@ class Insertable(Fetchable, metaclass=ObjectMeta):
                     if not isinstance(value, Column):
                         raise TypeError(
                             f'Expected a volume for the returning value received {type(value).__name__}')
-                    returning_builder.append(value.name)
+                    returning_builder.append(value._select_sql())
 
                 builder.append(', '.join(returning_builder))
 
-        return (" ".join(builder), (value for (_, value) in verified))
+        return builder
+
+    @classmethod
+    def _compile_on_conflict(cls, columns: Iterable[Column]) -> str:
+        """Compiles an ON CONFLICT clause which updates the supplied columns when the primary key conflicts."""
+        primary_keys = cls._get_primary_keys()
+        builder = [f'ON CONFLICT ({", ".join(column.name for column in primary_keys)})']
+
+        updates = [column.name for column in columns if not column.primary_key]
+        if updates:
+            builder.append('DO UPDATE SET')
+            builder.append(', '.join(f'{name} = EXCLUDED.{name}' for name in updates))
+        else:
+            builder.append('DO NOTHING')
+
+        return ' '.join(builder)
 
     @classmethod
-    def _query_insert_many(cls, columns) -> str:
+    def _compile_insert(cls, kwargs: Iterable[str], returning: Optional[Union[str, Iterable[Column]]],
+                        upsert: bool = False) -> Tuple[str, List[Column]]:
+        """Compiles the INSERT INTO stub."""
+        columns = [cls._parse_kwarg(kwarg)[0] for kwarg in kwargs]
+
+        builder = [f'INSERT INTO {cls._name}']
+        builder.append(f'({", ".join(column.name for column in columns)})')
+        builder.append('VALUES')
+
+        values = []
+        for i, _ in enumerate(columns, 1):
+            values.append(f'${i}')
+        builder.append(f'({", ".join(values)})')
+
+        if upsert:
+            builder.append(cls._compile_on_conflict(columns))
+
+        builder.extend(cls._compile_returning(returning))
+
+        return " ".join(builder), columns
+
+    @classmethod
+    def _query_insert(cls, returning: Optional[Union[str, Iterable[Column]]], upsert: bool = False, **kwargs) -> Tuple[str, Iterable]:
         """Generates the INSERT INTO stub."""
+
+        # Iterables of columns are unhashable, use a tuple for the cache key
+        if isinstance(returning, Iterable) and not isinstance(returning, str):
+            returning = tuple(returning)
+
+        query, columns = cls._compile(('insert', tuple(kwargs), returning, upsert), cls._compile_insert, kwargs, returning, upsert)
+        return query, cls._validate_values(columns, kwargs.values())
+
+    @classmethod
+    def _compile_insert_many(cls, columns, upsert: bool = False) -> str:
+        """Compiles the INSERT INTO stub."""
         builder = [f'INSERT INTO {cls._name}']
         builder.append(f'({", ".join(column.name for column in columns)})')
         builder.append('VALUES')
         builder.append(
             f'({", ".join(f"${n+1}" for n in range(len(columns)))})')
 
+        if upsert:
+            builder.append(cls._compile_on_conflict(columns))
+
         return " ".join(builder)
 
     @classmethod
-    def _query_update_record(cls, record, **kwargs) -> Tuple[str, List[Any]]:
-        '''Generates the UPDATE stub'''
-        verified = cls._validate_kwargs(**kwargs)
+    def _query_insert_many(cls, columns, upsert: bool = False) -> str:
+        """Generates the INSERT INTO stub."""
+        columns = tuple(columns)
+        return cls._compile(('insert_many', columns, upsert), cls._compile_insert_many, columns, upsert)
+
+    @classmethod
+    def _compile_upsert_unnest(cls, columns) -> str:
+        """Compiles the INSERT INTO stub, passing each column's values as an array."""
+        builder = [f'INSERT INTO {cls._name}']
+        builder.append(f'({", ".join(column.name for column in columns)})')
+        builder.append(f'SELECT * FROM unnest({", ".join(f"${i}::{_cast_type(column)}[]" for i, column in enumerate(columns, 1))})')
+        builder.append(cls._compile_on_conflict(columns))
 
+        return " ".join(builder)
+
+    @classmethod
+    def _query_upsert_unnest(cls, columns) -> str:
+        """Generates the INSERT INTO stub, passing each column's values as an array."""
+        columns = tuple(columns)
+        return cls._compile(('upsert_unnest', columns), cls._compile_upsert_unnest, columns)
+
+    @classmethod
+    def _compile_record_keys(cls, record_keys: Iterable[str], start: int = 1) -> Tuple[str, List[Column]]:
+        """Compiles the primary key conditions of a WHERE clause from a record's keys."""
+        primary_keys = [column for column in map(cls._get_column, record_keys) if column.primary_key]
+
+        checks = []
+        for i, column in enumerate(primary_keys, start):
+            checks.append(f'{column.name} = ${i}')
+
+        return ' AND '.join(checks), primary_keys
+
+    @classmethod
+    def _record_keys(cls, record) -> Tuple[str, ...]:
+        """Returns the keys of a record to compile a statement for."""
+
+        # Records of this table's record class are identified by their primary keys alone
+        if isinstance(record, cls._record_class) and cls._primary_key_names:
+            return cls._primary_key_names
+        return tuple(record.keys())
+
+    @classmethod
+    def _record_values(cls, record, columns: Iterable[Column]) -> List[Any]:
+        """Extracts and validates the values of the supplied columns from a record."""
+
+        # Records fetched from the database are trusted
+        mode = ValidationMode.off if isinstance(record, asyncpg.Record) else None
+        return cls._validate_values(columns, (record[column.name] for column in columns), mode)
+
+    @classmethod
+    def _compile_update_record(cls, record_keys: Iterable[str], kwargs: Iterable[str]) -> Tuple[str, List[Column], List[Column]]:
+        """Compiles the UPDATE stub"""
         builder = [f'UPDATE {cls._name} SET']
 
         # Set the values
         sets = []
-        for i, (key, _) in enumerate(verified, 1):
-            sets.append(f'{key} = ${i}')
+        columns = []
+        for i, kwarg in enumerate(kwargs, 1):
+            column, _, _ = cls._parse_kwarg(kwarg)
+            sets.append(f'{column.name} = ${i}')
+            columns.append(column)
         builder.append(', '.join(sets))
 
         # Set the QUERY
-        record_keys = cls._validate_kwargs(primary_keys_only=True, **record)
-
+        checks, primary_keys = cls._compile_record_keys(record_keys, len(columns) + 1)
         builder.append('WHERE')
-        checks = []
-        for i, (key, _) in enumerate(record_keys, i + 1):
-            checks.append(f'{key} = ${i}')
-        builder.append(' AND '.join(checks))
+        builder.append(checks)
 
-        return (" ".join(builder), list((value for (_, value) in verified)) + list((value for (_, value) in record_keys)))
+        return " ".join(builder), columns, primary_keys
 
     @classmethod
-    def _query_update_where(cls, query, values, **kwargs) -> Tuple[str, List[Any]]:
+    def _query_update_record(cls, record, **kwargs) -> Tuple[str, List[Any]]:
         '''Generates the UPDATE stub'''
-        verified = cls._validate_kwargs(**kwargs)
+        record_keys = cls._record_keys(record)
+        query, columns, primary_keys = cls._compile(('update_record', record_keys, tuple(kwargs)),
+                                                    cls._compile_update_record, record_keys, kwargs)
+
+        values = cls._validate_values(columns, kwargs.values())
+        values.extend(cls._record_values(record, primary_keys))
+        return query, values
 
+    @classmethod
+    def _compile_update_where(cls, query: str, n_values: int, kwargs: Iterable[str]) -> Tuple[str, List[Column]]:
+        """Compiles the UPDATE stub"""
         builder = [f'UPDATE {cls._name} SET']
 
         # Set the values
         sets = []
-        for i, (key, _) in enumerate(verified, len(values) + 1):
-            sets.append(f'{key} = ${i}')
+        columns = []
+        for i, kwarg in enumerate(kwargs, n_values + 1):
+            column, _, _ = cls._parse_kwarg(kwarg)
+            sets.append(f'{column.name} = ${i}')
+            columns.append(column)
         builder.append(', '.join(sets))
 
         # Set the QUERY
         builder.append('WHERE')
         builder.append(query)
 
-        return (" ".join(builder), values + tuple(value for (_, value) in verified))
+        return " ".join(builder), columns
 
     @classmethod
-    def _query_delete(cls, **kwargs) -> Tuple[str, List[Any]]:
-        '''Generates the DELETE stub'''
-        verified = cls._validate_kwargs(**kwargs)
-
-        # AND / OR statement check
-        statements = ['AND ' for _ in verified]
-        # =, <, >, != check
-        operators = ['=' for _ in verified]
-
-        # Determine operators
-        for i, (_key, (key, _)) in enumerate(zip(kwargs, verified)):
-
-            # First statement has no boolean operator
-            if i == 0:
-                statements[i] = ''
-            elif _key[:3] == 'or_':
-                statements[i] = 'OR '
+    def _query_update_where(cls, query, values, **kwargs) -> Tuple[str, List[Any]]:
+        '''Generates the UPDATE stub'''
+        query, columns = cls._compile(('update_where', query, len(values), tuple(kwargs)),
+                                      cls._compile_update_where, query, len(values), kwargs)
 
-            if _key[-4:-2] == '__':
-                try:
-                    operators[i] = _DEFAULT_OPERATORS[_key[-2:]]
-                except KeyError:
-                    raise AttributeError(f'Unknown operator type {_key[-2:]}')
+        return query, values + tuple(cls._validate_values(columns, kwargs.values()))
 
+    @classmethod
+    def _compile_delete(cls, kwargs: Iterable[str]) -> Tuple[str, List[Column]]:
+        """Compiles the DELETE stub"""
         builder = [f'DELETE FROM {cls._name}']
 
         # Set the WHERE clause
-        if verified:
+        checks, columns = cls._compile_where(kwargs)
+        if columns:
             builder.append('WHERE')
-            checks = []
-            for i, (key, _) in enumerate(verified):
-                checks.append(f'{statements[i]}{key} {operators[i]} ${i+1}')
-            builder.append(' '.join(checks))
+            builder.append(checks)
 
-        return (" ".join(builder), list(value for (_, value) in verified))
+        return " ".join(builder), columns
 
     @classmethod
-    def _query_delete_record(cls, record) -> Tuple[str, List[Any]]:
+    def _query_delete(cls, **kwargs) -> Tuple[str, List[Any]]:
         '''Generates the DELETE stub'''
+        query, columns = cls._compile(('delete', tuple(kwargs)), cls._compile_delete, kwargs)
+        return query, cls._validate_values(columns, kwargs.values())
 
+    @classmethod
+    def _compile_delete_record(cls, record_keys: Iterable[str]) -> Tuple[str, List[Column]]:
+        """Compiles the DELETE stub"""
         builder = [f'DELETE FROM {cls._name}']
 
         # Set the QUERY
-        record_keys = cls._validate_kwargs(primary_keys_only=True, **record)
+        checks, primary_keys = cls._compile_record_keys(record_keys)
+        builder.append('WHERE')
+        builder.append(checks)
+
+        return " ".join(builder), primary_keys
+
+    @classmethod
+    def _query_delete_record(cls, record) -> Tuple[str, List[Any]]:
+        '''Generates the DELETE stub'''
+        record_keys = cls._record_keys(record)
+        query, primary_keys = cls._compile(('delete_record', record_keys), cls._compile_delete_record, record_keys)
+        return query, cls._record_values(record, primary_keys)
+
+    @classmethod
+    def _compile_update_records(cls, primary_keys: Tuple[Column, ...], columns: Tuple[Column, ...]) -> str:
+        """Compiles the UPDATE FROM stub, passing each column's values as an array."""
+        builder = [f'UPDATE {cls._name} SET']
+        builder.append(', '.join(f'{column.name} = _data.{column.name}' for column in columns))
+
+        arrays = ', '.join(f'${i}::{_cast_type(column)}[]' for i, column in enumerate(columns + primary_keys, 1))
+        builder.append(f'FROM unnest({arrays}) AS _data({", ".join(column.name for column in columns + primary_keys)})')
 
         builder.append('WHERE')
-        checks = []
-        for i, (key, _) in enumerate(record_keys, 1):
-            checks.append(f'{key} = ${i}')
-        builder.append(' AND '.join(checks))
+        builder.append(' AND '.join(f'{cls._name}.{column.name} = _data.{column.name}' for column in primary_keys))
+
+        return " ".join(builder)
+
+    @classmethod
+    def _query_update_records(cls, primary_keys: Tuple[Column, ...], columns: Tuple[Column, ...]) -> str:
+        """Generates the UPDATE FROM stub, passing each column's values as an array."""
+        return cls._compile(('update_records', primary_keys, columns), cls._compile_update_records, primary_keys, columns)
 
-        return (" ".join(builder), list(value for (_, value) in record_keys))
+    @classmethod
+    def _compile_delete_records(cls, primary_keys: Tuple[Column, ...]) -> str:
+        """Compiles the DELETE stub, passing each primary key column's values as an array."""
+        builder = [f'DELETE FROM {cls._name}']
+
+        builder.append('WHERE')
+        builder.append(cls._compile_primary_keys_match(primary_keys))
+
+        return " ".join(builder)
+
+    @classmethod
+    def _query_delete_records(cls, primary_keys: Tuple[Column, ...]) -> str:
+        """Generates the DELETE stub, passing each primary key column's values as an array."""
+        return cls._compile(('delete_records', primary_keys), cls._compile_delete_records, primary_keys)
 
     @classmethod
     def _query_delete_where(cls, query) -> str:
@@ -498,6 +1519,81 @@ class Insertable(Fetchable, metaclass=ObjectMeta):
 
         return " ".join(builder)
 
+    @classmethod
+    async def _run_write(cls, method: str, query: str, values: Iterable[Any], *, connection: Optional[Connection] = None,
+                         keys: Optional[Iterable[Tuple[Any, ...]]] = None, shard: Optional[str] = None) -> Any:
+        """Runs a generated query which modifies the table, invalidating its cached query results.
+
+        Writes are never shared with other calls, even if they return records,
+        and always run on the primary, never a read replica.
+
+        Args:
+            keys (list(tuple), optional): The primary keys of the records the query modifies, if known.
+            shard (str, optional): The pool holding the records the query modifies, if known.
+        """
+        try:
+            return await cls._execute_query(method, query, values, connection, primary=True, shard=shard)
+        finally:
+            cls._invalidate(keys, connection=connection)
+
+    @classmethod
+    def _row_keys(cls, columns: Sequence[Column], rows: Iterable[Sequence[Any]]) -> Optional[List[Tuple[Any, ...]]]:
+        """Extracts the primary keys from rows of values ordered as ``columns``, if every primary key column is present."""
+        indexes = {column.name: i for i, column in enumerate(columns)}
+        primary_keys = cls._primary_key_names
+        if not primary_keys or not all(name in indexes for name in primary_keys):
+            return None
+        return [tuple(row[indexes[name]] for name in primary_keys) for row in rows]
+
+    @classmethod
+    def _shard_of_record(cls, record: Any, required: bool = False) -> Optional[str]:
+        """Determines which pool holds a record, a mapping of column names to values, from its shard key.
+
+        Args:
+            record (Record): The record.
+            required (bool, optional): Whether to raise if the record has no shard key value.
+        Returns:
+            str: The name of the pool, or ``None`` if the table is not sharded or the shard key is unknown.
+        """
+        sharding = cls._sharding
+        if sharding is None:
+            return None
+
+        value = record.get(sharding.column.name)
+        if value is None:
+            if required:
+                raise TypeError(f'A value for the shard key {sharding.column.name} of {cls._name} must be supplied')
+            return None
+
+        return sharding.pool_for(value)
+
+    @classmethod
+    def _group_by_shard(cls, columns: Sequence[Column], rows: Iterable[Any]) -> Dict[str, List[Any]]:
+        """Groups rows of values ordered as ``columns``, or mappings of column names to values, by the pool which holds them."""
+        sharding = cls._sharding
+        index = next((i for i, column in enumerate(columns) if column is sharding.column), None)
+
+        groups: Dict[str, List[Any]] = {}
+        for row in rows:
+            if hasattr(row, 'keys'):
+                shard = cls._shard_of_record(row, True)
+            elif index is None:
+                raise TypeError(f'A value for the shard key {sharding.column.name} of {cls._name} must be supplied')
+            else:
+                shard = sharding.pool_for(row[index])
+            groups.setdefault(shard, []).append(row)
+
+        return groups
+
+    @classmethod
+    async def _on_shards(cls, groups: Dict[str, List[Any]], func: Callable[[Connection, List[Any]], Awaitable[Any]], site: str) -> List[Any]:
+        """Runs a function concurrently with a connection to each shard and the rows it holds."""
+        async def run(shard, rows):
+            async with MaybeAcquire(pool=shard, site=site) as connection:
+                return await func(connection, rows)
+
+        return await asyncio.gather(*(run(shard, rows) for shard, rows in groups.items()))
+
     @classmethod
     async def insert(cls, *, connection: Connection = None, returning: Iterable[Column] = None, **kwargs) -> Optional[Record]:
         """Inserts a new record into the database.
@@ -511,10 +1607,12 @@ class Insertable(Fetchable, metaclass=ObjectMeta):
             (Record, optional): The record inserted into the database
         """
         query, values = cls._query_insert(returning, **kwargs)
-        async with MaybeAcquire(connection) as connection:
-            if returning:
-                return await connection.fetchrow(query, *values)
-            await connection.execute(query, *values)
+        key = cls._primary_key_of(kwargs)
+        keys = None if key is None else [key]
+        shard = cls._shard_of_record(kwargs, connection is None)
+        if returning:
+            return await cls._run_write('fetchrow', query, values, connection=connection, keys=keys, shard=shard)
+        await cls._run_write('execute', query, values, connection=connection, keys=keys, shard=shard)
         return None
 
     @classmethod
@@ -526,10 +1624,157 @@ class Insertable(Fetchable, metaclass=ObjectMeta):
             connection (asyncpg.Connection, optional): A database connection to use.
                 If none is supplied a connection will be acquired from the pool.
         """
+        columns = tuple(columns)
+        if connection is None and cls._sharding is not None:
+            await cls._on_shards(cls._group_by_shard(columns, values), lambda connection, rows: cls.insert_many(
+                columns, *rows, connection=connection), f'{cls._name}.insert_many')
+            return
+
         query = cls._query_insert_many(columns)
 
-        async with MaybeAcquire(connection) as connection:
-            await connection.executemany(query, values)
+        await cls._run_write('executemany', query, values, connection=connection, keys=cls._row_keys(columns, values))
+
+    @classmethod
+    async def upsert(cls, *, connection: Connection = None, returning: Iterable[Column] = None, **kwargs) -> Optional[Record]:
+        """Inserts a new record into the database, updating the existing record if the primary key conflicts.
+
+        Args:
+            connection (Connection, optional): A database connection to use.
+                If none is supplied a connection will be acquired from the pool.
+            returning (list(Column), optional): A list of columns from this record to return
+            **kwargs (any): The records column values.
+        Returns:
+            (Record, optional): The record inserted or updated in the database
+        """
+        query, values = cls._query_insert(returning, True, **kwargs)
+        key = cls._primary_key_of(kwargs)
+        keys = None if key is None else [key]
+        shard = cls._shard_of_record(kwargs, connection is None)
+        if returning:
+            return await cls._run_write('fetchrow', query, values, connection=connection, keys=keys, shard=shard)
+        await cls._run_write('execute', query, values, connection=connection, keys=keys, shard=shard)
+        return None
+
+    @classmethod
+    async def upsert_many(cls, columns: Iterable[Column], *values: Iterable[Iterable[Any]], connection: Connection = None):
+        """Inserts multiple records into the database, updating existing records if their primary keys conflict.
+
+        All records are sent in a single statement as one array per column.
+        Each primary key may only appear once per call.
+
+        Args:
+            columns (list(Column)): The list of columns to insert based on.
+            values (list(list)): The list of values to insert into the database.
+            connection (asyncpg.Connection, optional): A database connection to use.
+                If none is supplied a connection will be acquired from the pool.
+        """
+        columns = tuple(columns)
+        if connection is None and cls._sharding is not None:
+            await cls._on_shards(cls._group_by_shard(columns, values), lambda connection, rows: cls.upsert_many(
+                columns, *rows, connection=connection), f'{cls._name}.upsert_many')
+            return
+
+        values = [cls._validate_values(columns, row) for row in values]
+        if not values:
+            return
+
+        keys = cls._row_keys(columns, values)
+
+        # Multidimensional arrays cannot be unnested into rows, upsert each record instead
+        if any(column.is_array for column in columns):
+            query = cls._query_insert_many(columns, True)
+            await cls._run_write('executemany', query, values, connection=connection, keys=keys)
+            return
+
+        query = cls._query_upsert_unnest(columns)
+        arrays = [list(array) for array in zip(*values)]
+        await cls._run_write('execute', query, arrays, connection=connection, keys=keys)
+
+    @classmethod
+    def _copy_values(cls, columns: List[Column], records: Iterable[Any]) -> List[Tuple[Any, ...]]:
+        """Converts and validates records for use with the COPY protocol."""
+        rows = []
+        for record in records:
+
+            # Extract values from mappings in column order
+            if hasattr(record, 'keys'):
+                record = [record[column.name] for column in columns]
+            elif len(record) != len(columns):
+                raise TypeError(f'Expected {len(columns)} values for table {cls._name}, received {len(record)}')
+
+            rows.append(tuple(cls._validate_values(columns, record)))
+
+        return rows
+
+    @classmethod
+    def _copy_columns(cls, record: Any) -> List[Column]:
+        """Determines the columns to copy from the first record, if none were supplied."""
+        if hasattr(record, 'keys'):
+            return [cls._get_column(key) for key in record.keys()]
+        return list(cls._columns.values())
+
+    @classmethod
+    async def copy_records(cls, records: Union[Iterable[Any], AsyncIterable[Any]], *, columns: Optional[Iterable[Column]] = None,
+                           connection: Connection = None, chunk_size: int = _DEFAULT_COPY_CHUNK_SIZE) -> int:
+        """Inserts multiple records into the database using the binary COPY protocol.
+
+        This is significantly faster than :meth:`insert_many` for large numbers of records.
+        Records are sent in chunks inside a single transaction, so at most
+        ``chunk_size`` records are held in memory at once.
+
+        The COPY protocol can only send JSON values in the binary format, so records with
+        JSON or JSONB columns are inserted with :meth:`insert_many` unless the pool was
+        created with ``binary_json=True``.
+
+        Args:
+            records (list or async iterator): The records to insert, either as sequences of
+                values ordered as ``columns`` or as mappings of column names to values.
+            columns (list(Column), optional): The list of columns to insert based on.
+                If none are supplied the keys of the first record are used if it is a mapping,
+                otherwise all of the table's columns are used.
+            connection (Connection, optional): A database connection to use.
+                If none is supplied a connection will be acquired from the pool.
+            chunk_size (int, optional): The maximum number of records to send per COPY.
+        Returns:
+            int: The number of records inserted.
+        """
+        if columns is not None:
+            columns = list(columns)
+
+        # Each chunk is split between the shards, which cannot share a transaction
+        if connection is None and cls._sharding is not None:
+            inserted = 0
+            async for chunk in _chunked(records, chunk_size):
+                columns = columns or cls._copy_columns(chunk[0])
+                counts = await cls._on_shards(cls._group_by_shard(columns, chunk), lambda connection, rows: cls.copy_records(
+                    rows, columns=columns, connection=connection, chunk_size=chunk_size), f'{cls._name}.copy')
+                inserted += sum(counts)
+            return inserted
+
+        inserted = 0
+        async with MaybeAcquire(connection, pool=cls._pool_name, site=f'{cls._name}.copy') as connection:
+            async with connection.transaction():
+                async for chunk in _chunked(records, chunk_size):
+                    columns = columns or cls._copy_columns(chunk[0])
+
+                    if not getattr(connection, '_binary_json', False) and any(column.type in _JSON_TYPES for column in columns):
+                        rows = cls._copy_values(columns, chunk)
+                        await cls._execute_query('executemany', cls._query_insert_many(columns), rows, connection)
+                        inserted += len(rows)
+                        continue
+
+                    with _Instrument(cls._name, 'copy', f'COPY {cls._name} ({", ".join(column.name for column in columns)}) FROM STDIN') as instrument:
+                        status = await connection.copy_records_to_table(
+                            cls.__name__.lower(),
+                            records=cls._copy_values(columns, chunk),
+                            columns=[column.name for column in columns],
+                            schema_name=cls.schema
+                        )
+                        instrument.rows = _count_rows('copy', status)
+                    inserted += instrument.rows
+
+        cls._invalidate(connection=connection)
+        return inserted
 
     @classmethod
     async def update_record(cls, record: Record, *, connection: Connection = None, **kwargs):
@@ -542,8 +1787,83 @@ class Insertable(Fetchable, metaclass=ObjectMeta):
             **kwargs: Values to update
         """
         query, values = cls._query_update_record(record, **kwargs)
-        async with MaybeAcquire(connection) as connection:
-            await connection.execute(query, *values)
+
+        # Changing the primary key also affects lookups of the new key
+        keys = None
+        if not any(cls._get_column(key).primary_key for key in kwargs):
+            key = cls._primary_key_of(record)
+            keys = None if key is None else [key]
+
+        shard = cls._shard_of_record(record)
+        if shard is not None and cls._shard_of_record(kwargs) not in (None, shard):
+            raise TypeError(f'Cannot move a record of {cls._name} to another shard')
+
+        await cls._run_write('execute', query, values, connection=connection, keys=keys, shard=shard)
+
+    @classmethod
+    async def _run_chunks(cls, method: str, query: str, chunks: List[Iterable[Any]], *, connection: Optional[Connection] = None,
+                          keys: Optional[Iterable[Tuple[Any, ...]]] = None):
+        """Runs a query once per chunk of values, within a transaction if there are multiple chunks.
+
+        Chunks are run on every shard of a sharded table without a transaction, which cannot span shards.
+        """
+        if len(chunks) == 1 or (connection is None and cls._sharding is not None):
+            for values in chunks:
+                await cls._run_write(method, query, values, connection=connection, keys=keys)
+            return
+
+        try:
+            async with MaybeAcquire(connection, pool=cls._pool_name, site=f'{cls._name}.{method}') as connection:
+                async with connection.transaction():
+                    for values in chunks:
+                        await cls._execute_query(method, query, values, connection)
+        finally:
+            cls._invalidate(keys, connection=connection)
+
+    @classmethod
+    async def update_records(cls, records: Iterable[Record], *, columns: Optional[Iterable[Column]] = None,
+                             connection: Connection = None, chunk_size: Optional[int] = None):
+        """Updates multiple records in the database.
+
+        Each record is matched by its primary key and its other column values are set.
+        Records are sent in a single statement as one array per column.
+
+        Args:
+            records (list(Record)): The database records to update, as records or mappings of column names to values.
+            columns (list(Column), optional): The columns to update.
+                If none are supplied every non primary key column of the first record is updated.
+            connection (Connection, optional): A database connection to use.
+                If none is supplied a connection will be acquired from the pool
+            chunk_size (int, optional): The maximum number of records to update per statement.
+                Multiple statements are run within a transaction.
+        """
+        records = list(records)
+        if not records:
+            return
+
+        primary_keys = cls._get_primary_keys()
+        if columns is None:
+            columns = (cls._get_column(key) for key in records[0].keys())
+        columns = tuple(column for column in columns if not column.primary_key)
+        if not columns:
+            raise TypeError(f'No columns of {cls._name} to update were supplied')
+
+        rows = [cls._record_values(record, columns + primary_keys) for record in records]
+        keys = [tuple(row[len(columns):]) for row in rows]
+        size = chunk_size or len(rows)
+        chunks = [rows[i:i + size] for i in range(0, len(rows), size)]
+
+        # Multidimensional arrays cannot be unnested into rows, update each record instead
+        if any(column.is_array for column in columns):
+            record_keys = tuple(column.name for column in primary_keys)
+            kwargs = tuple(column.name for column in columns)
+            query, _, _ = cls._compile(('update_record', record_keys, kwargs), cls._compile_update_record, record_keys, kwargs)
+            await cls._run_chunks('executemany', query, chunks, connection=connection, keys=keys)
+            return
+
+        query = cls._query_update_records(primary_keys, columns)
+        chunks = [[list(array) for array in zip(*chunk)] for chunk in chunks]
+        await cls._run_chunks('execute', query, chunks, connection=connection, keys=keys)
 
     @classmethod
     async def update_where(cls, where: str, *values: Any, connection: Connection = None, **kwargs):
@@ -557,9 +1877,11 @@ class Insertable(Fetchable, metaclass=ObjectMeta):
             **kwargs: Values to update
         """
 
+        if cls._sharding is not None and cls._sharding.column.name in kwargs:
+            raise TypeError(f'Cannot move records of {cls._name} to another shard')
+
         query, values = cls._query_update_where(where, values, **kwargs)  # type: ignore
-        async with MaybeAcquire(connection) as connection:
-            await connection.execute(query, *values)
+        await cls._run_write('execute', query, values, connection=connection)
 
     @classmethod
     async def delete(cls, *, connection: Connection = None, **kwargs):
@@ -571,8 +1893,7 @@ class Insertable(Fetchable, metaclass=ObjectMeta):
             **kwargs (any): Database :class:`Column` values to filter by when deleting.
         """
         query, values = cls._query_delete(**kwargs)
-        async with MaybeAcquire(connection) as connection:
-            await connection.execute(query, *values)
+        await cls._run_write('execute', query, values, connection=connection, shard=cls._shard_of(kwargs))
 
     @classmethod
     async def delete_record(cls, record: Record, *, connection: Connection = None):
@@ -584,8 +1905,32 @@ class Insertable(Fetchable, metaclass=ObjectMeta):
                 If none is supplied a connection will be acquired from the pool
         """
         query, values = cls._query_delete_record(record)
-        async with MaybeAcquire(connection) as connection:
-            await connection.execute(query, *values)
+        key = cls._primary_key_of(record)
+        await cls._run_write('execute', query, values, connection=connection, keys=None if key is None else [key],
+                             shard=cls._shard_of_record(record))
+
+    @classmethod
+    async def delete_records(cls, records: Iterable[Record], *, connection: Connection = None, chunk_size: Optional[int] = None):
+        """Deletes multiple records in the database.
+
+        Records are matched by their primary keys, which are sent in a single statement as one array per column.
+
+        Args:
+            records (list(Record)): The database records to delete
+            connection (Connection, optional): A database connection to use.
+                If none is supplied a connection will be acquired from the pool
+            chunk_size (int, optional): The maximum number of records to delete per statement.
+                Multiple statements are run within a transaction.
+        """
+        primary_keys = cls._get_primary_keys()
+        rows = [cls._record_values(record, primary_keys) for record in records]
+        if not rows:
+            return
+
+        query = cls._query_delete_records(primary_keys)
+        size = chunk_size or len(rows)
+        chunks = [[list(array) for array in zip(*rows[i:i + size])] for i in range(0, len(rows), size)]
+        await cls._run_chunks('execute', query, chunks, connection=connection, keys=[tuple(row) for row in rows])
 
     @classmethod
     async def delete_where(cls, where: str, *values: Optional[Tuple[Any]], connection: Connection = None):
@@ -598,5 +1943,4 @@ class Insertable(Fetchable, metaclass=ObjectMeta):
                 If none is supplied a connection will be acquired from the pool
         """
         query = cls._query_delete_where(where)
-        async with MaybeAcquire(connection) as connection:
-            await connection.execute(query, *values)
+        await cls._run_write('execute', query, values, connection=connection)
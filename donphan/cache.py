@@ -0,0 +1,242 @@
+import sys
+import time
+
+from collections import namedtuple, OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Set
+
+
+CacheInfo = namedtuple('CacheInfo', ('hits', 'misses', 'evictions', 'maxsize', 'currsize'))
+ResultCacheInfo = namedtuple('ResultCacheInfo', ('hits', 'misses', 'evictions', 'expirations', 'invalidations',
+                                                 'maxsize', 'currsize', 'memory', 'hit_rate'))
+
+
+class QueryCache:
+    """A bounded least recently used cache of compiled SQL statements.
+
+    Args:
+        maxsize (int, optional): The maximum number of statements to hold.
+            Once full the least recently used statement is evicted.
+        on_evict (callable, optional): Called with the key of each evicted statement.
+    """
+
+    def __init__(self, maxsize: int = 128, on_evict: Optional[Callable[[Hashable], Any]] = None):
+        self.maxsize = maxsize
+        self.on_evict = on_evict
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Fetches a compiled statement from the cache.
+
+        Args:
+            key (hashable): The shape of the query.
+        Returns:
+            The compiled statement, or ``None`` if it is not cached.
+        """
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        """Stores a compiled statement in the cache.
+
+        Args:
+            key (hashable): The shape of the query.
+            value (any): The compiled statement.
+        """
+        if self.maxsize <= 0:
+            return
+
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.maxsize:
+            key, _ = self._entries.popitem(last=False)
+            self.evictions += 1
+            if self.on_evict is not None:
+                self.on_evict(key)
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        """Removes a compiled statement from the cache.
+
+        Args:
+            key (hashable): The shape of the query.
+        Returns:
+            The removed statement, or ``None`` if it was not cached.
+        """
+        return self._entries.pop(key, None)
+
+    def clear(self):
+        """Removes all statements from the cache and resets its counters."""
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def info(self) -> CacheInfo:
+        """Returns the cache's statistics.
+
+        Returns:
+            CacheInfo: A named tuple of ``hits``, ``misses``, ``evictions``, ``maxsize`` and ``currsize``.
+        """
+        return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self._entries))
+
+
+def _sizeof(value: Any) -> int:
+    """Approximates the memory used by a query result."""
+    size = sys.getsizeof(value)
+
+    if isinstance(value, list):
+        return size + sum(_sizeof(item) for item in value)
+
+    # Records and mappings
+    if hasattr(value, 'values'):
+        return size + sum(sys.getsizeof(item) for item in value.values())
+
+    return size
+
+
+class ResultCache:
+    """A bounded least recently used cache of query results with an optional time to live.
+
+    Tables opt in using the ``result_cache_size`` and ``result_cache_ttl`` class keywords.
+    Only reads without an explicit connection are cached, and writes through the table
+    invalidate its cache, or bypass it until their transaction ends if made within one.
+    Writes made by other means are only observed once results expire.
+
+    Args:
+        maxsize (int, optional): The maximum number of results to hold.
+            Once full the least recently used result is evicted.
+        ttl (float, optional): The number of seconds results remain valid for.
+            If none is supplied results remain valid until evicted or invalidated.
+
+    Attributes:
+        generation (int): Incremented whenever the cache is invalidated, results of
+            queries started in a previous generation must not be stored.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.memory = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._tags: Dict[Optional[Hashable], Set[Hashable]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Fetches a query result from the cache.
+
+        Args:
+            key (hashable): The query and its arguments.
+            default (any, optional): The value to return if the result is not cached.
+        Returns:
+            The cached result, or ``default`` if it is not cached or has expired.
+        """
+        try:
+            expires, _, _, value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return default
+
+        if expires is not None and expires <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None, tag: Optional[Hashable] = None):
+        """Stores a query result in the cache.
+
+        Args:
+            key (hashable): The query and its arguments.
+            value (any): The result of the query.
+            generation (int, optional): The generation the query was started in.
+                If the cache has since been invalidated the result is discarded.
+            tag (hashable, optional): The primary key the query looked up, if it
+                depends only on the record with that primary key.
+        """
+        if self.maxsize <= 0 or (generation is not None and generation != self.generation):
+            return
+
+        self._remove(key)
+
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        size = _sizeof(value)
+        self._entries[key] = (expires, size, tag, value)
+        self._tags.setdefault(tag, set()).add(key)
+        self.memory += size
+
+        while len(self._entries) > self.maxsize:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            _, size, tag, _ = entry
+            self.memory -= size
+
+            keys = self._tags[tag]
+            keys.discard(key)
+            if not keys:
+                del self._tags[tag]
+
+    def invalidate(self, tags: Optional[Iterable[Hashable]] = None):
+        """Removes results from the cache, for use after the underlying data changes.
+
+        Args:
+            tags (list(hashable), optional): The primary keys of the modified records.
+                Results which depend only on other records are kept.
+                If none are supplied every result is removed.
+        """
+        self.generation += 1
+        self.invalidations += 1
+
+        if tags is None:
+            self._entries.clear()
+            self._tags.clear()
+            self.memory = 0
+            return
+
+        # Untagged results may depend on any record
+        for tag in (None, *tags):
+            for key in list(self._tags.get(tag, ())):
+                self._remove(key)
+
+    def clear(self):
+        """Removes all results from the cache and resets its counters."""
+        self.invalidate()
+        self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+
+    def info(self) -> ResultCacheInfo:
+        """Returns the cache's statistics.
+
+        Returns:
+            ResultCacheInfo: A named tuple of ``hits``, ``misses``, ``evictions``, ``expirations``,
+                ``invalidations``, ``maxsize``, ``currsize``, the approximate ``memory`` used in bytes
+                and the ``hit_rate``.
+        """
+        lookups = self.hits + self.misses
+        return ResultCacheInfo(self.hits, self.misses, self.evictions, self.expirations, self.invalidations,
+                               self.maxsize, len(self._entries), self.memory, self.hits / lookups if lookups else 0.0)
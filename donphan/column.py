@@ -1,18 +1,24 @@
 from .sqltype import SQLType
 
 from json import dumps
-from typing import Any, Optional, TYPE_CHECKING, Type
+from typing import Any, Optional, TYPE_CHECKING, Type, Union
 
 if TYPE_CHECKING:
     from .enum import Enum
     from .table import Table
 
 
+_DECODE_STRATEGIES = ('eager', 'lazy', 'raw')
+
+
 class Column:
     """Sets Database Table Column Properties.
 
     Args:
-        index (bool, optional): Create an index for this column
+        index (bool or str, optional): Create an index for this column, optionally
+            specifying the index method, e.g. ``'brin'``. See :class:`Index` for more options.
+            JSON columns cannot be indexed, doing so raises :class:`TypeError` when the table is defined,
+            index a JSONB column or an :class:`Index` expression instead.
         primary_key (bool, optional): Sets this column to be a primary key
         unique (bool, optional): Sets the `UNIQUE` constraint
         auto_increment (bool, optional): Sets this column to `AUTO INCREMENT`
@@ -20,11 +26,15 @@ class Column:
         default (Any, optional): Sets the `DEFAULT` value of a column.
             Value can be either a pythonic value or a SQL QUERY
         references (Column, optional): Sets the `FOREIGN KEY` constraint.
+        decode (str, optional): How values of a JSON or JSONB column are decoded when fetched.
+            ``'eager'`` decodes values as they are received,
+            ``'lazy'`` fetches the encoded bytes and decodes them each time the record's attribute is accessed,
+            ``'raw'`` fetches the encoded bytes without decoding them.
     """
 
-    def __init__(self, *, index: bool = False, primary_key: bool = False, unique: bool = False, auto_increment: bool = False,
+    def __init__(self, *, index: Union[bool, str] = False, primary_key: bool = False, unique: bool = False, auto_increment: bool = False,
                  nullable: bool = True, default: Any = NotImplemented, references: 'Column' = None,
-                 enum: Optional[Type['Enum']] = None):
+                 enum: Optional[Type['Enum']] = None, decode: str = 'eager'):
         self.index = index
         self.primary_key = primary_key
         self.unique = unique
@@ -33,8 +43,9 @@ class Column:
         self.default = default
         self.references = references
         self.enum = enum
+        self.decode = decode
 
-    def _update(self, table: 'Table', name: str, sqltype: SQLType, is_array: bool):
+    def _update(self, table: 'Table', name: str, sqltype: SQLType, is_array: int):
         self.table = table
         self.name = name
         self.type = sqltype
@@ -52,8 +63,32 @@ class Column:
             else:
                 raise TypeError(f'Column {self} is auto_increment and must have a supporting type; expected: {SQLType.Serial()}, received: {self.type}')
 
+        if self.decode not in _DECODE_STRATEGIES:
+            raise TypeError(f'Column {self.name} has an unknown decode strategy; expected one of {", ".join(_DECODE_STRATEGIES)}, received: {self.decode}')
+
+        if self.decode != 'eager' and (self.is_array or self.type not in (SQLType.JSON(), SQLType.JSONB())):
+            raise TypeError(f'Column {self.name} is decoded {self.decode} and must be JSON or JSONB; received: {self.type}')
+
         return self
 
+    def _select_sql(self) -> str:
+        """Generates the SQL selecting the column's value."""
+        if self.decode == 'eager':
+            return self.name
+
+        # Fetch the encoded value as bytes, skipping the JSON codec
+        return f'convert_to({self.name}::TEXT, \'UTF8\') AS {self.name}'
+
+    def _default_sql(self) -> str:
+        """Generates the SQL of the column's default value."""
+        if isinstance(self.default, str) and self.type == SQLType.Text():
+            return f'\'{self.default}\''
+        elif isinstance(self.default, bool) and self.type == SQLType.Boolean():
+            return str(self.default).upper()
+        elif isinstance(self.default, dict) and self.type == SQLType.JSONB():
+            return f'\'{dumps(self.default)}\'::jsonb'
+        return f'({self.default})'
+
     def __str__(self) -> str:
         builder = []
 
@@ -71,14 +106,7 @@ class Column:
 
         if self.default is not NotImplemented:
             builder.append('DEFAULT')
-            if isinstance(self.default, str) and self.type == SQLType.Text():
-                builder.append(f'\'{self.default}\'')
-            elif isinstance(self.default, bool) and self.type == SQLType.Boolean():
-                builder.append(str(self.default).upper())
-            elif isinstance(self.default, dict) and self.type == SQLType.JSONB():
-                builder.append(f'\'{dumps(self.default)}\'::jsonb')
-            else:
-                builder.append(f'({self.default})')
+            builder.append(self._default_sql())
 
         if self.references is not None:
             builder.append('REFERENCES')
@@ -1,11 +1,104 @@
+import asyncio
+import contextvars
 import json
+import logging
+import sys
+import time
+
+from collections import Counter
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple, Type, Union
 
 import asyncpg
+from asyncpg import exceptions as asyncpg_exceptions
 from asyncpg import pool as asyncpg_pool
+from asyncpg.prepared_stmt import PreparedStatement
+
+from .cache import CacheInfo, QueryCache
+from .instrumentation import LatencyHistogram
+
+
+log = logging.getLogger(__name__)
+
+_DEFAULT_MAX_PREPARED_STATEMENTS = 256
+
+# Counts uses of each prepared statement across all connections
+_statement_uses: Counter = Counter()
+
+# The number of statements counted across all connections, the least used half are dropped once exceeded
+_MAX_STATEMENT_STATS = 1024
+
+# Binary JSONB values are prefixed with a format version
+_JSONB_VERSION = b'\x01'
+
+# The number of seconds a replica which failed is skipped for
+_REPLICA_RETRY_INTERVAL = 30
+
+# The number of seconds between checks of whether a transaction with pending callbacks has ended
+_TRANSACTION_POLL_INTERVAL = 0.1
+
+# Connection failures after which a read is retried on the primary, errors caused by the query itself are raised
+_REPLICA_ERRORS = (OSError, asyncio.TimeoutError, asyncpg.ConnectionDoesNotExistError, asyncpg.PostgresConnectionError,
+                   asyncpg.CannotConnectNowError)
 
 
 class Connection(asyncpg.Connection):
-    ...
+    """A database connection which explicitly prepares and caches generated statements.
+
+    Attributes:
+        statement_uses (collections.Counter): The number of times each cached
+            statement has been executed on this connection. Statements are
+            dropped once they are evicted from the cache.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._prepared_statements = QueryCache(_DEFAULT_MAX_PREPARED_STATEMENTS, self._forget_uses)
+        self.statement_uses: Counter = Counter()
+
+        # Whether JSON values use the binary format, which the COPY protocol requires
+        self._binary_json = False
+
+    def _forget_uses(self, key: Union[str, Tuple[str, Type[asyncpg.Record]]]):
+        """Drops the use count of a statement no longer prepared on this connection."""
+        self.statement_uses.pop(key if isinstance(key, str) else key[0], None)
+
+    async def prepare_cached(self, query: str, record_class: Optional[Type[asyncpg.Record]] = None) -> PreparedStatement:
+        """Prepares a statement, reusing it if it was previously prepared on this connection.
+
+        Args:
+            query (str): The query to prepare.
+            record_class (type, optional): The class of the records the statement returns.
+        Returns:
+            PreparedStatement: The prepared statement.
+        """
+        # Statements return records of the class they were prepared with
+        key = query if record_class is None else (query, record_class)
+
+        statement = self._prepared_statements.get(key)
+        if statement is None or statement.is_closed():
+            statement = await self.prepare(query, record_class=record_class)
+            self._prepared_statements.set(key, statement)
+
+        return statement
+
+    def forget_prepared(self, query: str, record_class: Optional[Type[asyncpg.Record]] = None):
+        """Removes a statement from this connection's cache of prepared statements.
+
+        Args:
+            query (str): The query to remove.
+            record_class (type, optional): The class of the records the statement returns.
+        """
+        key = query if record_class is None else (query, record_class)
+        self._prepared_statements.pop(key)
+        self._forget_uses(key)
+
+    def prepared_statement_info(self) -> CacheInfo:
+        """Returns the statistics of this connection's cache of prepared statements.
+
+        Returns:
+            CacheInfo: A named tuple of ``hits``, ``misses``, ``evictions``, ``maxsize`` and ``currsize``.
+        """
+        return self._prepared_statements.info()
 
 
 class Pool(asyncpg_pool.Pool):
@@ -13,53 +106,584 @@ class Pool(asyncpg_pool.Pool):
 
 
 class Record(asyncpg.Record):
-    ...
+    __slots__ = ()
 
 
 _pool: Pool = None  # type: ignore
 
 
-async def create_pool(dsn: str, **kwargs) -> Pool:
-    """Creates the database connection pool."""
-    global _pool
+class PoolMetrics:
+    """Statistics of the connections acquired from a pool through :class:`MaybeAcquire`.
+
+    Attributes:
+        pool (asyncpg.pool.Pool): The pool the statistics are of.
+        acquisitions (int): The number of connections acquired.
+        timeouts (int): The number of acquisitions which timed out.
+        waiting (int): The number of acquisitions currently waiting for a connection.
+        wait (LatencyHistogram): The number of seconds spent waiting for connections.
+        held (dict(str, LatencyHistogram)): The number of seconds connections were held, by call site.
+    """
+
+    def __init__(self, pool: asyncpg_pool.Pool):
+        self.pool = pool
+        self.acquisitions = 0
+        self.timeouts = 0
+        self.waiting = 0
+        self.wait = LatencyHistogram()
+        self.held: Dict[str, LatencyHistogram] = {}
+        self._holders: Dict['MaybeAcquire', Tuple[str, float]] = {}
+
+    def __repr__(self) -> str:
+        return f'<PoolMetrics size={self.size} in_use={self.in_use} idle={self.idle} waiting={self.waiting} timeouts={self.timeouts}>'
+
+    @property
+    def size(self) -> int:
+        """The number of connections currently open."""
+        return self.pool.get_size()
+
+    @property
+    def idle(self) -> int:
+        """The number of open connections which are not in use."""
+        return self.pool.get_idle_size()
+
+    @property
+    def in_use(self) -> int:
+        """The number of open connections which are in use."""
+        return self.size - self.idle
+
+    def holders(self) -> List[Tuple[str, float]]:
+        """Returns the call sites currently holding connections.
+
+        Returns:
+            list(tuple(str, float)): The call sites and the number of seconds they have
+                held their connections for, longest first.
+        """
+        now = time.perf_counter()
+        return sorted(((site, now - start) for site, start in self._holders.values()), key=lambda holder: holder[1], reverse=True)
+
+    def _acquired(self, holder: 'MaybeAcquire', site: str, waited: float):
+        self.acquisitions += 1
+        self.wait.record(waited)
+        self._holders[holder] = (site, time.perf_counter())
+
+    def _released(self, holder: 'MaybeAcquire'):
+        site, start = self._holders.pop(holder)
+        histogram = self.held.get(site)
+        if histogram is None:
+            histogram = self.held[site] = LatencyHistogram()
+        histogram.record(time.perf_counter() - start)
+
+
+# Pools are not weakly referenceable, but few are ever created
+_pool_metrics: Dict[asyncpg_pool.Pool, PoolMetrics] = {}
+
+
+def _metrics(pool: asyncpg_pool.Pool) -> PoolMetrics:
+    metrics = _pool_metrics.get(pool)
+    if metrics is None:
+        metrics = _pool_metrics[pool] = PoolMetrics(pool)
+    return metrics
+
+
+# The pools created with a name, the default pool is kept in _pool
+_pools: Dict[str, Pool] = {}
+
+# The read replicas and read-your-writes window of each pool, by the pool's name
+_replicas: Dict[Optional[str], List[Pool]] = {}
+_read_your_writes: Dict[Optional[str], float] = {}
+
+# When a table or view in each pool was last written to, by the pool's name
+_written_at: Dict[Optional[str], float] = {}
+
+# The JSON decoder of each pool by the pool's name, used to decode lazily decoded columns
+_json_decoders: Dict[Optional[str], Callable[[Union[str, bytes]], Any]] = {}
+
+# The number of seconds to wait for a connection from each pool by the pool's name, or None to wait indefinitely
+_acquire_timeouts: Dict[Optional[str], Optional[float]] = {}
+
+# The name each pool, or read replica of a pool, was created with
+_pool_name_of: Dict[asyncpg_pool.Pool, Optional[str]] = {}
+
+# When each failed replica may be used again
+_replica_retry_at: Dict[Pool, float] = {}
+
+# The functions to call once the transaction each connection is in ends
+_transaction_callbacks: Dict[asyncpg.Connection, List[Callable[[], Any]]] = {}
+
+# The connections bound to the current context by pool, with the task each is bound to
+_bound: contextvars.ContextVar = contextvars.ContextVar('donphan_bound', default={})
+
+_replica_turn = 0
+
+
+def get_pool(name: Optional[str] = None) -> Pool:
+    """Returns a connection pool created by :func:`create_pool`.
+
+    Args:
+        name (str, optional): The name the pool was created with.
+            If none is supplied the default pool is returned.
+    Returns:
+        asyncpg.pool.Pool: The pool.
+    """
+    if name is None:
+        return _pool
+    try:
+        return _pools[name]
+    except KeyError:
+        raise AttributeError(f'Could not find pool with name {name}') from None
+
+
+def replica_pools(name: Optional[str] = None) -> List[Pool]:
+    """Returns the connection pools of the read replicas passed to :func:`create_pool`.
+
+    Args:
+        name (str, optional): The name of the pool the replicas belong to.
+            If none is supplied the replicas of the default pool are returned.
+    Returns:
+        list(asyncpg.pool.Pool): The replica pools.
+    """
+    return list(_replicas.get(name, ()))
+
+
+def _replica_pool(name: Optional[str] = None) -> Optional[Pool]:
+    """Chooses the replica pool to read from, or ``None`` if reads must use the primary.
+
+    Replicas are used in turn, preferring those with the most idle connections.
+    """
+    global _replica_turn
+
+    replicas = _replicas.get(name)
+    now = time.monotonic()
+    if not replicas or (name in _written_at and now - _written_at[name] < _read_your_writes[name]):
+        return None
+
+    _replica_turn += 1
+    best = None
+    for i in range(len(replicas)):
+        replica = replicas[(_replica_turn + i) % len(replicas)]
+        if _replica_retry_at.get(replica, 0) > now:
+            continue
+        if best is None or replica.get_idle_size() > best.get_idle_size():
+            best = replica
+
+    return best
+
+
+def _wrote(*names: Optional[str]):
+    """Records that tables in pools were written to, so their reads use the primary for the read-your-writes window."""
+    now = time.monotonic()
+    for name in names:
+        _written_at[name] = now
+
+
+def _replica_failed(replica: Pool, exc: BaseException):
+    """Skips a replica which failed until the retry interval has passed."""
+    log.warning('Read replica failed, reading from the primary for %ss: %s', _REPLICA_RETRY_INTERVAL, exc)
+    _replica_retry_at[replica] = time.monotonic() + _REPLICA_RETRY_INTERVAL
+
+
+def _bound_connection(pool: Optional[Union[asyncpg_pool.Pool, str]] = None) -> Optional[asyncpg.Connection]:
+    """Returns the connection bound to the current task for a pool, or the name of a pool, if there is one.
+
+    Tasks created while a connection is bound inherit the binding, but never use the connection
+    as they may run concurrently with the task which bound it.
+    """
+    bound = _bound.get()
+    if not bound:
+        return None
+
+    binding = bound.get(get_pool(pool) if pool is None or isinstance(pool, str) else pool)
+    if binding is None or binding[0] is not asyncio.current_task():
+        return None
+    return binding[1]
+
+
+def _after_transaction(connection: asyncpg.Connection, callback: Callable[[], Any]):
+    """Calls a function once the transaction a connection is in is committed or rolled back."""
+    callbacks = _transaction_callbacks.get(connection)
+    if callbacks is None:
+        callbacks = _transaction_callbacks[connection] = []
+        _poll_transaction(connection)
+    callbacks.append(callback)
+
+
+def _poll_transaction(connection: asyncpg.Connection):
+    """Checks a connection's transaction until it ends, so transactions managed outside of donphan are not missed."""
+    if connection not in _transaction_callbacks:
+        return
+
+    if _in_transaction(connection):
+        asyncio.get_event_loop().call_later(_TRANSACTION_POLL_INTERVAL, _poll_transaction, connection)
+    else:
+        _transaction_ended(connection)
+
 
-    def _encode_json(value):
-        return json.dumps(value)
+def _in_transaction(connection: asyncpg.Connection) -> bool:
+    """Checks whether a connection is in a transaction, connections released to the pool never are."""
+    try:
+        return connection.is_in_transaction()
+    except asyncpg.InterfaceError:
+        return False
 
-    def _decode_json(value):
-        return json.loads(value)
+
+def _transaction_ended(connection: Optional[asyncpg.Connection] = None):
+    """Calls the functions waiting on a connection's transaction, or on every transaction which has ended.
+
+    Connections are checked whenever they are released, unbound, written to or a cached read is made,
+    and polled while they have pending callbacks, so transactions managed outside of donphan
+    are noticed soon after they end.
+    """
+    if connection is not None:
+        connections = [connection] if connection in _transaction_callbacks else []
+    else:
+        connections = [connection for connection in _transaction_callbacks if not _in_transaction(connection)]
+
+    for connection in connections:
+        for callback in _transaction_callbacks.pop(connection):
+            try:
+                callback()
+            except Exception:
+                log.exception('Could not run callback after transaction ended')
+
+
+def pool_stats(pool: Optional[Union[asyncpg_pool.Pool, str]] = None) -> PoolMetrics:
+    """Returns the statistics of the connections acquired from a pool.
+
+    Args:
+        pool (asyncpg.pool.Pool or str, optional): The pool, or the name of the pool, to return the statistics of.
+            If none is supplied the default pool is used.
+    Returns:
+        PoolMetrics: The pool's statistics.
+    """
+    return _metrics(get_pool(pool) if pool is None or isinstance(pool, str) else pool)
+
+
+def _default_pool() -> Pool:
+    """Returns the pool created by :func:`create_pool`."""
+    return _pool
+
+
+def _decode_json(value: Union[str, bytes], pool: Optional[str] = None) -> Any:
+    """Decodes a JSON value with the decoder of the pool with the supplied name."""
+    return _json_decoders.get(pool, json.loads)(value)
+
+
+def prepared_statement_stats() -> Dict[str, int]:
+    """Returns the number of times each prepared statement has been executed across all connections.
+
+    Only the most used statements are kept once more than 1024 have been counted.
+
+    Returns:
+        dict(str, int): A mapping of queries to their number of executions.
+    """
+    return dict(_statement_uses)
+
+
+def _supports_prepared(connection: asyncpg.Connection) -> bool:
+    """Checks whether a connection, or the connection behind a pool proxy, caches prepared statements.
+
+    Connections of pools created with ``max_prepared_statements=0`` do not.
+    """
+    statements = getattr(connection, '_prepared_statements', None)
+    return statements is not None and statements.maxsize > 0
+
+
+async def _prepare(connection: Connection, query: str, record_class: Optional[Type[asyncpg.Record]] = None) -> PreparedStatement:
+    """Retrieves a cached prepared statement and records its use."""
+    statement = await connection.prepare_cached(query, record_class)
+    connection.statement_uses[query] += 1
+    _statement_uses[query] += 1
+
+    if len(_statement_uses) > _MAX_STATEMENT_STATS:
+        for unused, _ in _statement_uses.most_common()[_MAX_STATEMENT_STATS // 2:]:
+            del _statement_uses[unused]
+
+    return statement
+
+
+async def _execute(connection: asyncpg.Connection, method: str, query: str, args: Iterable[Any],
+                   record_class: Optional[Type[asyncpg.Record]] = None) -> Any:
+    """Executes a generated query, using a cached prepared statement when the connection supports it.
+
+    Records are returned as instances of ``record_class`` if one is supplied.
+    """
+
+    # Plain asyncpg connections and executemany use asyncpg's implicit statement cache
+    if not _supports_prepared(connection) or method == 'executemany':
+        if method == 'executemany':
+            return await connection.executemany(query, args)
+        if record_class is not None:
+            return await getattr(connection, method)(query, *args, record_class=record_class)
+        return await getattr(connection, method)(query, *args)
+
+    try:
+        return await _execute_statement(await _prepare(connection, query, record_class), method, args)
+    except (asyncpg_exceptions.InvalidCachedStatementError, asyncpg_exceptions.OutdatedSchemaCacheError):
+        connection.forget_prepared(query, record_class)
+
+        # The statement can only be retried outside of a transaction
+        if connection.is_in_transaction():
+            raise
+
+    return await _execute_statement(await _prepare(connection, query, record_class), method, args)
+
+
+async def _execute_statement(statement: PreparedStatement, method: str, args: Iterable[Any]) -> Any:
+    if method == 'execute':
+        await statement.fetch(*args)
+        return statement.get_statusmsg()
+    return await getattr(statement, method)(*args)
+
+
+async def _iterate(connection: asyncpg.Connection, query: str, args: Iterable[Any], prefetch: int,
+                   record_class: Optional[Type[asyncpg.Record]] = None) -> AsyncIterator[asyncpg.Record]:
+    """Iterates over the results of a generated query using a server-side cursor.
+
+    The connection must be in a transaction.
+    """
+    if _supports_prepared(connection):
+        cursor = (await _prepare(connection, query, record_class)).cursor(*args, prefetch=prefetch)
+    else:
+        cursor = connection.cursor(query, *args, prefetch=prefetch, record_class=record_class)
+
+    async for record in cursor:
+        yield record
+
+
+def _json_codecs(encoder: Callable[[Any], Union[str, bytes]], decoder: Callable[[Union[str, bytes]], Any],
+                 binary: bool) -> Dict[str, Dict[str, Any]]:
+    """Builds the arguments to register the json and jsonb type codecs with."""
+    if not binary:
+        def encode_text(value):
+            encoded = encoder(value)
+            return encoded.decode() if isinstance(encoded, bytes) else encoded
+
+        codec = {'encoder': encode_text, 'decoder': decoder, 'format': 'text'}
+        return {'json': codec, 'jsonb': codec}
+
+    def encode_json(value):
+        encoded = encoder(value)
+        return encoded if isinstance(encoded, bytes) else encoded.encode()
+
+    def encode_jsonb(value):
+        return _JSONB_VERSION + encode_json(value)
+
+    def decode_jsonb(value):
+        if value[:1] != _JSONB_VERSION:
+            raise ValueError(f'Unsupported JSONB format version {value[:1]!r}')
+        return decoder(value[1:])
+
+    return {
+        'json': {'encoder': encode_json, 'decoder': decoder, 'format': 'binary'},
+        'jsonb': {'encoder': encode_jsonb, 'decoder': decode_jsonb, 'format': 'binary'}
+    }
+
+
+async def create_pool(dsn: str, *, prepare: Iterable[Union[str, Tuple[str, type]]] = (),
+                      max_prepared_statements: int = _DEFAULT_MAX_PREPARED_STATEMENTS,
+                      json_encoder: Callable[[Any], Union[str, bytes]] = json.dumps,
+                      json_decoder: Callable[[Union[str, bytes]], Any] = json.loads,
+                      binary_json: bool = False, acquire_timeout: Optional[float] = None,
+                      replicas: Iterable[str] = (), read_your_writes: float = 0, name: Optional[str] = None, **kwargs) -> Pool:
+    """Creates a database connection pool.
+
+    Args:
+        dsn (str): The connection arguments specified using as a single string.
+        name (str, optional): The name of the pool, which tables are bound to with the ``pool``
+            class keyword or split across with ``sharding``. If none is supplied the default pool is created.
+        prepare (list(str or tuple(str, type)), optional): Queries to prepare on every new connection.
+            Queries run by a table or view return its record class, so must be paired with the table,
+            view or record class, e.g. ``(query, MyTable)``, for reads to reuse the prepared statement.
+        max_prepared_statements (int, optional): The maximum number of generated
+            statements to keep prepared on each connection. If zero generated statements are run
+            with plain ``fetch`` and ``execute`` calls instead of being prepared explicitly, as is needed
+            behind PgBouncer's transaction pooling together with asyncpg's ``statement_cache_size=0``.
+        json_encoder (callable, optional): Encodes JSON values, returning either str or bytes,
+            e.g. :func:`orjson.dumps`. Defaults to :func:`json.dumps`.
+        json_decoder (callable, optional): Decodes JSON values from either str or bytes,
+            e.g. :func:`orjson.loads`. Defaults to :func:`json.loads`.
+        binary_json (bool, optional): Whether to transfer JSON values in the binary format,
+            which skips text conversion of JSONB values on the server. It is also needed for
+            :meth:`Table.copy_records` to use the COPY protocol for tables with JSON columns.
+        acquire_timeout (float, optional): The number of seconds :class:`MaybeAcquire` waits
+            for a connection before raising :class:`asyncio.TimeoutError`. Defaults to waiting indefinitely.
+        replicas (list(str), optional): The connection strings of read replicas.
+            Reads made by tables and views are spread across the replicas, falling back
+            to the primary while a replica cannot be connected to.
+        read_your_writes (float, optional): The number of seconds after a table in the pool is written to
+            during which reads of the pool's tables and views use the primary, so replication lag does
+            not hide the write.
+        **kwargs: Extra arguments to pass to :func:`asyncpg.create_pool`.
+    """
+    global _pool
+    kwargs.setdefault('connection_class', Connection)
+
+    codecs = _json_codecs(json_encoder, json_decoder, binary_json)
 
     async def init(connection: asyncpg.Connection):
-        await connection.set_type_codec('json', schema='pg_catalog', encoder=_encode_json, decoder=_decode_json, format='text')
-        await connection.set_type_codec('jsonb', schema='pg_catalog', encoder=_encode_json, decoder=_decode_json, format='text')
+        for type, codec in codecs.items():
+            await connection.set_type_codec(type, schema='pg_catalog', **codec)
+
+        if isinstance(connection, Connection):
+            connection._prepared_statements.maxsize = max_prepared_statements
+            connection._binary_json = binary_json
+
+            # Warm the statement cache, under the same key reads look statements up by
+            for query in (prepare if max_prepared_statements > 0 else ()):
+                record_class = None
+                if isinstance(query, tuple):
+                    query, record_class = query
+                    record_class = getattr(record_class, '_record_class', record_class)
+
+                try:
+                    await connection.prepare_cached(query, record_class)
+                except asyncpg.PostgresError as exc:
+                    log.warning('Could not prepare statement %r: %s', query, exc)
 
-    _pool = p = await asyncpg.create_pool(dsn, init=init, **kwargs)
+    p = await asyncpg.create_pool(dsn, init=init, **kwargs)
+    if name is None:
+        _pool = p
+    else:
+        _pools[name] = p
+
+    _replicas[name] = list(await asyncio.gather(*(asyncpg.create_pool(replica, init=init, **kwargs) for replica in replicas)))
+    _read_your_writes[name] = read_your_writes
+    _json_decoders[name] = json_decoder
+    _acquire_timeouts[name] = acquire_timeout
+    for pool in (p, *_replicas[name]):
+        _pool_name_of[pool] = name
     return p
 
 
 class MaybeAcquire:
     """Async helper for acquiring a connection to the database.
 
+    The time spent waiting for and holding connections is recorded in :func:`pool_stats`.
+
     Args:
         connection (asyncpg.Connection, optional): A database connection to use
                 If none is supplied a connection will be acquired from the pool.
     Kwargs:
-        pool (asyncpg.pool.Pool, optional): A connection pool to use.
-            If none is supplied the default pool will be used.
+        pool (asyncpg.pool.Pool or str, optional): A connection pool, or the name of a pool created with
+            :func:`create_pool`, to use. If none is supplied the default pool will be used.
+        timeout (float, optional): The number of seconds to wait for a connection before raising
+            :class:`asyncio.TimeoutError`. If none is supplied the pool's ``acquire_timeout`` is used.
+        site (str, optional): Identifies what the connection is used for in the statistics.
+            If none is supplied the calling function is used.
     """
 
-    def __init__(self, connection: asyncpg.Connection = None, *, pool=None):
+    def __init__(self, connection: asyncpg.Connection = None, *, pool=None, timeout: Optional[float] = None, site: Optional[str] = None):
         self.connection = connection
+        if isinstance(pool, str):
+            pool = get_pool(pool) if connection is None else None
         self.pool = pool or _pool
+        self.timeout = timeout
         self._cleanup = False
 
+        if connection is None and site is None:
+            frame = sys._getframe(1)
+            site = f'{frame.f_globals.get("__name__")}.{frame.f_code.co_name}'
+        self.site = site
+
     async def __aenter__(self) -> Connection:
         if self.connection is None:
+
+            # Reuse the connection bound to the task, it is released when it is unbound
+            bound = _bound_connection(self.pool)
+            if bound is not None:
+                return bound
+
+            metrics = _metrics(self.pool)
+            timeout = _acquire_timeouts.get(_pool_name_of.get(self.pool)) if self.timeout is None else self.timeout
+
+            metrics.waiting += 1
+            start = time.perf_counter()
+            try:
+                c = await self.pool.acquire(timeout=timeout)
+            except asyncio.TimeoutError:
+                metrics.timeouts += 1
+                holders = metrics.holders()
+                longest = f', longest held by {holders[0][0]} for {holders[0][1]:.3f}s' if holders else ''
+                raise asyncio.TimeoutError(
+                    f'Timed out after {timeout}s acquiring a connection for {self.site}: '
+                    f'{metrics.in_use} of {self.pool.get_max_size()} connections in use, {metrics.waiting - 1} waiting{longest}'
+                ) from None
+            finally:
+                metrics.waiting -= 1
+
+            metrics._acquired(self, self.site, time.perf_counter() - start)
             self._cleanup = True
-            self._connection = c = await self.pool.acquire()
+            self._connection = c
             return c
         return self.connection
 
     async def __aexit__(self, *args):
         if self._cleanup:
+
+            # Releasing the connection ends any transaction it is still in
+            _transaction_ended(self._connection)
+            _metrics(self.pool)._released(self)
             await self.pool.release(self._connection)
+
+
+class BoundConnection:
+    """Async helper binding a connection to the current task.
+
+    Until it exits every query made without a connection in the task, including through
+    :class:`MaybeAcquire`, uses the bound connection instead of acquiring one from the pool.
+    Other tasks, including those created while the connection is bound, acquire their own.
+
+    Args:
+        connection (asyncpg.Connection, optional): A database connection to bind.
+                If none is supplied a connection will be acquired from the pool.
+    Kwargs:
+        pool (asyncpg.pool.Pool or str, optional): The connection pool, or the name of a pool, the connection is for.
+            If none is supplied the default pool will be used.
+        transaction (bool, optional): Whether to run the bound queries in a transaction,
+            which is committed on exit or rolled back if an exception is raised.
+        site (str, optional): Identifies what the connection is used for in the statistics.
+            If none is supplied the calling function is used.
+    """
+
+    def __init__(self, connection: asyncpg.Connection = None, *, pool=None, transaction: bool = False, site: Optional[str] = None):
+        if site is None:
+            frame = sys._getframe(1)
+            site = f'{frame.f_globals.get("__name__")}.{frame.f_code.co_name}'
+
+        # MaybeAcquire ignores pool names when a connection is supplied, but the binding must be made for the named pool
+        self._pool = get_pool(pool) if pool is None or isinstance(pool, str) else pool
+        self._acquire = MaybeAcquire(connection, pool=self._pool, site=site)
+        self._transaction = transaction
+        self._token: Optional[contextvars.Token] = None
+        self._tx = None
+
+    async def __aenter__(self) -> Connection:
+        connection = self._connection = await self._acquire.__aenter__()
+
+        try:
+            if self._transaction:
+                self._tx = connection.transaction()
+                await self._tx.start()
+        except BaseException:
+            await self._acquire.__aexit__(*sys.exc_info())
+            raise
+
+        bound = dict(_bound.get())
+        bound[self._pool] = (asyncio.current_task(), connection)
+        self._token = _bound.set(bound)
+        return connection
+
+    async def __aexit__(self, exc_type, exc, tb):
+        _bound.reset(self._token)
+
+        try:
+            if self._tx is not None:
+                if exc_type is None:
+                    await self._tx.commit()
+                else:
+                    await self._tx.rollback()
+        finally:
+            # Writes made in the transaction can now be seen by other connections
+            if not _in_transaction(self._connection):
+                _transaction_ended(self._connection)
+            await self._acquire.__aexit__(exc_type, exc, tb)
@@ -3,6 +3,7 @@ import enum
 from functools import total_ordering
 
 from .abc import Creatable
+from .sqltype import default_for, SQLType
 
 
 class EnumMeta(ABCMeta, enum.EnumMeta):
@@ -26,3 +27,7 @@ class Enum(Creatable, str, enum.Enum, metaclass=EnumMeta):
             return NotImplemented
         member_names = tuple(self._member_map_)
         return member_names.index(self.name) < member_names.index(other.name)
+
+
+# Registered here as sqltype cannot import this module without a circular import
+default_for(Enum)(SQLType.Enum.__func__)
@@ -0,0 +1,134 @@
+from .column import Column
+from .sqltype import SQLType
+
+from typing import Iterable, List, Optional, Tuple, TYPE_CHECKING, Union
+
+if TYPE_CHECKING:
+    from .table import Table
+
+
+_METHODS = ('btree', 'hash', 'gist', 'spgist', 'gin', 'brin')
+
+
+class Index:
+    """Sets Database Table Index Properties.
+
+    Indexes are declared as attributes of a :class:`Table`, a single column
+    can also be indexed with ``Column(index=True)``.
+
+    Args:
+        *columns (Column or str): The columns to index, either columns of the table, column names or SQL expressions.
+        unique (bool, optional): Sets the index to be `UNIQUE`
+        method (str, optional): The index method, one of ``btree``, ``hash``, ``gist``, ``spgist``, ``gin`` or ``brin``.
+            If none is supplied ``gin`` is used for JSONB and array columns, otherwise ``btree``.
+            JSON columns cannot be indexed directly, only expressions of them.
+            ``brin`` suits large append-only columns, such as creation timestamps.
+        where (str, optional): An SQL condition, creating a partial index of only the matching records.
+        include (list(Column), optional): Columns to store in the index without indexing them.
+        name (str, optional): The name of the index.
+            If none is supplied the name is generated from the table's and attribute's names.
+    """
+
+    def __init__(self, *columns: Union[Column, str], unique: bool = False, method: Optional[str] = None,
+                 where: Optional[str] = None, include: Iterable[Union[Column, str]] = (), name: Optional[str] = None):
+        if not columns:
+            raise TypeError('An index must have at least one column or expression')
+        if method is not None and method.lower() not in _METHODS:
+            raise TypeError(f'Unknown index method {method}; expected one of {", ".join(_METHODS)}')
+
+        self.columns = columns
+        self.unique = unique
+        self.method = method and method.lower()
+        self.where = where
+        self.include = tuple(include)
+        self.name = name
+
+    def _update(self, table: 'Table', name: str):
+        self.table = table
+        self.name = self.name or f'{table.__name__.lower()}_{name}_idx'
+
+        # Resolve column names to the table's columns, anything else is an expression
+        self.columns = tuple(self._resolve(column) for column in self.columns)
+        self.include = tuple(self._resolve(column) for column in self.include)
+        for column in self.include:
+            if not isinstance(column, Column):
+                raise AttributeError(f'Could not find included column {column} in table {table._name}')
+
+        # JSON has no operator classes, its values can only be indexed through expressions
+        for column in self.columns:
+            if isinstance(column, Column) and not column.is_array and column.type == SQLType.JSON():
+                raise TypeError(f'Index {self.name} cannot index JSON column {column.name}, use JSONB or index an expression')
+
+        first = self.columns[0]
+        gin = isinstance(first, Column) and (first.is_array or first.type == SQLType.JSONB())
+        if self.method is None and gin:
+            self.method = 'gin'
+        elif self.method == 'gin' and isinstance(first, Column) and not gin:
+            raise TypeError(f'Index {self.name} uses the gin method, which only applies to JSONB and array columns')
+
+        if self.unique and self.method not in (None, 'btree'):
+            raise TypeError(f'Index {self.name} is unique and must use the btree method; received: {self.method}')
+
+        return self
+
+    def _resolve(self, column: Union[Column, str]) -> Union[Column, str]:
+        if isinstance(column, Column):
+            if self.table._columns.get(getattr(column, 'name', None)) is not column:
+                raise AttributeError(f'Index {self.name} references a column which is not in table {self.table._name}')
+            return column
+
+        return self.table._columns.get(column, column)
+
+    @property
+    def expressions(self) -> Tuple[str, ...]:
+        """The SQL of each indexed column or expression."""
+        return tuple(column.name if isinstance(column, Column) else f'({column})' for column in self.columns)
+
+    def _query_create(self, concurrently: bool = False, if_not_exists: bool = True) -> str:
+        """Generates a CREATE INDEX stub."""
+        builder = ['CREATE']
+
+        if self.unique:
+            builder.append('UNIQUE')
+
+        builder.append('INDEX')
+
+        if concurrently:
+            builder.append('CONCURRENTLY')
+
+        if if_not_exists:
+            builder.append('IF NOT EXISTS')
+
+        builder.append(self.name)
+        builder.append(f'ON {self.table._name}')
+
+        if self.method is not None:
+            builder.append(f'USING {self.method}')
+
+        builder.append(f'({", ".join(self.expressions)})')
+
+        if self.include:
+            builder.append(f'INCLUDE ({", ".join(column.name for column in self.include)})')
+
+        if self.where is not None:
+            builder.append(f'WHERE {self.where}')
+
+        return ' '.join(builder)
+
+    def __str__(self) -> str:
+        return self._query_create()
+
+
+def _column_indexes(table: 'Table', columns: Iterable[Column]) -> List[Index]:
+    """Creates the indexes declared with ``Column(index=True)``."""
+    indexes = []
+    for column in columns:
+
+        # Primary keys and unique columns are already indexed by their constraints
+        if not column.index or column.primary_key or column.unique:
+            continue
+
+        method = column.index if isinstance(column.index, str) else None
+        indexes.append(Index(column, method=method)._update(table, column.name))
+
+    return indexes
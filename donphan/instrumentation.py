@@ -0,0 +1,232 @@
+import bisect
+import logging
+import time
+
+from collections import namedtuple
+from typing import Any, Callable, ContextManager, Dict, List, Optional, Sequence, Tuple
+
+
+log = logging.getLogger(__name__)
+
+# Upper bounds of the latency histogram buckets, in seconds
+_DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+QueryEvent = namedtuple('QueryEvent', 'table operation query duration rows error')
+QueryEvent.__doc__ = """A query run by a table or view.
+
+Attributes:
+    table (str): The name of the table or view.
+    operation (str): The kind of query, e.g. ``fetch``, ``fetchrow``, ``execute``, ``executemany``, ``iterate`` or ``copy``.
+    query (str): The generated SQL, with placeholders in place of values.
+    duration (float): The number of seconds the query took.
+    rows (int): The number of records returned or modified, or ``None`` if unknown.
+    error (Exception): The exception raised by the query, or ``None`` if it succeeded.
+"""
+
+_hooks: List[Callable[[QueryEvent], Any]] = []
+_stats: Dict[Tuple[str, str], 'LatencyHistogram'] = {}
+_slow_query_threshold: Optional[float] = None
+_tracer: Optional[Callable[[str, Dict[str, Any]], ContextManager]] = None
+_detached_tracer: Optional[Callable[[str, Dict[str, Any]], ContextManager]] = None
+
+
+class LatencyHistogram:
+    """Aggregates the latencies of queries into buckets.
+
+    Args:
+        buckets (list(float), optional): The upper bounds of the buckets in seconds, in ascending order.
+
+    Attributes:
+        buckets (tuple(float)): The upper bounds of the buckets in seconds.
+        counts (list(int)): The number of queries in each bucket, the last counting queries slower than every bound.
+        count (int): The number of queries.
+        total (float): The total number of seconds taken by queries.
+        maximum (float): The number of seconds taken by the slowest query.
+        errors (int): The number of queries which raised an exception.
+        rows (int): The number of records returned or modified.
+    """
+
+    def __init__(self, buckets: Sequence[float] = _DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self.errors = 0
+        self.rows = 0
+
+    def __repr__(self) -> str:
+        return f'<LatencyHistogram count={self.count} mean={self.mean:.6f} p99={self.percentile(99)} errors={self.errors}>'
+
+    @property
+    def mean(self) -> float:
+        """The mean number of seconds taken by queries."""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percentile: float) -> float:
+        """Estimates a percentile of the latencies.
+
+        Args:
+            percentile (float): The percentile to estimate, between 0 and 100.
+        Returns:
+            float: The upper bound of the bucket containing the percentile, or the
+                maximum latency if it falls beyond every bucket.
+        """
+        target = self.count * percentile / 100
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= target and seen:
+                return bound
+        return self.maximum
+
+    def record(self, duration: float, rows: Optional[int] = None, error: bool = False):
+        """Adds a query to the histogram.
+
+        Args:
+            duration (float): The number of seconds the query took.
+            rows (int, optional): The number of records returned or modified.
+            error (bool, optional): Whether the query raised an exception.
+        """
+        self.counts[bisect.bisect_left(self.buckets, duration)] += 1
+        self.count += 1
+        self.total += duration
+        self.maximum = max(self.maximum, duration)
+        self.errors += error
+        self.rows += rows or 0
+
+
+def add_query_hook(hook: Callable[[QueryEvent], Any]):
+    """Registers a function to call with a :class:`QueryEvent` after every query.
+
+    Args:
+        hook (callable): The function to call.
+    """
+    _hooks.append(hook)
+
+
+def remove_query_hook(hook: Callable[[QueryEvent], Any]):
+    """Unregisters a function registered with :func:`add_query_hook`.
+
+    Args:
+        hook (callable): The function to unregister.
+    """
+    _hooks.remove(hook)
+
+
+def set_slow_query_threshold(seconds: Optional[float]):
+    """Logs a warning for every query which takes longer than a number of seconds.
+
+    Args:
+        seconds (float, optional): The threshold. If ``None`` slow queries are not logged.
+    """
+    global _slow_query_threshold
+    _slow_query_threshold = seconds
+
+
+def set_tracer(tracer: Optional[Callable[[str, Dict[str, Any]], ContextManager]], *,
+               detached: Optional[Callable[[str, Dict[str, Any]], ContextManager]] = None):
+    """Wraps every query in a trace span.
+
+    The tracer is called with the span's name and attributes and must return a context manager,
+    e.g. ``lambda name, attributes: tracer.start_as_current_span(name, attributes=attributes)``
+    with OpenTelemetry. The span is entered in the task which runs the query, so
+    it is a child of the caller's current span.
+
+    Iteration runs while the caller's loop body does, so its span must not become the current span,
+    or queries made in the loop body would be recorded as its children. Iteration is traced with
+    ``detached``, which must create spans without making them current, e.g.
+    ``lambda name, attributes: tracer.start_span(name, attributes=attributes)``.
+
+    Args:
+        tracer (callable, optional): Creates spans. If ``None`` queries are not traced.
+        detached (callable, optional): Creates spans which are not made current.
+            If ``None`` iteration is not traced.
+    """
+    global _tracer, _detached_tracer
+    _tracer = tracer
+    _detached_tracer = detached
+
+
+def query_stats() -> Dict[Tuple[str, str], LatencyHistogram]:
+    """Returns the latency histograms of queries run by each table and operation.
+
+    Returns:
+        dict(tuple(str, str), LatencyHistogram): A mapping of table names and operations to their histograms.
+    """
+    return dict(_stats)
+
+
+def reset_query_stats():
+    """Discards the latency histograms of all queries."""
+    _stats.clear()
+
+
+def _count_rows(method: str, result: Any) -> Optional[int]:
+    """Determines the number of records returned or modified by a query from its result."""
+    if method == 'fetch':
+        return len(result)
+    if method == 'fetchrow':
+        return int(result is not None)
+    if isinstance(result, str):
+        status = result.rpartition(' ')[2]
+        return int(status) if status.isdigit() else None
+    return None
+
+
+class _Instrument:
+    """Times a query, recording it in the statistics and passing it to hooks and the tracer.
+
+    ``rows`` should be set before the instrument exits. Queries which yield to
+    their caller while running, such as iteration, must be ``detached``.
+    """
+
+    __slots__ = ('table', 'operation', 'query', 'rows', 'detached', '_start', '_span')
+
+    def __init__(self, table: str, operation: str, query: str, detached: bool = False):
+        self.table = table
+        self.operation = operation
+        self.query = query
+        self.detached = detached
+        self.rows: Optional[int] = None
+        self._span: Optional[ContextManager] = None
+
+    def __enter__(self) -> '_Instrument':
+        tracer = _detached_tracer if self.detached else _tracer
+        if tracer is not None:
+            self._span = tracer(f'{self.operation} {self.table}', {
+                'db.system': 'postgresql',
+                'db.operation': self.operation,
+                'db.sql.table': self.table,
+                'db.statement': self.query
+            })
+            self._span.__enter__()
+
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self._start
+
+        # Iteration stopping early is not an error
+        error = exc if exc_type is not None and not issubclass(exc_type, GeneratorExit) else None
+
+        key = (self.table, self.operation)
+        histogram = _stats.get(key)
+        if histogram is None:
+            histogram = _stats[key] = LatencyHistogram()
+        histogram.record(duration, self.rows, error is not None)
+
+        if _slow_query_threshold is not None and duration >= _slow_query_threshold:
+            log.warning('Slow %s on %s took %.3fs: %s', self.operation, self.table, duration, self.query)
+
+        if _hooks:
+            event = QueryEvent(self.table, self.operation, self.query, duration, self.rows, error)
+            for hook in _hooks:
+                try:
+                    hook(event)
+                except Exception:
+                    log.exception('Query hook %r raised an exception', hook)
+
+        if self._span is not None:
+            self._span.__exit__(exc_type, exc, tb)
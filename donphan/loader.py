@@ -0,0 +1,84 @@
+import asyncio
+
+from typing import Any, Dict, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .abc import Fetchable
+    from .connection import Record
+
+
+class Loader:
+    """Coalesces concurrent primary key lookups of a table into a single query.
+
+    Lookups made within the same event loop iteration, or within ``delay``
+    seconds of the first pending lookup, are fetched together.
+
+    Args:
+        table (Fetchable): The table to fetch records from.
+        delay (float, optional): The number of seconds to wait for further lookups.
+            If zero lookups are gathered until the next iteration of the event loop.
+
+    Attributes:
+        loads (int): The number of lookups requested.
+        batches (int): The number of queries issued to serve those lookups.
+    """
+
+    def __init__(self, table: 'Fetchable', delay: float = 0):
+        self.table = table
+        self.delay = delay
+        self.loads = 0
+        self.batches = 0
+        self._pending: Dict[Tuple[Any, ...], asyncio.Future] = {}
+        self._scheduled = False
+
+    async def load(self, key: Tuple[Any, ...]) -> Optional['Record']:
+        """Fetches a record by its primary key.
+
+        Args:
+            key (tuple): The record's primary key values, in column order.
+        Returns:
+            Record: The record, or ``None`` if no such record exists.
+        """
+        loop = asyncio.get_event_loop()
+        self.loads += 1
+
+        future = self._pending.get(key)
+        if future is None:
+            future = self._pending[key] = loop.create_future()
+
+        if not self._scheduled:
+            self._scheduled = True
+            if self.delay:
+                loop.call_later(self.delay, self._dispatch)
+            else:
+                loop.call_soon(self._dispatch)
+
+        # Other lookups share this future so it must not be cancelled along with this one
+        return await asyncio.shield(future)
+
+    def _dispatch(self):
+        pending, self._pending = self._pending, {}
+        self._scheduled = False
+        self.batches += 1
+        asyncio.ensure_future(self._fetch(pending))
+
+    async def _fetch(self, pending: Dict[Tuple[Any, ...], asyncio.Future]):
+        primary_keys = self.table._get_primary_keys()
+        query = self.table._query_primary_keys(primary_keys)
+
+        try:
+            records = await self.table._run_query('fetch', query, [list(array) for array in zip(*pending)])
+        except asyncio.CancelledError:
+            for future in pending.values():
+                future.cancel()
+            raise
+        except Exception as e:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        found = {tuple(record[column.name] for column in primary_keys): record for record in records}
+        for key, future in pending.items():
+            if not future.done():
+                future.set_result(found.get(key))
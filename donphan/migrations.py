@@ -0,0 +1,302 @@
+import logging
+
+from collections import namedtuple
+from typing import Dict, Iterable, List, Optional, Type
+
+from .abc import _cast_type
+from .column import Column
+from .connection import Connection, MaybeAcquire
+from .table import Table
+
+
+log = logging.getLogger(__name__)
+
+_DEFAULT_BATCH_SIZE = 10000
+_DEFAULT_LOCK_TIMEOUT = 5
+
+MigrationStep = namedtuple('MigrationStep', 'description query repeat pool', defaults=(None,))
+MigrationStep.__doc__ = """A single statement of a migration plan.
+
+Attributes:
+    description (str): A description of what the statement does.
+    query (str): The statement to run.
+    repeat (bool): Whether the statement is a batch, run until it modifies no more records.
+    pool (str): The name of the pool the statement is run on, ``None`` being the default pool.
+"""
+
+_ColumnInfo = namedtuple('_ColumnInfo', 'type not_null')
+
+
+class MigrationPlan:
+    """The statements which bring the database's tables in line with their definitions.
+
+    Every statement avoids holding locks which block reads and writes for
+    longer than necessary. Changes which would rewrite or lock a table for
+    a long time, or which destroy data, are never made automatically and are
+    instead reported as warnings.
+
+    Attributes:
+        steps (list(MigrationStep)): The statements to run, in order.
+        warnings (list(str)): Differences which must be resolved manually.
+    """
+
+    def __init__(self):
+        self.steps: List[MigrationStep] = []
+        self.warnings: List[str] = []
+
+    def __bool__(self) -> bool:
+        return bool(self.steps)
+
+    def __str__(self) -> str:
+        builder = []
+
+        for step in self.steps:
+            pool = f' on pool {step.pool}' if step.pool is not None else ''
+            builder.append(f'-- {step.description}{pool}{" (repeated until no records are modified)" if step.repeat else ""}')
+            builder.append(f'{step.query.rstrip(";")};')
+
+        for warning in self.warnings:
+            builder.append(f'-- WARNING: {warning}')
+
+        return '\n'.join(builder) or '-- Nothing to migrate'
+
+    def _add(self, description: str, query: str, repeat: bool = False):
+        self.steps.append(MigrationStep(description, query, repeat))
+
+    def _extend(self, plan: 'MigrationPlan', pool: Optional[str]):
+        """Adds the steps and warnings of a plan for the tables held by a pool."""
+        self.steps.extend(step._replace(pool=pool) for step in plan.steps)
+        self.warnings.extend(plan.warnings if pool is None else (f'{warning} on pool {pool}' for warning in plan.warnings))
+
+    async def apply(self, *, connection: Optional[Connection] = None, lock_timeout: Optional[float] = _DEFAULT_LOCK_TIMEOUT):
+        """Runs the plan's statements.
+
+        Statements are run one at a time outside of a transaction, as indexes are built concurrently.
+
+        Args:
+            connection (Connection, optional): A database connection to use for every statement.
+                If none is supplied a connection will be acquired from the pool of each statement.
+            lock_timeout (float, optional): The number of seconds each statement may wait for a lock
+                before failing, so a migration never queues reads and writes behind a long transaction.
+        """
+        pools: Dict[Optional[str], List[MigrationStep]] = {}
+        for step in self.steps:
+            pools.setdefault(None if connection is not None else step.pool, []).append(step)
+
+        for pool, steps in pools.items():
+            async with MaybeAcquire(connection, pool=pool) as _connection:
+                await self._apply(_connection, steps, lock_timeout)
+
+    async def _apply(self, connection: Connection, steps: List[MigrationStep], lock_timeout: Optional[float]):
+        if lock_timeout is not None:
+            await connection.execute(f'SET lock_timeout = {int(lock_timeout * 1000)}')
+
+        try:
+            for step in steps:
+                log.info('Migrating: %s', step.description)
+                status = await connection.execute(step.query)
+
+                while step.repeat and not status.endswith(' 0'):
+                    status = await connection.execute(step.query)
+
+        finally:
+            if lock_timeout is not None:
+                await connection.execute('RESET lock_timeout')
+
+
+def _column_type(column: Column) -> str:
+    """Returns the SQL type of a column, including its array dimensions."""
+    return _cast_type(column) + '[]' * column.is_array
+
+
+async def _introspect_columns(connection: Connection, table: Type[Table]) -> Optional[Dict[str, _ColumnInfo]]:
+    """Retrieves the columns of a table as they exist in the database, or ``None`` if it doesn't exist."""
+    if await connection.fetchval('SELECT to_regclass($1)::TEXT', table._name) is None:
+        return None
+
+    records = await connection.fetch(
+        'SELECT attname, format_type(atttypid, NULL) AS type, attnotnull FROM pg_catalog.pg_attribute '
+        'WHERE attrelid = $1::regclass AND attnum > 0 AND NOT attisdropped', table._name
+    )
+    return {record['attname']: _ColumnInfo(record['type'], record['attnotnull']) for record in records}
+
+
+async def _introspect_indexes(connection: Connection, table: Type[Table]) -> Dict[str, bool]:
+    """Retrieves the names of a table's indexes and whether each is valid."""
+    records = await connection.fetch(
+        'SELECT c.relname, i.indisvalid FROM pg_catalog.pg_index i JOIN pg_catalog.pg_class c ON c.oid = i.indexrelid '
+        'WHERE i.indrelid = $1::regclass', table._name
+    )
+    return {record['relname']: record['indisvalid'] for record in records}
+
+
+async def _canonical_types(connection: Connection, types: Iterable[str]) -> Dict[str, Optional[str]]:
+    """Resolves SQL type names to the names Postgres reports for them, e.g. ``INT`` to ``integer``.
+
+    Names which are not types, such as ``ENUM`` which enum columns are declared with, resolve to ``None``.
+    """
+    records = await connection.fetch('SELECT name, to_regtype(name)::TEXT AS type FROM unnest($1::TEXT[]) AS name', list(set(types)))
+    return {record['name']: record['type'] for record in records}
+
+
+def _plan_add_column(plan: MigrationPlan, table: Type[Table], column: Column, batch_size: int):
+    """Adds a column in steps which only briefly lock the table."""
+    name = f'{table._name}.{column.name}'
+
+    # Adding a nullable column without a default only changes the catalog
+    builder = [f'ALTER TABLE {table._name} ADD COLUMN IF NOT EXISTS {column.name} {_column_type(column)}']
+    if column.references is not None:
+        builder.append(f'REFERENCES {column.references.table._name}({column.references.name})')
+    plan._add(f'Add column {name}', ' '.join(builder))
+
+    if column.default is not NotImplemented:
+        plan._add(f'Set the default of {name} for new records',
+                  f'ALTER TABLE {table._name} ALTER COLUMN {column.name} SET DEFAULT {column._default_sql()}')
+        _plan_backfill(plan, table, column, batch_size)
+
+    if column.unique:
+        index = f'{table.__name__.lower()}_{column.name}_key'
+        plan._add(f'Build a unique index on {name}', f'CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {index} ON {table._name} ({column.name})')
+        plan._add(f'Add a unique constraint on {name}', f'ALTER TABLE {table._name} ADD CONSTRAINT {index} UNIQUE USING INDEX {index}')
+
+    if not column.nullable:
+        if column.default is NotImplemented:
+            plan.warnings.append(f'Column {name} is NOT NULL but has no default to backfill existing records with, '
+                                 'it was added as nullable')
+        else:
+            _plan_set_not_null(plan, table, column)
+
+
+def _plan_backfill(plan: MigrationPlan, table: Type[Table], column: Column, batch_size: int):
+    """Sets a column's default on existing records in batches, so each only briefly locks the records it updates.
+
+    Batches are repeated until none of the records is updated, records are skipped
+    while the default evaluates to NULL, as they would be selected by every batch.
+    """
+    if column.default is None:
+        return
+
+    default = column._default_sql()
+    plan._add(f'Backfill {table._name}.{column.name} in batches of {batch_size}',
+              f'UPDATE {table._name} SET {column.name} = {default} WHERE ctid = ANY(ARRAY('
+              f'SELECT ctid FROM {table._name} WHERE {column.name} IS NULL LIMIT {batch_size})) AND {default} IS NOT NULL', True)
+
+
+def _plan_set_not_null(plan: MigrationPlan, table: Type[Table], column: Column):
+    """Sets a column NOT NULL without scanning the table while holding an exclusive lock."""
+    name = f'{table._name}.{column.name}'
+    check = f'{table.__name__.lower()}_{column.name}_not_null'
+
+    # Validating a NOT VALID check constraint does not block writes, SET NOT NULL then skips its scan
+    plan._add(f'Add an unvalidated NOT NULL check on {name}',
+              f'ALTER TABLE {table._name} DROP CONSTRAINT IF EXISTS {check}, '
+              f'ADD CONSTRAINT {check} CHECK ({column.name} IS NOT NULL) NOT VALID')
+    plan._add(f'Validate the NOT NULL check on {name}', f'ALTER TABLE {table._name} VALIDATE CONSTRAINT {check}')
+    plan._add(f'Set {name} NOT NULL', f'ALTER TABLE {table._name} ALTER COLUMN {column.name} SET NOT NULL')
+    plan._add(f'Drop the NOT NULL check on {name}', f'ALTER TABLE {table._name} DROP CONSTRAINT {check}')
+
+
+async def _plan_table(plan: MigrationPlan, connection: Connection, table: Type[Table], batch_size: int):
+    existing = await _introspect_columns(connection, table)
+
+    if existing is None:
+        plan._add(f'Create schema {table.schema}', table._query_create_schema())
+        plan._add(f'Create table {table._name}', table._query_create(False, True))
+        for query in table._query_create_indexes(False, True):
+            plan._add(f'Create an index on {table._name}', query)
+        return
+
+    types = await _canonical_types(connection, (_column_type(column) for column in table._columns.values()))
+
+    for column in table._columns.values():
+        name = f'{table._name}.{column.name}'
+        info = existing.pop(column.name, None)
+
+        if info is None:
+            if column.primary_key:
+                plan.warnings.append(f'Column {name} is part of the primary key and cannot be added online')
+                continue
+
+            # It would otherwise be added as a plain INTEGER without its sequence
+            if column.auto_increment:
+                plan.warnings.append(f'Column {name} is auto incrementing and cannot be added online, it was not added')
+                continue
+            _plan_add_column(plan, table, column, batch_size)
+            continue
+
+        # The types of enum columns cannot be resolved from their definition
+        expected = types[_column_type(column)]
+        if expected is not None and info.type != expected:
+            plan.warnings.append(f'Column {name} has type {info.type} in the database but {expected} is defined, '
+                                 'changing it rewrites the table')
+
+        if column.nullable and info.not_null and not column.primary_key:
+            plan._add(f'Drop NOT NULL from {name}', f'ALTER TABLE {table._name} ALTER COLUMN {column.name} DROP NOT NULL')
+        elif not column.nullable and not info.not_null:
+            if column.default is not NotImplemented:
+                _plan_backfill(plan, table, column, batch_size)
+            _plan_set_not_null(plan, table, column)
+
+    for column in existing:
+        plan.warnings.append(f'Column {table._name}.{column} is not defined, it was not dropped')
+
+    indexes = await _introspect_indexes(connection, table)
+    for index in table._indexes:
+        valid = indexes.get(index.name)
+
+        # A failed concurrent build leaves an invalid index behind
+        if valid is False:
+            plan._add(f'Drop invalid index {index.name}', f'DROP INDEX CONCURRENTLY IF EXISTS {table.schema}.{index.name}')
+        if not valid:
+            plan._add(f'Build index {index.name}', index._query_create(True, True))
+
+
+async def plan_migration(*tables: Type[Table], connection: Optional[Connection] = None,
+                         batch_size: int = _DEFAULT_BATCH_SIZE) -> MigrationPlan:
+    """Compares tables in the database with their definitions and plans the statements to migrate them.
+
+    Tables bound to a pool, or sharded across pools, are compared in each of their pools.
+
+    Args:
+        *tables (Table): The tables to migrate. If none are supplied all defined tables are migrated.
+        connection (Connection, optional): A database connection to use for every table.
+            If none is supplied a connection will be acquired from the pools holding each table.
+        batch_size (int, optional): The number of records to update per statement when backfilling columns.
+    Returns:
+        MigrationPlan: The planned statements.
+    """
+    plan = MigrationPlan()
+
+    for table in tables or Table.__subclasses__():
+        for pool in ((None,) if connection is not None else table._pool_names()):
+            async with MaybeAcquire(connection, pool=pool) as _connection:
+                table_plan = MigrationPlan()
+                await _plan_table(table_plan, _connection, table, batch_size)
+                plan._extend(table_plan, pool)
+
+    return plan
+
+
+async def migrate(*tables: Type[Table], connection: Optional[Connection] = None, dry_run: bool = False,
+                  batch_size: int = _DEFAULT_BATCH_SIZE, lock_timeout: Optional[float] = _DEFAULT_LOCK_TIMEOUT) -> MigrationPlan:
+    """Migrates tables in the database to match their definitions without recreating them.
+
+    Args:
+        *tables (Table): The tables to migrate. If none are supplied all defined tables are migrated.
+        connection (Connection, optional): A database connection to use for every table.
+            If none is supplied a connection will be acquired from the pools holding each table.
+        dry_run (bool, optional): Plans the migration without running it.
+        batch_size (int, optional): The number of records to update per statement when backfilling columns.
+        lock_timeout (float, optional): The number of seconds each statement may wait for a lock.
+    Returns:
+        MigrationPlan: The planned statements, which can be printed to review them.
+    """
+    plan = await plan_migration(*tables, connection=connection, batch_size=batch_size)
+
+    for warning in plan.warnings:
+        log.warning('Migration: %s', warning)
+
+    if not dry_run:
+        await plan.apply(connection=connection, lock_timeout=lock_timeout)
+
+    return plan
@@ -0,0 +1,216 @@
+import asyncio
+import logging
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .abc import Fetchable
+    from .connection import Connection, Record
+
+
+log = logging.getLogger(__name__)
+
+
+class Mirror:
+    """Keeps a complete in-memory copy of a table to serve equality lookups without querying the database.
+
+    Records are indexed by their primary key and by every column declared with ``Column(index=True)``.
+    After a write, or an invalidation received through :func:`listen_for_invalidations`,
+    the affected records are fetched again, always from the primary rather than a read replica.
+    Lookups fall back to the database until the mirror is loaded, while a refresh is pending
+    and while a transaction which modified the table is open.
+
+    Args:
+        table (Fetchable): The table to mirror.
+
+    Attributes:
+        hits (int): The number of lookups served from memory.
+        misses (int): The number of lookups which fell back to the database.
+        refreshes (int): The number of times records were fetched again after a change.
+    """
+
+    def __init__(self, table: 'Fetchable'):
+        self.table = table
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self._primary_keys = table._get_primary_keys()
+        self._records: Dict[Tuple[Any, ...], 'Record'] = {}
+
+        # Unhashable values, such as arrays and JSON, cannot be indexed
+        self._indexes: Dict[str, Dict[Any, Dict[Tuple[Any, ...], 'Record']]] = {
+            column.name: {} for column in table._columns.values()
+            if column.index and not column.primary_key and not column.is_array and getattr(column.type.python, '__hash__', None) is not None
+        }
+
+        self._loaded = False
+        self._stale = False
+        self._pending = 0
+        self._lock: Optional[asyncio.Lock] = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether lookups can currently be served from memory."""
+        return self._loaded and not self._stale and not self._pending
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    async def load(self, *, connection: Optional['Connection'] = None):
+        """Fetches every record of the table, replacing the mirror's contents.
+
+        Args:
+            connection (Connection, optional): A database connection to use.
+                If none is supplied a connection will be acquired from the pool.
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            await self._load(connection)
+
+    async def _load(self, connection: Optional['Connection'] = None):
+        query, values = self.table._query_fetch(None, None)
+        records = await self.table._execute_query('fetch', query, values, connection, primary=True)
+
+        self._records.clear()
+        for index in self._indexes.values():
+            index.clear()
+        for record in records:
+            self._add(record)
+
+        self._loaded = True
+        self._stale = False
+
+    def refresh(self, keys: Optional[Iterable[Tuple[Any, ...]]] = None):
+        """Schedules the records with the supplied primary keys to be fetched again.
+
+        Args:
+            keys (list(tuple), optional): The primary keys of the changed records.
+                If none are supplied the whole table is fetched again.
+        """
+        if not self._loaded:
+            return
+
+        self._pending += 1
+        asyncio.ensure_future(self._refresh(None if keys is None else list(keys)))
+
+    async def _refresh(self, keys: Optional[List[Tuple[Any, ...]]]):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        try:
+            # Refreshes are applied in order so an older result never replaces a newer one
+            async with self._lock:
+                self.refreshes += 1
+                if keys is None or self._stale:
+                    await self._load()
+                    return
+
+                query = self.table._query_primary_keys(self._primary_keys)
+                records = await self.table._execute_query('fetch', query, [list(array) for array in zip(*keys)], primary=True)
+
+                for key in keys:
+                    self._remove(key)
+                for record in records:
+                    self._add(record)
+
+        except Exception as e:
+            self._stale = True
+            log.warning('Could not refresh mirror of %s, falling back to the database: %s', self.table._name, e)
+
+        finally:
+            self._pending -= 1
+
+    def _key(self, record: 'Record') -> Tuple[Any, ...]:
+        return tuple(record[column.name] for column in self._primary_keys)
+
+    def _add(self, record: 'Record'):
+        key = self._key(record)
+        self._remove(key)
+        self._records[key] = record
+        for name, index in self._indexes.items():
+            index.setdefault(record[name], {})[key] = record
+
+    def _remove(self, key: Tuple[Any, ...]):
+        record = self._records.pop(key, None)
+        if record is None:
+            return
+
+        for name, index in self._indexes.items():
+            bucket = index[record[name]]
+            del bucket[key]
+            if not bucket:
+                del index[record[name]]
+
+    def lookup(self, kwargs: Dict[str, Any], limit: Optional[int] = None) -> Optional[List['Record']]:
+        """Finds the records matching equality filters, if they can be served from memory.
+
+        Args:
+            kwargs (dict(str, any)): Column values to search for, as passed to :meth:`Fetchable.fetch`.
+            limit (int, optional): The maximum number of records to return.
+        Returns:
+            list(Record): The matching records, or ``None`` if the lookup must be made against the database.
+        """
+        if not self.ready:
+            self.misses += 1
+            return None
+
+        filters = []
+        for kwarg, value in kwargs.items():
+            column, statement, operator = self.table._parse_kwarg(kwarg)
+            if statement != 'AND' or operator != '=' or column.is_array or column.decode != 'eager':
+                self.misses += 1
+                return None
+
+            self.table._validate_value(column, value)
+            filters.append((column.name, value))
+
+        self.hits += 1
+
+        # NULL is never equal to anything
+        if limit == 0 or any(value is None for _, value in filters):
+            return []
+
+        values = dict(filters)
+        names = [column.name for column in self._primary_keys]
+        if all(name in values for name in names):
+            record = self._records.get(tuple(values[name] for name in names))
+            candidates: Iterable['Record'] = () if record is None else (record,)
+        else:
+            candidates = self._records.values()
+            for name, value in filters:
+                if name in self._indexes:
+                    candidates = self._indexes[name].get(value, {}).values()
+                    break
+
+        records = []
+        for record in candidates:
+            if all(record[name] == value for name, value in filters):
+                records.append(record)
+                if limit is not None and len(records) >= limit:
+                    break
+
+        return records
+
+
+def _mirrors() -> Iterable[Mirror]:
+    """Iterates over the mirrors of every mirrored table."""
+    from .notify import _subclasses
+
+    for table in _subclasses():
+        if table._mirror is not None:
+            yield table._mirror
+
+
+async def load_mirrors(*, connection: Optional['Connection'] = None):
+    """Loads every table defined with ``mirrored=True`` into memory.
+
+    This should be called once the connection pool has been created.
+
+    Args:
+        connection (Connection, optional): A database connection to use.
+            If none is supplied a connection will be acquired from the pool.
+    """
+    for mirror in _mirrors():
+        await mirror.load(connection=connection)
@@ -0,0 +1,278 @@
+import asyncio
+import json
+import logging
+import uuid
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
+
+import asyncpg
+
+from .connection import _default_pool
+from .pagination import _decode_values, _encode_values
+
+if TYPE_CHECKING:
+    from .abc import Fetchable
+
+
+log = logging.getLogger(__name__)
+
+_DEFAULT_CHANNEL = 'donphan_invalidate'
+
+# Postgres rejects notification payloads of 8000 bytes or more
+_MAX_PAYLOAD_SIZE = 7999
+
+# The number of seconds to wait before reconnecting, doubled after each failed attempt up to the maximum
+_RECONNECT_DELAY = 1
+_MAX_RECONNECT_DELAY = 60
+
+_bus: Optional['InvalidationBus'] = None
+
+
+class InvalidationBus:
+    """Shares invalidations of cached query results between processes using Postgres `LISTEN`/`NOTIFY`.
+
+    Writes made through a table with a result cache or mirror are published on the bus,
+    and every subscribed process evicts the affected results from its own cache
+    and refreshes the affected records of its mirrors.
+
+    If the connection is lost the bus reconnects with an increasing delay. Invalidations from
+    other processes may be missed meanwhile, so result caches and mirrors are bypassed until it
+    reconnects and invalidations made by this process are sent once it does.
+
+    Args:
+        channel (str, optional): The name of the notification channel to use.
+
+    Attributes:
+        published (int): The number of notifications sent by this process.
+        received (int): The number of notifications received from other processes.
+    """
+
+    def __init__(self, channel: str = _DEFAULT_CHANNEL):
+        self.channel = channel
+        self.published = 0
+        self.received = 0
+        self._origin = uuid.uuid4().hex
+        self._pool = None
+        self._connection = None
+        self._queue: asyncio.Queue = None  # type: ignore
+        self._task: Optional[asyncio.Task] = None
+        self._reconnector: Optional[asyncio.Task] = None
+        self._objects: Dict[str, 'Fetchable'] = {}
+
+    @property
+    def running(self) -> bool:
+        """Whether the bus is connected and listening."""
+        return self._connection is not None
+
+    async def start(self, *, pool=None):
+        """Acquires a dedicated connection from the pool and begins listening for invalidations.
+
+        Args:
+            pool (asyncpg.pool.Pool, optional): A connection pool to use.
+                If none is supplied the default pool will be used.
+        """
+        self._pool = pool or _default_pool()
+        self._queue = asyncio.Queue()
+        await self._connect()
+
+    async def _connect(self):
+        connection = await self._pool.acquire()
+        try:
+            await connection.add_listener(self.channel, self._on_notification)
+        except BaseException:
+            await self._pool.release(connection)
+            raise
+
+        connection.add_termination_listener(self._on_termination)
+        self._connection = connection
+        self._task = asyncio.ensure_future(self._publisher())
+
+    async def close(self):
+        """Stops listening for invalidations and releases the dedicated connection."""
+        global _bus
+
+        if _bus is self:
+            _bus = None
+
+        if self._reconnector is not None:
+            self._reconnector.cancel()
+            self._reconnector = None
+
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+        if self._connection is not None:
+            connection, self._connection = self._connection, None
+            connection.remove_termination_listener(self._on_termination)
+            await connection.remove_listener(self.channel, self._on_notification)
+            await self._pool.release(connection)
+
+    def publish(self, table: 'Fetchable', keys: Optional[Iterable[Tuple[Any, ...]]] = None):
+        """Queues an invalidation of a table's cached results to be sent to other processes.
+
+        Args:
+            table (Fetchable): The table which was modified.
+            keys (list(tuple), optional): The primary keys of the modified records.
+                If none are supplied every cached result of the table is invalidated.
+        """
+        if self._queue is not None:
+            self._queue.put_nowait((table, None if keys is None else list(keys)))
+
+    async def _publisher(self):
+        while True:
+            pending = [await self._queue.get()]
+            while not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+
+            # Each payload is sent separately, so a failure neither loses the others nor stops the publisher
+            for table, keys in self._merge(pending).items():
+                try:
+                    await self._connection.execute('SELECT pg_notify($1, $2)', self.channel, self._payload(table, keys))
+                    self.published += 1
+                except asyncio.CancelledError:
+                    raise
+                except (asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+                    log.warning('Could not publish invalidations of %s: %s', table._name, e)
+                except Exception:
+                    log.exception('Could not publish invalidations of %s', table._name)
+
+    def _merge(self, pending: List[Tuple['Fetchable', Optional[List[Tuple[Any, ...]]]]]
+               ) -> Dict['Fetchable', Optional[List[Tuple[Any, ...]]]]:
+        """Merges pending invalidations into one per table."""
+        merged: Dict['Fetchable', Optional[List[Tuple[Any, ...]]]] = {}
+        for table, keys in pending:
+            if keys is None or (table in merged and merged[table] is None):
+                merged[table] = None
+            else:
+                merged.setdefault(table, []).extend(keys)  # type: ignore
+        return merged
+
+    def _payload(self, table: 'Fetchable', keys: Optional[List[Tuple[Any, ...]]]) -> str:
+        """Builds the notification payload invalidating a table's results."""
+        if keys is not None:
+            primary_keys = table._get_primary_keys()
+            try:
+                payload = json.dumps({
+                    'origin': self._origin,
+                    'table': table._name,
+                    'keys': [_encode_values(primary_keys, key) for key in keys]
+                }, separators=(',', ':'))
+            except (TypeError, ValueError) as e:
+                log.warning('Could not encode the invalidated keys of %s, invalidating all of its results: %s', table._name, e)
+            else:
+                # Fall back to invalidating the whole table when there are too many keys
+                if len(payload.encode()) <= _MAX_PAYLOAD_SIZE:
+                    return payload
+
+        return json.dumps({'origin': self._origin, 'table': table._name, 'keys': None}, separators=(',', ':'))
+
+    def _resolve(self, name: str) -> Optional['Fetchable']:
+        """Finds the table with the supplied name."""
+        if name not in self._objects:
+            self._objects = {table._name: table for table in _subclasses()}
+
+        return self._objects.get(name)
+
+    def _on_notification(self, connection, pid, channel, payload):
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            return
+
+        if message.get('origin') == self._origin:
+            return
+
+        table = self._resolve(message.get('table'))
+        if table is None:
+            return
+
+        self.received += 1
+        keys = message.get('keys')
+        if keys is not None:
+            primary_keys = table._get_primary_keys()
+            keys = [tuple(_decode_values(primary_keys, key)) for key in keys]
+
+        table._invalidate(keys, publish=False)
+
+    def _on_termination(self, connection):
+
+        # Invalidations may be missed while disconnected, so drop everything
+        for table in _subclasses():
+            table._invalidate(publish=False)
+
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+        # Return the closed connection to the pool so it can be replaced
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            asyncio.ensure_future(self._pool.release(connection))
+
+        log.warning('Invalidation bus connection was lost, bypassing cached results until it reconnects')
+
+        if self._reconnector is None:
+            self._reconnector = asyncio.ensure_future(self._reconnect())
+
+    async def _reconnect(self):
+        delay = _RECONNECT_DELAY
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                await self._connect()
+            except (OSError, asyncio.TimeoutError, asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+                delay = min(delay * 2, _MAX_RECONNECT_DELAY)
+                log.warning('Could not reconnect the invalidation bus, retrying in %ss: %s', delay, e)
+            else:
+                break
+
+        self._reconnector = None
+
+        # Drop anything loaded while invalidations could not be received
+        for table in _subclasses():
+            table._invalidate(publish=False)
+
+        log.info('Invalidation bus reconnected')
+
+
+def _subclasses() -> Iterable['Fetchable']:
+    """Iterates over every defined table and view."""
+    from .abc import Fetchable
+
+    subclasses = list(Fetchable.__subclasses__())
+    while subclasses:
+        subclass = subclasses.pop()
+        subclasses.extend(subclass.__subclasses__())
+        yield subclass
+
+
+async def listen_for_invalidations(*, pool=None, channel: str = _DEFAULT_CHANNEL) -> InvalidationBus:
+    """Starts sharing invalidations of cached query results with other processes.
+
+    Args:
+        pool (asyncpg.pool.Pool, optional): A connection pool to use.
+            If none is supplied the default pool will be used.
+        channel (str, optional): The name of the notification channel to use.
+    Returns:
+        InvalidationBus: The running invalidation bus.
+    """
+    global _bus
+
+    if _bus is not None:
+        await _bus.close()
+
+    _bus = InvalidationBus(channel)
+    await _bus.start(pool=pool)
+    return _bus
+
+
+def _publish(table: 'Fetchable', keys: Optional[Iterable[Tuple[Any, ...]]] = None):
+    """Publishes an invalidation on the bus, if any, once it is connected."""
+    if _bus is not None:
+        _bus.publish(table, keys)
+
+
+def _disconnected() -> bool:
+    """Whether the bus has lost its connection, so invalidations from other processes may be missed."""
+    return _bus is not None and not _bus.running
@@ -0,0 +1,88 @@
+import base64
+import binascii
+import datetime
+import decimal
+import ipaddress
+import json
+import uuid
+
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .column import Column
+
+
+def _encode_datetime(value: datetime.datetime) -> List[Any]:
+    offset = value.utcoffset()
+    return [value.year, value.month, value.day, value.hour, value.minute, value.second, value.microsecond,
+            None if offset is None else offset.total_seconds()]
+
+
+def _decode_datetime(value: List[Any]) -> datetime.datetime:
+    *parts, offset = value
+    tzinfo = None if offset is None else datetime.timezone(datetime.timedelta(seconds=offset))
+    return datetime.datetime(*parts, tzinfo=tzinfo)
+
+
+def _decode_ip(value: str) -> Any:
+    if '/' in value:
+        return ipaddress.ip_network(value)
+    return ipaddress.ip_address(value)
+
+
+# Converters for python types which cannot be represented in JSON, keyed by a column's python type
+_CONVERTERS: Dict[type, Tuple[Callable[[Any], Any], Callable[[Any], Any]]] = {
+    decimal.Decimal: (str, decimal.Decimal),
+    datetime.datetime: (_encode_datetime, _decode_datetime),
+    datetime.date: (datetime.date.toordinal, datetime.date.fromordinal),
+    datetime.timedelta: (lambda v: [v.days, v.seconds, v.microseconds], lambda v: datetime.timedelta(*v)),
+    bytes: (lambda v: base64.b64encode(v).decode(), base64.b64decode),
+    uuid.UUID: (str, uuid.UUID),
+    ipaddress._BaseNetwork: (str, _decode_ip),
+}
+
+
+def _encode_values(columns: Sequence['Column'], values: Iterable[Any]) -> List[Any]:
+    """Converts column values to JSON serializable values."""
+    encoded = []
+    for column, value in zip(columns, values):
+        if value is not None and column.type.python in _CONVERTERS:
+            value = _CONVERTERS[column.type.python][0](value)
+        encoded.append(value)
+    return encoded
+
+
+def _decode_values(columns: Sequence['Column'], values: Iterable[Any]) -> List[Any]:
+    """Converts values encoded with :func:`_encode_values` back to column values."""
+    decoded = []
+    for column, value in zip(columns, values):
+        if value is not None and column.type.python in _CONVERTERS:
+            value = _CONVERTERS[column.type.python][1](value)
+        decoded.append(value)
+    return decoded
+
+
+def _encode_token(record: Any, key: Sequence['Column'], descending: bool) -> str:
+    """Encodes the sort key values of a record as an opaque continuation token."""
+    values = _encode_values(key, (record[column.name] for column in key))
+    payload = json.dumps([[column.name for column in key], descending, values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def _decode_token(token: str, key: Sequence['Column'], descending: bool) -> List[Any]:
+    """Decodes the sort key values from a continuation token."""
+    try:
+        payload = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        names, token_descending, values = json.loads(payload)
+
+        if names != [column.name for column in key] or token_descending != descending:
+            raise ValueError('continuation token was created for a different sort key')
+        if not isinstance(values, list) or len(values) != len(key):
+            raise ValueError(f'expected {len(key)} sort key values')
+
+        decoded = _decode_values(key, values)
+
+    except (binascii.Error, TypeError, ValueError) as e:
+        raise ValueError(f'Invalid continuation token: {e}') from None
+
+    return decoded
@@ -0,0 +1,180 @@
+import asyncio
+import contextlib
+import hashlib
+import logging
+import zlib
+
+from typing import Any, AsyncIterator, Callable, Iterable, List, Optional
+
+from .connection import _default_pool, Connection, get_pool, MaybeAcquire
+
+
+log = logging.getLogger(__name__)
+
+_FINGERPRINTS = 'public.donphan_fingerprints'
+
+# Serialises schema creation between processes
+_LOCK_KEY = zlib.crc32(b'donphan.schema')
+
+
+def _dependency_levels(objects: Iterable[Any]) -> List[List[Any]]:
+    """Sorts objects into levels which only depend on objects in earlier levels."""
+    objects = list(objects)
+    remaining = {obj: {dependency for dependency in obj._dependencies(objects) if dependency is not obj} for obj in objects}
+
+    levels = []
+    while remaining:
+        level = [obj for obj, dependencies in remaining.items() if not dependencies]
+        if not level:
+            raise TypeError(f'Circular references between {", ".join(obj._name for obj in remaining)}')
+
+        for obj in level:
+            del remaining[obj]
+        for dependencies in remaining.values():
+            dependencies.difference_update(level)
+
+        levels.append(level)
+
+    return levels
+
+
+def _fingerprint(objects: Iterable[Any], queries: Callable[[Any], List[str]]) -> str:
+    """Computes a stable fingerprint of the DDL which creates the objects and the pools they are created in."""
+    digest = hashlib.sha256()
+    for obj in sorted(objects, key=lambda obj: obj._name):
+        digest.update(repr(obj._pool_names()).encode())
+        digest.update(b'\0')
+        for query in queries(obj):
+            digest.update(query.encode())
+            digest.update(b'\0')
+    return digest.hexdigest()
+
+
+async def _stored_fingerprint(connection: Connection, name: str) -> Optional[str]:
+    """Retrieves the fingerprint recorded when the objects were last created."""
+
+    # Querying a missing table would abort any transaction the connection is in
+    if await connection.fetchval('SELECT to_regclass($1)::TEXT', _FINGERPRINTS) is None:
+        return None
+    return await connection.fetchval(f'SELECT fingerprint FROM {_FINGERPRINTS} WHERE name = $1', name)
+
+
+async def _store_fingerprint(connection: Connection, name: str, fingerprint: str):
+    await connection.execute(f'CREATE TABLE IF NOT EXISTS {_FINGERPRINTS} ( name TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, '
+                             'updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW() )')
+    await connection.execute(f'INSERT INTO {_FINGERPRINTS} (name, fingerprint) VALUES ($1, $2) ON CONFLICT (name) DO UPDATE '
+                             'SET fingerprint = EXCLUDED.fingerprint, updated_at = NOW()', name, fingerprint)
+
+
+def _lock_pool(objects: Iterable[Any]) -> Optional[str]:
+    """Chooses the pool the advisory lock is taken and fingerprints are recorded in.
+
+    This is the default pool, or the first named pool holding the objects if no default pool was created.
+    """
+    names = {name for obj in objects for name in obj._pool_names()}
+    if _default_pool() is not None:
+        return None
+    if None in names or not names:
+        raise AttributeError('Could not find the default pool, create_pool must be called before creating objects')
+    return sorted(names)[0]
+
+
+async def _create_objects(objects: List[Any], queries: Callable[[Any], List[str]], connection: Optional[Connection],
+                          reserved: Optional[Connection] = None, reserved_pool: Optional[str] = None,
+                          drop: Optional[Callable[[Any], str]] = None):
+    """Creates objects after the objects they depend on.
+
+    Objects which do not depend on each other are created concurrently,
+    each on a connection from the pools holding them, unless a connection is supplied.
+
+    ``reserved`` is a connection already held from the pool named ``reserved_pool``, it is used
+    in turn for the objects in that pool when the pool cannot supply another connection.
+    If ``drop`` is supplied the objects are first dropped, before the objects they depend on.
+    """
+    reserved_lock = asyncio.Lock()
+
+    @contextlib.asynccontextmanager
+    async def acquire(pool: Optional[str]) -> AsyncIterator[Connection]:
+        if connection is not None:
+            yield connection
+        elif reserved is not None and pool == reserved_pool and get_pool(pool).get_max_size() <= 1:
+            async with reserved_lock:
+                yield reserved
+        else:
+            async with MaybeAcquire(pool=pool) as _connection:
+                yield _connection
+
+    levels = _dependency_levels(objects)
+
+    if drop is not None:
+        for level in reversed(levels):
+            for obj in level:
+                for pool in (obj._pool_names() if connection is None else (None,)):
+                    async with acquire(pool) as _connection:
+                        await _connection.execute(drop(obj))
+
+    # Create each schema once per pool rather than for every object
+    schemas = {(pool, obj.schema): obj for obj in objects for pool in (obj._pool_names() if connection is None else (None,))}
+    for (pool, _), obj in schemas.items():
+        async with acquire(pool) as _connection:
+            await _connection.execute(obj._query_create_schema())
+
+    async def create(obj, connection):
+        for query in queries(obj):
+            await connection.execute(query)
+
+    async def run(obj):
+        for pool in obj._pool_names():
+            async with acquire(pool) as _connection:
+                await create(obj, _connection)
+
+    for level in levels:
+        if connection is not None:
+            for obj in level:
+                await create(obj, connection)
+        else:
+            await asyncio.gather(*(run(obj) for obj in level))
+
+
+async def _create_all(name: str, objects: Iterable[Any], queries: Callable[[Any], List[str]], *,
+                      connection: Optional[Connection] = None, force: bool = False, drop: Optional[Callable[[Any], str]] = None):
+    """Creates objects unless their DDL is unchanged since they were last created.
+
+    A fingerprint of the DDL is recorded in the database once the objects are created.
+    Creation is guarded by an advisory lock so only one process creates the objects
+    when many start at once, the others wait and then skip creation. The lock is taken in the
+    default pool, or the first named pool holding the objects if no default pool was created.
+    If that pool only holds a single connection its objects are created on the connection holding the lock.
+
+    Args:
+        name (str): Identifies the group of objects in the fingerprint table.
+        objects (list): The objects to create.
+        queries (callable): Generates the DDL statements which create an object.
+        connection (Connection, optional): A database connection to use.
+            If none is supplied connections will be acquired from the pool.
+        force (bool, optional): Creates the objects even if their fingerprint is unchanged.
+        drop (callable, optional): Generates the statement which drops an object, if the objects
+            should be dropped while the lock is held before they are created.
+    """
+    objects = list(objects)
+    fingerprint = _fingerprint(objects, queries)
+    pool = _lock_pool(objects) if connection is None else None
+
+    async with MaybeAcquire(connection, pool=pool) as _connection:
+        if not force and await _stored_fingerprint(_connection, name) == fingerprint:
+            log.debug('Skipping creation of %s, schema is unchanged', name)
+            return
+
+        await _connection.execute('SELECT pg_advisory_lock($1)', _LOCK_KEY)
+        try:
+
+            # Another process may have created the objects while waiting for the lock
+            if not force and await _stored_fingerprint(_connection, name) == fingerprint:
+                return
+
+            # The connection holding the lock is lent out so a small pool is not exhausted
+            await _create_objects(objects, queries, connection, _connection, pool, drop)
+            await _store_fingerprint(_connection, name, fingerprint)
+
+        finally:
+            await _connection.execute('SELECT pg_advisory_unlock($1)', _LOCK_KEY)
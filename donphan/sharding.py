@@ -0,0 +1,104 @@
+import abc
+import bisect
+import copy
+import uuid
+import zlib
+
+from typing import Any, Iterable, Optional, Sequence, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .abc import Fetchable
+    from .column import Column
+
+
+class Sharding(abc.ABC):
+    """Splits the records of a table across several connection pools by the value of a column.
+
+    Each pool must be created with :func:`create_pool` under the name it is referred to by.
+
+    Args:
+        column (str): The name of the shard key column.
+
+    Attributes:
+        pools (tuple(str)): The names of the pools the table is split across.
+    """
+
+    pools: Tuple[str, ...] = ()
+
+    def __init__(self, column: str):
+        self.column_name = column
+
+    def _update(self, table: 'Fetchable') -> 'Sharding':
+        # Tables sharded alike may share an instance, so each is bound to its own copy
+        sharding = copy.copy(self)
+        sharding.table = table
+        try:
+            sharding.column: 'Column' = table._columns[self.column_name]
+        except KeyError:
+            raise AttributeError(f'Could not find shard key column {self.column_name} in table {table._name}') from None
+        return sharding
+
+    @abc.abstractmethod
+    def pool_for(self, value: Any) -> str:
+        """Determines which pool holds the records with a shard key value.
+
+        Args:
+            value (any): The shard key value.
+        Returns:
+            str: The name of the pool.
+        """
+        raise NotImplementedError
+
+
+class HashSharding(Sharding):
+    """Splits the records of a table evenly across pools by the hash of their shard key.
+
+    The hash is stable between processes, adding or removing pools moves most records.
+
+    Args:
+        column (str): The name of the shard key column.
+        pools (list(str)): The names of the pools to split the table across.
+    """
+
+    def __init__(self, column: str, pools: Iterable[str]):
+        super().__init__(column)
+        self.pools = tuple(pools)
+        if not self.pools:
+            raise TypeError('A sharded table must have at least one pool')
+
+    def pool_for(self, value: Any) -> str:
+        if isinstance(value, bytes):
+            data = value
+        elif isinstance(value, uuid.UUID):
+            data = value.bytes
+        else:
+            data = str(value).encode()
+        return self.pools[zlib.crc32(data) % len(self.pools)]
+
+
+class RangeSharding(Sharding):
+    """Splits the records of a table across pools by ranges of their shard key.
+
+    Args:
+        column (str): The name of the shard key column.
+        ranges (list(tuple(any, str))): The exclusive upper bound of each range and the name of the pool
+            holding it, in ascending order. The last bound may be ``None`` for a range without an upper bound.
+    """
+
+    def __init__(self, column: str, ranges: Sequence[Tuple[Optional[Any], str]]):
+        super().__init__(column)
+        if not ranges:
+            raise TypeError('A sharded table must have at least one range')
+        if any(bound is None for bound, _ in ranges[:-1]):
+            raise TypeError('Only the last range may be without an upper bound')
+
+        self._unbounded = ranges[-1][0] is None
+        self._bounds = [bound for bound, _ in ranges if bound is not None]
+        self._names = [name for _, name in ranges]
+        self.pools = tuple(dict.fromkeys(self._names))
+
+    def pool_for(self, value: Any) -> str:
+        index = bisect.bisect_right(self._bounds, value)
+        if index == len(self._bounds) and not self._unbounded:
+            raise TypeError(f'Shard key {value!r} of table {self.table._name} is beyond the last range')
+        return self._names[index]
@@ -0,0 +1,58 @@
+import asyncio
+
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Shares a single execution between identical concurrent queries.
+
+    While a query is in flight, further calls with the same key wait for
+    and receive its result instead of executing the query again.
+
+    Attributes:
+        executions (int): The number of queries executed.
+        collapsed (int): The number of calls which shared another call's execution.
+    """
+
+    def __init__(self):
+        self.executions = 0
+        self.collapsed = 0
+        self._flights: Dict[Hashable, asyncio.Future] = {}
+
+    async def run(self, key: Hashable, func: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        """Runs a coroutine function, or waits for an in-flight call with the same key.
+
+        Args:
+            key (hashable): Identifies identical calls.
+            func (coroutine function): The function to run.
+            *args (any): Arguments to pass to the function.
+        Returns:
+            The result of the call.
+        """
+        future = self._flights.get(key)
+        if future is not None:
+            self.collapsed += 1
+            result = await asyncio.shield(future)
+
+            # Don't share mutable lists of records between callers
+            return list(result) if isinstance(result, list) else result
+
+        self.executions += 1
+        future = self._flights[key] = asyncio.ensure_future(func(*args))
+
+        def done(_):
+            if self._flights.get(key) is future:
+                del self._flights[key]
+
+        future.add_done_callback(done)
+
+        # The call continues for other waiters if this caller is cancelled
+        return await asyncio.shield(future)
+
+    def invalidate(self):
+        """Stops sharing in-flight calls, for use after the underlying data changes.
+
+        Calls already in flight complete for their existing waiters, while later calls
+        execute again rather than receiving results read before the change.
+        """
+        self._flights.clear()
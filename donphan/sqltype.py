@@ -3,8 +3,6 @@ import decimal
 import ipaddress
 import uuid
 
-from .enum import Enum
-
 _defaults = {}
 
 
@@ -140,9 +138,9 @@ class SQLType:
     # 8.7 Enum
 
     @classmethod
-    @default_for(Enum)
     def Enum(cls):
         """Postgres Enum Type"""
+        from .enum import Enum
         return cls(Enum, 'ENUM')
 
     # 8.9 Network Adress
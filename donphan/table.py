@@ -1,8 +1,41 @@
 from .abc import Insertable
 from .connection import Connection, MaybeAcquire
+from .schema import _create_all
 
 
 class Table(Insertable):
+    """A database table, whose columns are declared as annotated class attributes.
+
+    Tables are configured with keywords in their class definition,
+    e.g. ``class Users(Table, schema='auth', query_cache_size=256):``.
+
+    Kwargs:
+        schema (str, optional): The schema the table is created in. Defaults to ``public``.
+        query_cache_size (int, optional): The number of generated SQL statements to keep compiled,
+            the least recently used are compiled again once exceeded. Defaults to 128.
+        validation (ValidationMode, optional): How thoroughly values passed to the table's methods
+            are checked against their columns. Defaults to :attr:`ValidationMode.full`.
+        coalesce (bool or float, optional): Fetches concurrent lookups of single records by their primary key
+            together in one query. If a number is supplied lookups are gathered for that many seconds,
+            otherwise until the next iteration of the event loop. Defaults to ``False``.
+        single_flight (bool, optional): Shares the result of a read with identical reads made while it runs,
+            rather than running each of them. Reads made after a write through the table are not shared
+            with reads started before it. Defaults to ``False``.
+        result_cache_size (int, optional): Caches the results of reads, holding at most this many.
+            Writes made through the table invalidate the affected results. Defaults to 1024 if only
+            ``result_cache_ttl`` is supplied, otherwise results are not cached.
+        result_cache_ttl (float, optional): The number of seconds cached results are kept for.
+            If none is supplied results are kept until invalidated or evicted.
+        mirrored (bool, optional): Keeps a copy of every record in memory once :func:`load_mirrors` is called,
+            serving equality lookups without querying the database. See :class:`Mirror`. Defaults to ``False``.
+        pool (str, optional): The name of the pool, created with :func:`create_pool`, the table is held in.
+            If none is supplied the default pool is used.
+        sharding (Sharding, optional): Splits the table's records across several pools by a shard key,
+            e.g. :class:`HashSharding` or :class:`RangeSharding`. Cannot be combined with ``pool``.
+
+    Raises:
+        TypeError: An unknown keyword was supplied.
+    """
 
     @classmethod
     def _query_create(cls, drop_if_exists=True, if_not_exists=True):
@@ -26,12 +59,63 @@ class Table(Insertable):
 
         return ' '.join(builder)
 
+    @classmethod
+    def _query_create_indexes(cls, concurrently=False, if_not_exists=True):
+        return [index._query_create(concurrently, if_not_exists) for index in cls._indexes]
+
     @classmethod
     def _query_drop(cls, if_exists=True, cascade=False):
         return cls._base_query_drop('TABLE', if_exists, cascade)
 
+    @classmethod
+    def _dependencies(cls, objects):
+        return {column.references.table for column in cls._columns.values() if column.references is not None} & set(objects)
+
+    @classmethod
+    async def create(cls, *, connection=None, drop_if_exists=True, if_not_exists=True, concurrently=False):
+        """Creates this table and its indexes in the database.
+
+        Args:
+            connection (Connection, optional): A database connection to use.
+                If none is supplied a connection will be acquired from the pool.
+            drop_if_exists (bool, optional): Accepted for consistency with views, an existing
+                table is never dropped here, see :meth:`drop` or :func:`create_tables`.
+            if_not_exists (bool, optional): Skips the table and its indexes if they already exist,
+                rather than raising an error, and creates the table's schema if it is missing.
+            concurrently (bool, optional): Builds the indexes without locking out writes to the table.
+        """
+        if connection is None and cls._sharding is not None:
+            async for connection in cls._each_shard(f'{cls._name}.create'):
+                await cls.create(connection=connection, drop_if_exists=drop_if_exists, if_not_exists=if_not_exists, concurrently=concurrently)
+            return
 
-async def create_tables(connection: Connection = None, drop_if_exists: bool = False, if_not_exists: bool = True):
+        async with MaybeAcquire(connection, pool=cls._pool_name, site=f'{cls._name}.create') as connection:
+            await super().create(connection=connection, drop_if_exists=drop_if_exists, if_not_exists=if_not_exists)
+            await cls.create_indexes(connection=connection, concurrently=concurrently, if_not_exists=if_not_exists)
+
+    @classmethod
+    async def create_indexes(cls, *, connection=None, concurrently: bool = False, if_not_exists: bool = True):
+        """Creates this table's indexes in the database.
+
+        Args:
+            connection (Connection, optional): A database connection to use.
+                If none is supplied a connection will be acquired from the pool.
+            concurrently (bool, optional): Builds the indexes without locking out writes to the table.
+                This is slower, and cannot be done within a transaction.
+            if_not_exists (bool, optional): Skips indexes which already exist.
+        """
+        if connection is None and cls._sharding is not None:
+            async for connection in cls._each_shard(f'{cls._name}.create_indexes'):
+                await cls.create_indexes(connection=connection, concurrently=concurrently, if_not_exists=if_not_exists)
+            return
+
+        async with MaybeAcquire(connection, pool=cls._pool_name, site=f'{cls._name}.create_indexes') as connection:
+            for query in cls._query_create_indexes(concurrently, if_not_exists):
+                await connection.execute(query)
+
+
+async def create_tables(connection: Connection = None, drop_if_exists: bool = False, if_not_exists: bool = True,
+                        concurrently: bool = False, force: bool = False):
     """Create all defined tables.
 
     Args:
@@ -39,9 +123,21 @@ async def create_tables(connection: Connection = None, drop_if_exists: bool = Fa
                 If none is supplied a connection will be acquired from the pool.
         drop_if_exists (bool, optional): Specifies wether the tables should be
                 first dropped from the database if they already exists.
+        concurrently (bool, optional): Specifies wether indexes should be built
+                without locking out writes to existing tables.
+        force (bool, optional): Specifies wether the tables should be created
+                even if their definitions are unchanged since they were last created.
+
+    Tables are created after the tables they reference. Unless a connection is
+    supplied, tables which do not reference each other are created concurrently.
+    Creation is skipped entirely when a fingerprint of the tables' definitions
+    matches the one recorded in the database when they were last created.
     """
-    async with MaybeAcquire(connection=connection) as connection:
-        for table in Table.__subclasses__():
-            if drop_if_exists:
-                await table.drop(connection=connection, if_exists=True, cascade=True)
-            await table.create(connection=connection, if_not_exists=if_not_exists)
+    def queries(table):
+        return [table._query_create(drop_if_exists, if_not_exists), *table._query_create_indexes(concurrently, if_not_exists)]
+
+    def drop(table):
+        return table._query_drop(True, True)
+
+    await _create_all('tables', Table.__subclasses__(), queries, connection=connection, force=force or drop_if_exists,
+                      drop=drop if drop_if_exists else None)
@@ -1,8 +1,47 @@
+import re
+
 from .abc import Fetchable
-from .connection import Connection, MaybeAcquire
+from .connection import Connection
+from .schema import _create_all
+
+
+# The relations listed after FROM or JOIN, with their optional aliases
+_RELATIONS = re.compile(r'\b(?:FROM|JOIN)\s+([\w."]+(?:\s+(?:AS\s+)?\w+)?(?:\s*,\s*[\w."]+(?:\s+(?:AS\s+)?\w+)?)*)', re.IGNORECASE)
 
 
 class View(Fetchable):
+    """A database view, whose columns are declared as annotated class attributes.
+
+    Views are configured with keywords in their class definition,
+    e.g. ``class Totals(View, schema='reports', query_cache_size=256):``.
+
+    Kwargs:
+        schema (str, optional): The schema the view is created in. Defaults to ``public``.
+        query_cache_size (int, optional): The number of generated SQL statements to keep compiled,
+            the least recently used are compiled again once exceeded. Defaults to 128.
+        validation (ValidationMode, optional): How thoroughly values passed to the view's methods
+            are checked against their columns. Defaults to :attr:`ValidationMode.full`.
+        coalesce (bool or float, optional): Fetches concurrent lookups of single records by their primary key
+            together in one query. If a number is supplied lookups are gathered for that many seconds,
+            otherwise until the next iteration of the event loop. Defaults to ``False``.
+        single_flight (bool, optional): Shares the result of a read with identical reads made while it runs,
+            rather than running each of them. Defaults to ``False``.
+        result_cache_size (int, optional): Caches the results of reads, holding at most this many.
+            Views are not written to, so results are only refreshed once they expire. Defaults to 1024
+            if only ``result_cache_ttl`` is supplied, otherwise results are not cached.
+        result_cache_ttl (float, optional): The number of seconds cached results are kept for.
+            If none is supplied results are kept until evicted.
+        mirrored (bool, optional): Keeps a copy of every record in memory once :func:`load_mirrors` is called,
+            serving equality lookups without querying the database. Views are not written to, so the copy
+            is only refreshed when :func:`load_mirrors` is called again. See :class:`Mirror`. Defaults to ``False``.
+        pool (str, optional): The name of the pool, created with :func:`create_pool`, the view is held in.
+            If none is supplied the default pool is used.
+        sharding (Sharding, optional): Reads the view from several pools, split by a shard key,
+            e.g. :class:`HashSharding` or :class:`RangeSharding`. Cannot be combined with ``pool``.
+
+    Raises:
+        TypeError: An unknown keyword was supplied.
+    """
 
     @classmethod
     def _query_create(cls, drop_if_exists=True, if_not_exists=True):
@@ -30,8 +69,20 @@ class View(Fetchable):
     def _query_drop(cls, if_exists=True, cascade=False):
         return cls._base_query_drop('VIEW', if_exists, cascade)
 
+    @classmethod
+    def _dependencies(cls, objects):
+
+        # Only names selected from can be dependencies, not columns or aliases
+        query = f'{getattr(cls, "_select", "")} {cls._query}'
+        names = set()
+        for match in _RELATIONS.finditer(query):
+            for relation in match.group(1).split(','):
+                names.add(relation.split()[0].replace('"', '').lower())
+
+        return {obj for obj in objects if obj.__name__.lower() in names or obj._name.lower() in names}
 
-async def create_views(connection: Connection = None, drop_if_exists: bool = False):
+
+async def create_views(connection: Connection = None, drop_if_exists: bool = False, force: bool = False):
     """Create all defined views.
 
     Args:
@@ -39,7 +90,15 @@ async def create_views(connection: Connection = None, drop_if_exists: bool = Fal
             If none is supplied a connection will be acquired from the pool.
         drop_if_exists (bool, optional): Specifies wether the views should be
                 first dropped from the database if they already exists.
+        force (bool, optional): Specifies wether the views should be created
+                even if their definitions are unchanged since they were last created.
+
+    Views are created after the views they select from. Unless a connection is
+    supplied, views which do not depend on each other are created concurrently.
+    Creation is skipped entirely when a fingerprint of the views' definitions
+    matches the one recorded in the database when they were last created.
     """
-    async with MaybeAcquire(connection=connection) as connection:
-        for view in View.__subclasses__():
-            await view.create(connection=connection, drop_if_exists=drop_if_exists)
+    def queries(view):
+        return [view._query_create(drop_if_exists, True)]
+
+    await _create_all('views', View.__subclasses__(), queries, connection=connection, force=force)
@@ -38,16 +38,18 @@ setup(
             'sphinx==3.2.1',
             'sphinxcontrib_trio==1.1.2',
             'sphinxcontrib-websupport',
+        ],
+        'test': [
+            'pytest',
         ]
     },
-    python_requires='>=3.6.2',
+    python_requires='>=3.7',
     classifiers=[
         'Development Status :: 5 - Production/Stable',
         'License :: OSI Approved :: MIT License',
         'Intended Audience :: Developers',
         'Natural Language :: English',
         'Operating System :: OS Independent',
-        'Programming Language :: Python :: 3.6',
         'Programming Language :: Python :: 3.7',
         'Programming Language :: Python :: 3.8',
         'Topic :: Software Development :: Libraries',
@@ -0,0 +1,214 @@
+import asyncio
+import base64
+import json
+
+import pytest
+
+from donphan import Column, Index, SQLType, Table
+from donphan.pagination import _decode_token, _encode_token
+
+
+class Authors(Table, schema='blog'):
+    id: int = Column(primary_key=True, auto_increment=True)
+    name: str = Column(nullable=False)
+    bio: str = Column(default='')
+
+
+class Posts(Table, schema='blog'):
+    id: int = Column(primary_key=True)
+    author_id: int = Column(references=Authors.id)
+    tags: [str]
+    data: dict = Column(decode='lazy')
+
+
+def test_create():
+    assert Authors._query_create() == \
+        "CREATE TABLE IF NOT EXISTS blog.authors ( id SERIAL, name TEXT NOT NULL, bio TEXT DEFAULT '', PRIMARY KEY (id) );"
+
+
+def test_drop():
+    assert Authors._query_drop(True, True) == 'DROP TABLE IF EXISTS blog.authors CASCADE'
+
+
+def test_fetch():
+    assert Authors._query_fetch(None, None) == ('SELECT * FROM blog.authors', [])
+    assert Authors._query_fetch('id DESC', 10, name='a') == ('SELECT * FROM blog.authors WHERE name = $1 ORDER BY id DESC LIMIT 10', ['a'])
+
+
+def test_fetch_operators():
+    query, values = Authors._query_fetch(None, None, id__gt=1, or_name__ne='a')
+    assert query == 'SELECT * FROM blog.authors WHERE id > $1 OR name != $2'
+    assert values == [1, 'a']
+
+    with pytest.raises(AttributeError):
+        Authors._query_fetch(None, None, id__xx=1)
+
+    with pytest.raises(AttributeError):
+        Authors._query_fetch(None, None, missing=1)
+
+
+def test_fetch_where():
+    assert Authors._query_fetch_where('id > $1', 'id', 5) == 'SELECT * FROM blog.authors WHERE id > $1 ORDER BY id LIMIT 5'
+
+
+def test_projection():
+    projection = Authors._projection([Authors.id, Authors.name])
+    assert Authors._query_fetch(None, None, projection) == ('SELECT id, name FROM blog.authors', [])
+
+    with pytest.raises(TypeError):
+        Authors._projection([])
+
+    with pytest.raises(TypeError):
+        Authors._projection([Posts.id])
+
+
+def test_lazy_columns_are_selected_encoded():
+    assert Posts._query_fetch(None, None)[0] == "SELECT id, author_id, tags, convert_to(data::TEXT, 'UTF8') AS data FROM blog.posts"
+
+
+def test_insert():
+    assert Authors._query_insert(None, name='a', bio='b') == ('INSERT INTO blog.authors (name, bio) VALUES ($1, $2)', ['a', 'b'])
+    assert Authors._query_insert([Authors.id], name='a') == ('INSERT INTO blog.authors (name) VALUES ($1) RETURNING id', ['a'])
+    assert Authors._query_insert('*', name='a')[0] == 'INSERT INTO blog.authors (name) VALUES ($1) RETURNING *'
+
+
+def test_upsert():
+    query, _ = Authors._query_insert(None, upsert=True, id=1, name='a')
+    assert query == 'INSERT INTO blog.authors (id, name) VALUES ($1, $2) ON CONFLICT (id) DO UPDATE SET name = EXCLUDED.name'
+
+    query, _ = Authors._query_insert(None, upsert=True, id=1)
+    assert query == 'INSERT INTO blog.authors (id) VALUES ($1) ON CONFLICT (id) DO NOTHING'
+
+
+def test_insert_many():
+    assert Authors._query_insert_many([Authors.name, Authors.bio]) == 'INSERT INTO blog.authors (name, bio) VALUES ($1, $2)'
+
+
+def test_update():
+    assert Authors._query_update_record({'id': 1, 'name': 'a'}, bio='b') == ('UPDATE blog.authors SET bio = $1 WHERE id = $2', ['b', 1])
+    assert Authors._query_update_where('id = $1', (1,), bio='b') == ('UPDATE blog.authors SET bio = $2 WHERE id = $1', (1, 'b'))
+
+
+def test_update_records():
+    query = Authors._query_update_records(Authors._get_primary_keys(), (Authors.name,))
+    assert query == ('UPDATE blog.authors SET name = _data.name FROM unnest($1::TEXT[], $2::INTEGER[]) AS _data(name, id) '
+                     'WHERE blog.authors.id = _data.id')
+
+
+def test_delete():
+    assert Authors._query_delete(name='a') == ('DELETE FROM blog.authors WHERE name = $1', ['a'])
+    assert Authors._query_delete_record({'id': 1, 'name': 'a'}) == ('DELETE FROM blog.authors WHERE id = $1', [1])
+    assert Authors._query_delete_records(Authors._get_primary_keys()) == 'DELETE FROM blog.authors WHERE id = ANY($1::INTEGER[])'
+
+
+def test_primary_keys():
+    assert Authors._query_primary_keys(Authors._get_primary_keys()) == 'SELECT * FROM blog.authors WHERE id = ANY($1::INTEGER[])'
+
+
+def test_statements_are_cached():
+    Authors._query_cache.clear()
+    Authors._query_fetch(None, None, name='a')
+    Authors._query_fetch(None, None, name='b')
+
+    info = Authors._query_cache.info()
+    assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+
+
+def test_compile_page():
+    key = (Authors.id,)
+    assert Authors._compile_page(('name',), key, False, 10, False) == \
+        ('SELECT * FROM blog.authors WHERE (name = $1) ORDER BY id LIMIT 11', [Authors.name])
+    assert Authors._compile_page(('name',), key, False, 10, True)[0] == \
+        'SELECT * FROM blog.authors WHERE (name = $1) AND (id) > ($2) ORDER BY id LIMIT 11'
+    assert Authors._compile_page((), (Authors.name, Authors.id), True, 5, True)[0] == \
+        'SELECT * FROM blog.authors WHERE (name, id) < ($1, $2) ORDER BY name DESC, id DESC LIMIT 6'
+
+
+def test_continuation_tokens():
+    key = (Authors.name, Authors.id)
+    token = _encode_token({'id': 3, 'name': 'a'}, key, True)
+    assert _decode_token(token, key, True) == ['a', 3]
+
+    for invalid in (token + '!', _encode_token({'id': 3, 'name': 'a'}, key, False), _encode_token({'id': 3}, (Authors.id,), True)):
+        with pytest.raises(ValueError):
+            _decode_token(invalid, key, True)
+
+
+def test_fetch_page(monkeypatch):
+    queries = []
+
+    async def run_query(method, query, values, **kwargs):
+        queries.append((query, values))
+        start = values[1] + 1 if len(values) > 1 else 1
+        return [{'id': id, 'name': 'a'} for id in range(start, start + kwargs['limit'])]
+
+    monkeypatch.setattr(Authors, '_run_query', run_query)
+
+    records, token = asyncio.run(Authors.fetch_page(limit=2, name='a'))
+    assert [record['id'] for record in records] == [1, 2]
+
+    records, token = asyncio.run(Authors.fetch_page(limit=2, after=token, name='a'))
+    assert [record['id'] for record in records] == [3, 4]
+    assert queries[-1] == ('SELECT * FROM blog.authors WHERE (name = $1) AND (id) > ($2) ORDER BY id LIMIT 3', ['a', 2])
+
+
+def test_fetch_page_rejects_invalid_tokens(monkeypatch):
+    async def run_query(method, query, values, **kwargs):
+        raise AssertionError('invalid tokens must not be queried')
+
+    monkeypatch.setattr(Authors, '_run_query', run_query)
+
+    def token(values):
+        payload = json.dumps([['id'], False, values]).encode()
+        return base64.urlsafe_b64encode(payload).decode()
+
+    for values in ([], [1, 2], ['abc'], {'id': 1}):
+        with pytest.raises(ValueError, match='Invalid continuation token'):
+            asyncio.run(Authors.fetch_page(limit=2, after=token(values)))
+
+
+class IndexedEvents(Table):
+    id: int = Column(primary_key=True)
+    code: str = Column(unique=True, index=True)
+    kind: str = Column(index=True)
+    tags: [str] = Column(index=True)
+    data: dict = Column(index=True)
+    created_at: int = Column(index='brin')
+    user_id: int
+    active: bool
+    by_user = Index('user_id', unique=True, where='active', include=['kind'])
+    by_lower_kind = Index('lower(kind)', name='events_lower_kind')
+
+
+def test_column_indexes():
+    assert IndexedEvents._query_create_indexes() == [
+        'CREATE INDEX IF NOT EXISTS indexedevents_kind_idx ON public.indexedevents (kind)',
+        'CREATE INDEX IF NOT EXISTS indexedevents_tags_idx ON public.indexedevents USING gin (tags)',
+        'CREATE INDEX IF NOT EXISTS indexedevents_data_idx ON public.indexedevents USING gin (data)',
+        'CREATE INDEX IF NOT EXISTS indexedevents_created_at_idx ON public.indexedevents USING brin (created_at)',
+        'CREATE UNIQUE INDEX IF NOT EXISTS indexedevents_by_user_idx ON public.indexedevents (user_id) INCLUDE (kind) WHERE active',
+        'CREATE INDEX IF NOT EXISTS events_lower_kind ON public.indexedevents ((lower(kind)))',
+    ]
+    assert IndexedEvents.by_lower_kind._query_create(True, False) == \
+        'CREATE INDEX CONCURRENTLY events_lower_kind ON public.indexedevents ((lower(kind)))'
+
+
+def test_invalid_indexes():
+    with pytest.raises(TypeError, match='JSON column'):
+        class IndexedJSON(Table):
+            id: int = Column(primary_key=True)
+            data: SQLType.JSON = Column(index=True)
+
+    with pytest.raises(TypeError, match='gin'):
+        class MisappliedGin(Table):
+            id: int = Column(primary_key=True)
+            name: str = Column(index='gin')
+
+    with pytest.raises(TypeError, match='btree'):
+        class UniqueGin(Table):
+            id: int = Column(primary_key=True)
+            tags: [str]
+            by_tags = Index('tags', unique=True)
+
+    with pytest.raises(TypeError, match='Unknown index method'):
+        Index('name', method='bitmap')
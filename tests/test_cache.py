@@ -0,0 +1,160 @@
+import asyncio
+import time
+
+import donphan.abc
+from donphan import Column, QueryCache, ResultCache, Table
+from donphan import connection as _connection
+
+
+def test_query_cache_hits_and_misses():
+    cache = QueryCache(maxsize=2)
+    assert cache.get('a') is None
+
+    cache.set('a', 1)
+    assert cache.get('a') == 1
+    assert cache.info() == (1, 1, 0, 2, 1)
+
+
+def test_query_cache_evicts_least_recently_used():
+    evicted = []
+    cache = QueryCache(maxsize=2, on_evict=evicted.append)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+
+    assert evicted == ['b']
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.evictions == 1
+
+
+def test_query_cache_disabled():
+    cache = QueryCache(maxsize=0)
+    cache.set('a', 1)
+    assert len(cache) == 0
+
+
+def test_query_cache_clear():
+    cache = QueryCache()
+    cache.set('a', 1)
+    cache.get('a')
+    cache.clear()
+    assert cache.info() == (0, 0, 0, 128, 0)
+
+
+def test_result_cache_default():
+    cache = ResultCache()
+    sentinel = object()
+    assert cache.get('a', sentinel) is sentinel
+
+    cache.set('a', None)
+    assert cache.get('a', sentinel) is None
+
+
+def test_result_cache_evicts_least_recently_used():
+    cache = ResultCache(maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.evictions == 1
+
+
+def test_result_cache_expires():
+    cache = ResultCache(ttl=0.01)
+    cache.set('a', [1, 2])
+    assert cache.get('a') == [1, 2]
+
+    time.sleep(0.02)
+    assert cache.get('a') is None
+    assert cache.expirations == 1
+    assert cache.memory == 0
+
+
+def test_result_cache_invalidates_tags():
+    cache = ResultCache()
+    cache.set('one', 1, tag=(1,))
+    cache.set('two', 2, tag=(2,))
+    cache.set('all', [1, 2])
+
+    cache.invalidate([(1,)])
+
+    assert cache.get('one') is None
+    assert cache.get('all') is None
+    assert cache.get('two') == 2
+
+
+def test_result_cache_invalidate_all():
+    cache = ResultCache()
+    cache.set('one', 1, tag=(1,))
+    cache.set('all', [1])
+
+    cache.invalidate()
+
+    assert len(cache) == 0
+    assert cache.memory == 0
+
+
+def test_result_cache_discards_stale_generation():
+    cache = ResultCache()
+    generation = cache.generation
+    cache.invalidate()
+
+    cache.set('a', 1, generation)
+    assert cache.get('a') is None
+
+    cache.set('a', 1, cache.generation)
+    assert cache.get('a') == 1
+
+
+def test_result_cache_info():
+    cache = ResultCache(maxsize=4)
+    cache.set('a', 1)
+    cache.get('a')
+    cache.get('b')
+
+    info = cache.info()
+    assert (info.hits, info.misses, info.currsize, info.maxsize) == (1, 1, 1, 4)
+    assert info.hit_rate == 0.5
+    assert info.memory > 0
+
+
+class TransactedItems(Table, result_cache_size=10):
+    id: int = Column(primary_key=True)
+
+
+class FakeConnection:
+
+    def __init__(self):
+        self.in_transaction = True
+
+    def is_in_transaction(self):
+        return self.in_transaction
+
+
+def test_caller_owned_transactions_are_invalidated_once_ended(monkeypatch):
+    published = []
+    connection = FakeConnection()
+
+    async def run_on(method, query, values, acquire):
+        return None
+
+    monkeypatch.setattr(TransactedItems, '_run_on', run_on)
+    monkeypatch.setattr(donphan.abc, '_publish', lambda table, keys: published.append((table, keys)))
+
+    async def main():
+        await TransactedItems.insert(connection=connection, id=1)
+        assert TransactedItems._uncommitted == 1
+        assert not TransactedItems._caches_current()
+
+        # The transaction is committed without donphan releasing the connection
+        connection.in_transaction = False
+        await asyncio.sleep(_connection._TRANSACTION_POLL_INTERVAL * 2)
+
+    asyncio.run(main())
+    assert TransactedItems._uncommitted == 0
+    assert published == [(TransactedItems, [(1,)])]
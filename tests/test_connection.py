@@ -0,0 +1,130 @@
+import asyncio
+import json
+
+import asyncpg
+import pytest
+
+from donphan import BoundConnection, Column, InvalidationBus, Table, View
+from donphan import connection as _connection
+
+
+class FakeConnection:
+
+    def is_in_transaction(self):
+        return False
+
+
+def test_bound_connections_are_bound_to_their_pool(monkeypatch):
+    analytics = object()
+    monkeypatch.setattr(_connection, '_pool', object())
+    monkeypatch.setattr(_connection, '_pools', {'analytics': analytics})
+    connection = FakeConnection()
+
+    async def main():
+        async with BoundConnection(connection, pool='analytics'):
+            assert _connection._bound_connection('analytics') is connection
+            assert _connection._bound_connection(analytics) is connection
+            assert _connection._bound_connection() is None
+        assert _connection._bound_connection('analytics') is None
+
+    asyncio.run(main())
+
+
+def test_bindings_are_not_used_by_other_tasks(monkeypatch):
+    monkeypatch.setattr(_connection, '_pool', object())
+    connection = FakeConnection()
+
+    async def bound():
+        return _connection._bound_connection()
+
+    async def main():
+        async with BoundConnection(connection):
+            assert await bound() is connection
+            assert await asyncio.ensure_future(bound()) is None
+
+    asyncio.run(main())
+
+
+class FakePool:
+
+    def get_idle_size(self):
+        return 1
+
+
+class ReplicatedItems(Table):
+    id: int = Column(primary_key=True)
+
+
+class ReplicatedItemNames(View):
+    _select = 'id'
+    _query = 'FROM public.replicateditems'
+
+
+def replicated(monkeypatch):
+    replica = FakePool()
+    monkeypatch.setattr(_connection, '_pool', FakePool())
+    monkeypatch.setattr(_connection, '_replicas', {None: [replica]})
+    monkeypatch.setattr(_connection, '_read_your_writes', {None: 5, 'other': 5})
+    monkeypatch.setattr(_connection, '_written_at', {})
+    monkeypatch.setattr(_connection, '_replica_retry_at', {})
+    return replica
+
+
+def test_writes_route_reads_of_the_pool_to_the_primary(monkeypatch):
+    replica = replicated(monkeypatch)
+    assert _connection._replica_pool() is replica
+
+    _connection._wrote('other')
+    assert _connection._replica_pool() is replica
+
+    ReplicatedItems._record_write()
+    assert _connection._replica_pool(ReplicatedItemNames._pool_name) is None
+
+
+def test_query_errors_do_not_fail_the_replica(monkeypatch):
+    replica = replicated(monkeypatch)
+    pools = []
+
+    async def run_on(method, query, values, acquire):
+        pools.append(acquire.pool)
+        raise asyncpg.InterfaceError('invalid input')
+
+    monkeypatch.setattr(ReplicatedItems, '_run_on', run_on)
+
+    with pytest.raises(asyncpg.InterfaceError):
+        asyncio.run(ReplicatedItems._execute_query('fetch', 'SELECT * FROM public.replicateditems WHERE id = $1', ['x']))
+
+    assert pools == [replica]
+    assert _connection._replica_pool() is replica
+
+
+def test_connection_errors_fail_the_replica(monkeypatch):
+    replica = replicated(monkeypatch)
+    pools = []
+
+    async def run_on(method, query, values, acquire):
+        pools.append(acquire.pool)
+        if acquire.pool is replica:
+            raise asyncpg.ConnectionDoesNotExistError('connection closed')
+        return []
+
+    monkeypatch.setattr(ReplicatedItems, '_run_on', run_on)
+
+    assert asyncio.run(ReplicatedItems._execute_query('fetch', 'SELECT * FROM public.replicateditems', [])) == []
+    assert pools == [replica, _connection._pool]
+    assert _connection._replica_pool() is None
+
+
+class NotifiedReplicatedItems(Table, result_cache_size=10):
+    id: int = Column(primary_key=True)
+
+
+def test_received_invalidations_do_not_route_reads_to_the_primary(monkeypatch):
+    replica = replicated(monkeypatch)
+    bus = InvalidationBus()
+
+    payload = json.dumps({'origin': 'other', 'table': NotifiedReplicatedItems._name, 'keys': [[1]]})
+    bus._on_notification(None, 0, bus.channel, payload)
+
+    assert bus.received == 1
+    assert _connection._replica_pool() is replica
@@ -0,0 +1,78 @@
+import asyncio
+
+from donphan import Column, Table
+
+
+class CopiedEvents(Table):
+    id: int = Column(primary_key=True)
+    data: dict
+
+
+class CopiedCounts(Table):
+    id: int = Column(primary_key=True)
+    count: int
+
+
+class FakeTransaction:
+
+    async def __aenter__(self):
+        pass
+
+    async def __aexit__(self, *args):
+        pass
+
+
+class FakeConnection:
+
+    def __init__(self, binary_json=False):
+        self._binary_json = binary_json
+        self.copied = []
+
+    def transaction(self):
+        return FakeTransaction()
+
+    def is_in_transaction(self):
+        return False
+
+    async def copy_records_to_table(self, table, *, records, columns, schema_name):
+        self.copied.append((table, records, columns))
+        return f'COPY {len(records)}'
+
+
+def copy(monkeypatch, table, records, connection):
+    queries = []
+
+    async def run_on(method, query, values, acquire):
+        queries.append((method, query, values))
+
+    monkeypatch.setattr(table, '_run_on', run_on)
+    inserted = asyncio.run(table.copy_records(records, connection=connection))
+    return inserted, queries
+
+
+def test_copy_uses_the_copy_protocol(monkeypatch):
+    connection = FakeConnection()
+    inserted, queries = copy(monkeypatch, CopiedCounts, [{'id': 1, 'count': 2}], connection)
+
+    assert inserted == 1
+    assert queries == []
+    assert connection.copied == [('copiedcounts', [(1, 2)], ['id', 'count'])]
+
+
+def test_copy_inserts_json_columns_without_binary_json(monkeypatch):
+    connection = FakeConnection()
+    inserted, queries = copy(monkeypatch, CopiedEvents, [(1, {'a': 1}), (2, {'b': 2})], connection)
+
+    assert inserted == 2
+    assert connection.copied == []
+    assert queries == [('executemany', CopiedEvents._query_insert_many((CopiedEvents.id, CopiedEvents.data)),
+                        [(1, {'a': 1}), (2, {'b': 2})])]
+
+
+def test_copy_sends_json_columns_with_binary_json(monkeypatch):
+    connection = FakeConnection(binary_json=True)
+    inserted, queries = copy(monkeypatch, CopiedEvents, [(1, {'a': 1})], connection)
+
+    assert inserted == 1
+    assert queries == []
+    assert connection.copied == [('copiedevents', [(1, {'a': 1})], ['id', 'data'])]
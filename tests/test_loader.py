@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from donphan import Column, Loader, Table
+
+
+class LoadedUsers(Table):
+    id: int = Column(primary_key=True)
+    name: str
+
+
+def fake_query(queries, fail=False):
+    async def run_query(method, query, values):
+        queries.append((method, query, values))
+        if fail:
+            raise ValueError('failed')
+        return [{'id': id, 'name': f'user {id}'} for id in values[0] if id != 404]
+    return run_query
+
+
+def test_lookups_are_batched(monkeypatch):
+    queries = []
+    monkeypatch.setattr(LoadedUsers, '_run_query', fake_query(queries))
+    loader = Loader(LoadedUsers)
+
+    async def main():
+        return await asyncio.gather(loader.load((1,)), loader.load((2,)), loader.load((1,)), loader.load((404,)))
+
+    records = asyncio.run(main())
+
+    assert [record and record['id'] for record in records] == [1, 2, 1, None]
+    assert queries == [('fetch', 'SELECT * FROM public.loadedusers WHERE id = ANY($1::INTEGER[])', [[1, 2, 404]])]
+    assert (loader.loads, loader.batches) == (4, 1)
+
+
+def test_lookups_in_separate_iterations_are_not_batched(monkeypatch):
+    queries = []
+    monkeypatch.setattr(LoadedUsers, '_run_query', fake_query(queries))
+    loader = Loader(LoadedUsers)
+
+    async def main():
+        await loader.load((1,))
+        await loader.load((2,))
+
+    asyncio.run(main())
+    assert loader.batches == 2
+
+
+def test_delay_gathers_lookups(monkeypatch):
+    queries = []
+    monkeypatch.setattr(LoadedUsers, '_run_query', fake_query(queries))
+    loader = Loader(LoadedUsers, delay=0.01)
+
+    async def main():
+        first = asyncio.ensure_future(loader.load((1,)))
+        await asyncio.sleep(0)
+        return await asyncio.gather(first, loader.load((2,)))
+
+    asyncio.run(main())
+    assert loader.batches == 1
+    assert queries[0][2] == [[1, 2]]
+
+
+def test_errors_reach_every_lookup(monkeypatch):
+    monkeypatch.setattr(LoadedUsers, '_run_query', fake_query([], fail=True))
+    loader = Loader(LoadedUsers)
+
+    async def main():
+        return await asyncio.gather(loader.load((1,)), loader.load((2,)), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_cancelled_lookup_does_not_cancel_others(monkeypatch):
+    monkeypatch.setattr(LoadedUsers, '_run_query', fake_query([]))
+    loader = Loader(LoadedUsers)
+
+    async def main():
+        first = asyncio.ensure_future(loader.load((1,)))
+        second = asyncio.ensure_future(loader.load((1,)))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main())['id'] == 1
+
+
+class CachedUsers(Table, coalesce=True, result_cache_size=10):
+    id: int = Column(primary_key=True)
+    name: str
+
+
+def test_coalesced_lookups_are_cached(monkeypatch):
+    queries = []
+    monkeypatch.setattr(CachedUsers, '_run_query', fake_query(queries))
+
+    async def main():
+        first = await asyncio.gather(CachedUsers.fetchrow(id=1), CachedUsers.fetchrow(id=2))
+        second = await asyncio.gather(CachedUsers.fetchrow(id=1), CachedUsers.fetchrow(id=2), CachedUsers.fetchrow(id=404))
+        CachedUsers._invalidate([(1,)])
+        third = await CachedUsers.fetchrow(id=1)
+        return first, second, third
+
+    first, second, third = asyncio.run(main())
+
+    assert [record['id'] for record in first] == [1, 2]
+    assert [record and record['id'] for record in second] == [1, 2, None]
+    assert third['id'] == 1
+    assert [values for _, _, values in queries] == [[[1, 2]], [[404]], [[1]]]
+    assert CachedUsers._result_cache.hits == 2
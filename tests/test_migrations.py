@@ -0,0 +1,127 @@
+import asyncio
+
+from donphan import Column, Table, plan_migration
+from donphan import migrations
+from donphan.migrations import _ColumnInfo
+
+
+class MigratedUsers(Table):
+    id: int = Column(primary_key=True)
+    name: str = Column(nullable=False)
+    score: int = Column(nullable=False, default=0)
+    email: str = Column(index=True)
+
+
+class MigratedCounters(Table):
+    id: int = Column(primary_key=True)
+    counter: int = Column(auto_increment=True)
+    label: str = Column(nullable=False)
+
+
+def plan(monkeypatch, table, columns, indexes=None):
+    async def introspect_columns(connection, table):
+        return dict(columns)
+
+    async def introspect_indexes(connection, table):
+        return indexes or {}
+
+    async def canonical_types(connection, types):
+        return {type: type.lower() for type in types}
+
+    monkeypatch.setattr(migrations, '_introspect_columns', introspect_columns)
+    monkeypatch.setattr(migrations, '_introspect_indexes', introspect_indexes)
+    monkeypatch.setattr(migrations, '_canonical_types', canonical_types)
+    return asyncio.run(plan_migration(table, connection=object()))
+
+
+def queries(plan):
+    return [step.query for step in plan.steps]
+
+
+def test_nothing_to_migrate(monkeypatch):
+    result = plan(monkeypatch, MigratedUsers, {
+        'id': _ColumnInfo('integer', True),
+        'name': _ColumnInfo('text', True),
+        'score': _ColumnInfo('integer', True),
+        'email': _ColumnInfo('text', False),
+    }, {'migratedusers_email_idx': True})
+
+    assert not result
+    assert result.warnings == []
+    assert str(result) == '-- Nothing to migrate'
+
+
+def test_add_column(monkeypatch):
+    result = plan(monkeypatch, MigratedUsers, {
+        'id': _ColumnInfo('integer', True),
+        'name': _ColumnInfo('text', True),
+        'email': _ColumnInfo('text', False),
+    }, {'migratedusers_email_idx': True})
+
+    assert queries(result) == [
+        'ALTER TABLE public.migratedusers ADD COLUMN IF NOT EXISTS score INTEGER',
+        'ALTER TABLE public.migratedusers ALTER COLUMN score SET DEFAULT (0)',
+        'UPDATE public.migratedusers SET score = (0) WHERE ctid = ANY(ARRAY(SELECT ctid FROM public.migratedusers '
+        'WHERE score IS NULL LIMIT 10000)) AND (0) IS NOT NULL',
+        'ALTER TABLE public.migratedusers DROP CONSTRAINT IF EXISTS migratedusers_score_not_null, '
+        'ADD CONSTRAINT migratedusers_score_not_null CHECK (score IS NOT NULL) NOT VALID',
+        'ALTER TABLE public.migratedusers VALIDATE CONSTRAINT migratedusers_score_not_null',
+        'ALTER TABLE public.migratedusers ALTER COLUMN score SET NOT NULL',
+        'ALTER TABLE public.migratedusers DROP CONSTRAINT migratedusers_score_not_null',
+    ]
+    assert [step.repeat for step in result.steps] == [False, False, True, False, False, False, False]
+
+
+def test_backfill_then_set_not_null(monkeypatch):
+    result = plan(monkeypatch, MigratedUsers, {
+        'id': _ColumnInfo('integer', True),
+        'name': _ColumnInfo('text', True),
+        'score': _ColumnInfo('integer', False),
+        'email': _ColumnInfo('text', False),
+    }, {'migratedusers_email_idx': True})
+
+    descriptions = [step.description for step in result.steps]
+    assert descriptions == [
+        'Backfill public.migratedusers.score in batches of 10000',
+        'Add an unvalidated NOT NULL check on public.migratedusers.score',
+        'Validate the NOT NULL check on public.migratedusers.score',
+        'Set public.migratedusers.score NOT NULL',
+        'Drop the NOT NULL check on public.migratedusers.score',
+    ]
+    assert result.steps[0].repeat
+
+
+def test_invalid_index_is_rebuilt(monkeypatch):
+    columns = {
+        'id': _ColumnInfo('integer', True),
+        'name': _ColumnInfo('text', True),
+        'score': _ColumnInfo('integer', True),
+        'email': _ColumnInfo('text', False),
+    }
+
+    assert queries(plan(monkeypatch, MigratedUsers, columns, {'migratedusers_email_idx': False})) == [
+        'DROP INDEX CONCURRENTLY IF EXISTS public.migratedusers_email_idx',
+        'CREATE INDEX CONCURRENTLY IF NOT EXISTS migratedusers_email_idx ON public.migratedusers (email)',
+    ]
+    assert queries(plan(monkeypatch, MigratedUsers, columns)) == [
+        'CREATE INDEX CONCURRENTLY IF NOT EXISTS migratedusers_email_idx ON public.migratedusers (email)',
+    ]
+
+
+def test_warnings(monkeypatch):
+    result = plan(monkeypatch, MigratedCounters, {
+        'id': _ColumnInfo('bigint', True),
+        'removed': _ColumnInfo('text', False),
+    })
+
+    assert queries(result) == ['ALTER TABLE public.migratedcounters ADD COLUMN IF NOT EXISTS label TEXT']
+    assert result.warnings == [
+        'Column public.migratedcounters.id has type bigint in the database but integer is defined, changing it rewrites the table',
+        'Column public.migratedcounters.counter is auto incrementing and cannot be added online, it was not added',
+        'Column public.migratedcounters.label is NOT NULL but has no default to backfill existing records with, '
+        'it was added as nullable',
+        'Column public.migratedcounters.removed is not defined, it was not dropped',
+    ]
+
+    result = plan(monkeypatch, MigratedCounters, {})
+    assert result.warnings[0] == 'Column public.migratedcounters.id is part of the primary key and cannot be added online'
@@ -0,0 +1,80 @@
+import asyncio
+import json
+
+from donphan import Column, InvalidationBus, Table
+
+
+class NotifiedUsers(Table, result_cache_size=10):
+    id: int = Column(primary_key=True)
+
+
+class NotifiedPosts(Table, result_cache_size=10):
+    id: int = Column(primary_key=True)
+
+
+class FakeConnection:
+
+    def __init__(self, fail=()):
+        self.fail = fail
+        self.payloads = []
+
+    async def execute(self, query, channel, payload):
+        payload = json.loads(payload)
+        if payload['table'] in self.fail:
+            raise RuntimeError('failed')
+        self.payloads.append(payload)
+
+
+def publish(connection, *invalidations):
+    bus = InvalidationBus()
+    bus._queue = asyncio.Queue()
+    bus._connection = connection
+
+    async def main():
+        task = asyncio.ensure_future(bus._publisher())
+        for invalidation in invalidations:
+            bus.publish(*invalidation)
+            await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        running = not task.done()
+        task.cancel()
+        return running
+
+    assert asyncio.run(main())
+    return bus
+
+
+def test_invalidations_are_merged_per_table():
+    connection = FakeConnection()
+    bus = InvalidationBus()
+    bus._queue = asyncio.Queue()
+    bus._connection = connection
+
+    async def main():
+        task = asyncio.ensure_future(bus._publisher())
+        bus.publish(NotifiedUsers, [(1,)])
+        bus.publish(NotifiedUsers, [(2,)])
+        bus.publish(NotifiedPosts)
+        bus.publish(NotifiedPosts, [(3,)])
+        await asyncio.sleep(0)
+        task.cancel()
+
+    asyncio.run(main())
+    assert [(payload['table'], payload['keys']) for payload in connection.payloads] == \
+        [('public.notifiedusers', [[1], [2]]), ('public.notifiedposts', None)]
+    assert bus.published == 2
+
+
+def test_unencodable_keys_invalidate_the_table():
+    connection = FakeConnection()
+    publish(connection, (NotifiedUsers, [(object(),)]), (NotifiedPosts, [(1,)]))
+    assert [(payload['table'], payload['keys']) for payload in connection.payloads] == \
+        [('public.notifiedusers', None), ('public.notifiedposts', [[1]])]
+
+
+def test_failures_do_not_stop_the_publisher():
+    connection = FakeConnection(fail=('public.notifiedusers',))
+    bus = publish(connection, (NotifiedUsers, [(1,)]), (NotifiedPosts, [(1,)]), (NotifiedUsers, [(2,)]), (NotifiedPosts, [(2,)]))
+    assert [(payload['table'], payload['keys']) for payload in connection.payloads] == \
+        [('public.notifiedposts', [[1]]), ('public.notifiedposts', [[2]])]
+    assert bus.published == 2
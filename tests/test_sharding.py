@@ -0,0 +1,121 @@
+import uuid
+
+import pytest
+
+from donphan import Column, HashSharding, RangeSharding, Table
+
+
+class HashedOrders(Table, sharding=HashSharding('user_id', ['a', 'b', 'c'])):
+    id: int = Column(primary_key=True)
+    user_id: int
+
+
+class RangedEvents(Table, sharding=RangeSharding('day', [(10, 'old'), (20, 'recent'), (None, 'new')])):
+    id: int = Column(primary_key=True)
+    day: int
+
+
+def test_hash_sharding_is_stable():
+    sharding = HashedOrders._sharding
+    assert sharding.pools == ('a', 'b', 'c')
+    assert sharding.pool_for(5) == sharding.pool_for(5) == 'b'
+    assert {sharding.pool_for(value) for value in range(100)} == {'a', 'b', 'c'}
+
+
+def test_hash_sharding_key_types():
+    sharding = HashedOrders._sharding
+    value = uuid.UUID(int=1)
+    assert sharding.pool_for(value) == sharding.pool_for(value.bytes)
+    assert sharding.pool_for('5') == sharding.pool_for(5)
+
+
+def test_hash_sharding_requires_pools():
+    with pytest.raises(TypeError):
+        HashSharding('user_id', [])
+
+
+def test_range_sharding():
+    sharding = RangedEvents._sharding
+    assert sharding.pools == ('old', 'recent', 'new')
+    assert [sharding.pool_for(day) for day in (0, 9, 10, 19, 20, 1000)] == ['old', 'old', 'recent', 'recent', 'new', 'new']
+
+
+def test_range_sharding_bounds():
+    with pytest.raises(TypeError):
+        RangeSharding('day', [])
+
+    with pytest.raises(TypeError):
+        RangeSharding('day', [(None, 'a'), (10, 'b')])
+
+    class BoundedEvents(Table, sharding=RangeSharding('day', [(10, 'old')])):
+        id: int = Column(primary_key=True)
+        day: int
+
+    with pytest.raises(TypeError, match='beyond the last range'):
+        BoundedEvents._sharding.pool_for(10)
+
+
+def test_unknown_shard_key():
+    with pytest.raises(AttributeError):
+        class MissingKeyOrders(Table, sharding=HashSharding('missing', ['a'])):
+            id: int = Column(primary_key=True)
+
+
+def test_filters_route_to_a_shard():
+    assert HashedOrders._shard_of({'user_id': 5}) == 'b'
+    assert HashedOrders._shard_of({'id': 1, 'user_id': 5}) == 'b'
+
+
+def test_filters_without_the_shard_key_reach_every_shard():
+    assert HashedOrders._shard_of({'id': 1}) is None
+    assert HashedOrders._shard_of({'user_id__gt': 5}) is None
+    assert HashedOrders._shard_of({'user_id': None}) is None
+    assert HashedOrders._shard_of({'id': 1, 'or_user_id': 5}) is None
+
+
+def test_records_route_to_a_shard():
+    assert HashedOrders._shard_of_record({'id': 1, 'user_id': 5}) == 'b'
+    assert HashedOrders._shard_of_record({'id': 1}) is None
+
+    with pytest.raises(TypeError):
+        HashedOrders._shard_of_record({'id': 1}, True)
+
+
+def test_rows_are_grouped_by_shard():
+    sharding = HashedOrders._sharding
+    columns = (HashedOrders.id, HashedOrders.user_id)
+    rows = [(i, i) for i in range(10)]
+
+    groups = HashedOrders._group_by_shard(columns, rows)
+    assert sorted(row for group in groups.values() for row in group) == rows
+    for pool, group in groups.items():
+        assert all(sharding.pool_for(user_id) == pool for _, user_id in group)
+
+    assert HashedOrders._group_by_shard(columns, [{'id': 1, 'user_id': 5}]) == {'b': [{'id': 1, 'user_id': 5}]}
+
+    with pytest.raises(TypeError):
+        HashedOrders._group_by_shard((HashedOrders.id,), [(1,)])
+
+
+def test_sharding_cannot_be_combined_with_a_pool():
+    with pytest.raises(TypeError):
+        class PooledOrders(Table, pool='a', sharding=HashSharding('user_id', ['a'])):
+            id: int = Column(primary_key=True)
+            user_id: int
+
+
+def test_tables_can_share_a_sharding():
+    sharding = HashSharding('user_id', ['a', 'b', 'c'])
+
+    class SharedOrders(Table, sharding=sharding):
+        id: int = Column(primary_key=True)
+        user_id: int
+
+    class SharedPayments(Table, sharding=sharding):
+        id: int = Column(primary_key=True)
+        user_id: int
+
+    assert SharedOrders._sharding.table is SharedOrders
+    assert SharedOrders._sharding.column is SharedOrders.user_id
+    assert SharedOrders._shard_of({'user_id': 5}) == 'b'
+    assert SharedPayments._shard_of_record({'id': 1, 'user_id': 5}) == 'b'
@@ -0,0 +1,139 @@
+import asyncio
+
+from donphan import Column, SingleFlight, Table
+
+
+def test_concurrent_calls_share_an_execution():
+    flight = SingleFlight()
+    calls = []
+
+    async def query(value):
+        calls.append(value)
+        await asyncio.sleep(0)
+        return [value]
+
+    async def main():
+        return await asyncio.gather(*(flight.run('key', query, 1) for _ in range(3)))
+
+    results = asyncio.run(main())
+
+    assert calls == [1]
+    assert results == [[1], [1], [1]]
+    assert flight.executions == 1
+    assert flight.collapsed == 2
+
+    # Callers receive their own lists
+    assert results[1] is not results[2]
+
+
+def test_sequential_calls_execute_again():
+    flight = SingleFlight()
+
+    async def query():
+        return 1
+
+    async def main():
+        await flight.run('key', query)
+        await flight.run('key', query)
+
+    asyncio.run(main())
+    assert flight.executions == 2
+    assert flight.collapsed == 0
+
+
+def test_different_keys_execute_separately():
+    flight = SingleFlight()
+
+    async def query(value):
+        await asyncio.sleep(0)
+        return value
+
+    async def main():
+        return await asyncio.gather(flight.run('a', query, 1), flight.run('b', query, 2))
+
+    assert asyncio.run(main()) == [1, 2]
+    assert flight.executions == 2
+
+
+def test_cancelled_caller_does_not_cancel_others():
+    flight = SingleFlight()
+
+    async def query():
+        await asyncio.sleep(0.01)
+        return 1
+
+    async def main():
+        first = asyncio.ensure_future(flight.run('key', query))
+        second = asyncio.ensure_future(flight.run('key', query))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(main()) == 1
+
+
+def test_errors_are_shared():
+    flight = SingleFlight()
+
+    async def query():
+        await asyncio.sleep(0)
+        raise ValueError('failed')
+
+    async def main():
+        return await asyncio.gather(flight.run('key', query), flight.run('key', query), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert flight.executions == 1
+
+
+def test_invalidated_calls_execute_again():
+    flight = SingleFlight()
+    calls = []
+
+    async def query(value):
+        calls.append(value)
+        await asyncio.sleep(0)
+        return value
+
+    async def main():
+        first = asyncio.ensure_future(flight.run('key', query, 1))
+        await asyncio.sleep(0)
+        flight.invalidate()
+        return await asyncio.gather(first, flight.run('key', query, 2))
+
+    assert asyncio.run(main()) == [1, 2]
+    assert calls == [1, 2]
+    assert flight.collapsed == 0
+
+
+class SharedItems(Table, single_flight=True, result_cache_size=10):
+    id: int = Column(primary_key=True)
+    value: int
+
+
+def test_reads_after_a_write_are_not_shared(monkeypatch):
+    stored = {'value': 1}
+    started = []
+
+    async def execute_query(method, query, values, connection=None, **kwargs):
+        record = {'id': 1, **stored}
+        started.append(record)
+        await asyncio.sleep(0.01)
+        return record
+
+    monkeypatch.setattr(SharedItems, '_execute_query', execute_query)
+
+    async def main():
+        before = asyncio.ensure_future(SharedItems.fetchrow(id=1))
+        while not started:
+            await asyncio.sleep(0)
+        stored['value'] = 2
+        SharedItems._invalidate([(1,)])
+        after = await SharedItems.fetchrow(id=1)
+        return await before, after, await SharedItems.fetchrow(id=1)
+
+    before, after, cached = asyncio.run(main())
+    assert before['value'] == 1
+    assert after['value'] == 2
+    assert cached['value'] == 2
@@ -0,0 +1,83 @@
+import pytest
+
+from donphan import Column, Table, ValidationMode
+
+
+class ValidatedItems(Table):
+    id: int = Column(primary_key=True)
+    name: str = Column(nullable=False)
+    tags: [str]
+    grid: [[int]]
+
+
+class TrustedItems(Table, validation=ValidationMode.off):
+    id: int = Column(primary_key=True)
+    name: str = Column(nullable=False)
+
+
+def validate(table, name, value, mode=None):
+    table._validate_value(table._columns[name], value, mode)
+
+
+def test_scalar_types():
+    validate(ValidatedItems, 'id', 1)
+    validate(ValidatedItems, 'id', None)
+
+    with pytest.raises(TypeError, match='expected int, received str'):
+        validate(ValidatedItems, 'id', '1')
+
+
+def test_nullability():
+    with pytest.raises(TypeError, match='non-nullable column name'):
+        validate(ValidatedItems, 'name', None)
+
+
+def test_arrays():
+    validate(ValidatedItems, 'tags', ['a', None])
+    validate(ValidatedItems, 'grid', [[1, 2], [3]])
+
+    with pytest.raises(TypeError, match=r'expected str\[\], received str'):
+        validate(ValidatedItems, 'tags', 'a')
+
+    with pytest.raises(TypeError, match=r'expected str\[\], received int\[\]'):
+        validate(ValidatedItems, 'tags', ['a', 1])
+
+    with pytest.raises(TypeError, match='nested deeper than 1'):
+        validate(ValidatedItems, 'tags', [['a']])
+
+
+def test_top_level_skips_elements():
+    validate(ValidatedItems, 'tags', ['a', 1], ValidationMode.top_level)
+
+    with pytest.raises(TypeError):
+        validate(ValidatedItems, 'tags', 'a', ValidationMode.top_level)
+
+    with pytest.raises(TypeError):
+        validate(ValidatedItems, 'name', None, ValidationMode.top_level)
+
+
+def test_off_skips_validation():
+    validate(ValidatedItems, 'id', '1', ValidationMode.off)
+    validate(TrustedItems, 'name', None)
+
+
+def test_validate_values():
+    columns = [ValidatedItems._columns['id'], ValidatedItems._columns['name']]
+    assert ValidatedItems._validate_values(columns, iter([1, 'a'])) == [1, 'a']
+
+    with pytest.raises(TypeError):
+        ValidatedItems._validate_values(columns, [1, None])
+
+
+def test_queries_validate_values():
+    with pytest.raises(TypeError):
+        ValidatedItems._query_fetch(None, None, id='1')
+
+    with pytest.raises(TypeError):
+        ValidatedItems._query_insert(None, id=1, name=None)
+
+
+def test_unknown_keyword():
+    with pytest.raises(TypeError):
+        class UnknownKeywordItems(Table, cache_size=1):
+            id: int = Column(primary_key=True)